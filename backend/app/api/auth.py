@@ -1,10 +1,11 @@
 """Authentication endpoints"""
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from google.oauth2 import id_token
 from google.auth.transport import requests
 from datetime import datetime
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.core.config import settings
 from app.core.security import create_access_token, create_refresh_token
 from app.models import User
@@ -17,7 +18,7 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 @router.post("/google", response_model=TokenResponse)
 async def google_auth(
     auth_request: GoogleAuthRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Authenticate user with Google OAuth
     
@@ -61,7 +62,8 @@ async def google_auth(
             profile_picture = ""
         
         # Check if user exists
-        user = db.query(User).filter(User.google_id == google_id).first()
+        result = await db.execute(select(User).where(User.google_id == google_id))
+        user = result.scalars().first()
         
         if not user:
             # Create new user
@@ -74,12 +76,12 @@ async def google_auth(
                 is_active=True
             )
             db.add(user)
-            db.commit()
-            db.refresh(user)
+            await db.commit()
+            await db.refresh(user)
         else:
             # Update last login
             user.last_login = datetime.utcnow()
-            db.commit()
+            await db.commit()
         
         # Create JWT tokens
         access_token = create_access_token(data={"sub": user.id})
@@ -104,7 +106,7 @@ async def google_auth(
 
 
 @router.post("/mock-login", response_model=TokenResponse)
-async def mock_login(db: Session = Depends(get_db)):
+async def mock_login(db: AsyncSession = Depends(get_async_db)):
     """Mock login for development/testing
     
     Args:
@@ -115,7 +117,8 @@ async def mock_login(db: Session = Depends(get_db)):
     """
     # Create or get mock user
     mock_email = "test@talentscout.dev"
-    user = db.query(User).filter(User.email == mock_email).first()
+    result = await db.execute(select(User).where(User.email == mock_email))
+    user = result.scalars().first()
     
     if not user:
         user = User(
@@ -126,8 +129,8 @@ async def mock_login(db: Session = Depends(get_db)):
             is_active=True
         )
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
     
     # Create tokens
     access_token = create_access_token(data={"sub": user.id})
@@ -1,8 +1,10 @@
 """Candidate endpoints"""
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.api.deps import get_current_user
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
+from app.core.replicas import replica_router
+from app.api.deps import get_current_user, get_read_db
 from app.models import User, Candidate
 from app.schemas import CandidateResponse
 
@@ -12,27 +14,33 @@ router = APIRouter(prefix="/candidates", tags=["Candidates"])
 @router.get("/me", response_model=CandidateResponse)
 async def get_my_candidate_profile(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    read_db: AsyncSession = Depends(get_read_db),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get current user's candidate profile
     
     Args:
         current_user: Current authenticated user
-        db: Database session
+        read_db: Read-only database session (replica or primary)
+        db: Database session on the primary, used to create a missing profile
         
     Returns:
         Candidate profile
     """
-    candidate = db.query(Candidate).filter(
-        Candidate.user_id == current_user.id
-    ).first()
+    query = select(Candidate).where(Candidate.user_id == current_user.id)
+    candidate = (await read_db.execute(query)).scalars().first()
+    
+    if not candidate:
+        # Replicas may not have it yet; check the primary before creating one
+        candidate = (await db.execute(query)).scalars().first()
     
     if not candidate:
         # Create empty candidate profile
         candidate = Candidate(user_id=current_user.id)
         db.add(candidate)
-        db.commit()
-        db.refresh(candidate)
+        await db.commit()
+        await db.refresh(candidate)
+        await replica_router.mark_write(current_user.id)
     
     return candidate
 
@@ -41,7 +49,7 @@ async def get_my_candidate_profile(
 async def get_candidate(
     candidate_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get candidate by ID (admin only in production)
     
@@ -53,9 +61,10 @@ async def get_candidate(
     Returns:
         Candidate profile
     """
-    candidate = db.query(Candidate).filter(
-        Candidate.id == candidate_id
-    ).first()
+    result = await db.execute(
+        select(Candidate).where(Candidate.id == candidate_id)
+    )
+    candidate = result.scalars().first()
     
     if not candidate:
         raise HTTPException(
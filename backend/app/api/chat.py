@@ -1,26 +1,41 @@
 """Chat endpoints"""
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from app.core.database import get_db
-from app.api.deps import get_current_user
-from app.models import User, Conversation, Message
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, AsyncIterator, Dict, Optional
+from app.core.database import get_async_db, AsyncSessionLocal
+from app.api.deps import get_current_user, get_read_db
+from app.models import User, Conversation, Message, Candidate
+from app.models.question_job import QuestionJobStatus
 from app.schemas import (
     ChatMessageRequest,
     ChatMessageResponse,
+    ConversationPage,
     ConversationResponse,
-    MessageResponse
+    MessagePage,
+    QuestionJobResponse,
+    UsageSummaryResponse
 )
 from app.services.chat_service import ChatService
+from app.services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, fetch_page
+from app.services.question_job_service import question_jobs
+from app.services.usage_service import UsageService
 from datetime import datetime
+import json
 
 router = APIRouter(prefix="/chat", tags=["Chat"])
 
 
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format a Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
 @router.post("/start", response_model=ChatMessageResponse)
 async def start_conversation(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Start a new conversation
     
@@ -32,17 +47,12 @@ async def start_conversation(
         Initial greeting message
     """
     chat_service = ChatService(db)
-    conversation, greeting = chat_service.start_conversation(current_user.id)
-    
-    # Get the first message
-    first_message = db.query(Message).filter(
-        Message.conversation_id == conversation.id
-    ).first()
+    conversation, greeting = await chat_service.start_conversation(current_user.id)
     
     return ChatMessageResponse(
         response=greeting,
         conversation_id=conversation.id,
-        message_id=first_message.id,
+        message_id=chat_service.message_id,
         timestamp=datetime.utcnow()
     )
 
@@ -51,7 +61,7 @@ async def start_conversation(
 async def send_message(
     message_request: ChatMessageRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Send a chat message
     
@@ -67,62 +77,155 @@ async def send_message(
     
     # If no conversation ID provided, start new conversation
     if not message_request.conversation_id:
-        conversation, _ = chat_service.start_conversation(current_user.id)
+        conversation, _ = await chat_service.start_conversation(current_user.id)
         conversation_id = conversation.id
     else:
         conversation_id = message_request.conversation_id
     
     # Process message
     try:
-        response = chat_service.process_message(
+        response = await chat_service.process_message(
             conversation_id,
             message_request.message,
             current_user.id
         )
-        
-        # Get the last message
-        last_message = db.query(Message).filter(
-            Message.conversation_id == conversation_id
-        ).order_by(Message.created_at.desc()).first()
-        
-        return ChatMessageResponse(
-            response=response,
-            conversation_id=conversation_id,
-            message_id=last_message.id,
-            timestamp=datetime.utcnow()
-        )
-    
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing message: {str(e)}"
         )
+    
+    if chat_service.message_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Conversation not found"
+        )
+    
+    return ChatMessageResponse(
+        response=response,
+        conversation_id=conversation_id,
+        message_id=chat_service.message_id,
+        timestamp=datetime.utcnow()
+    )
 
 
-@router.get("/conversations", response_model=List[ConversationResponse])
+@router.post("/message/stream")
+async def stream_message(
+    message_request: ChatMessageRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """Send a chat message and stream the response as Server-Sent Events
+    
+    Emits ``token`` events with response text as it is generated (and, on the
+    tech stack step, a ``question`` event for each technical question as soon
+    as it has been generated), followed by a ``done`` event carrying the
+    stored message metadata (same fields as ``/chat/message``), or an
+    ``error`` event if the turn fails.
+    
+    Args:
+        message_request: Chat message request
+        current_user: Current authenticated user
+        
+    Returns:
+        text/event-stream response
+    """
+    user_id = current_user.id
+    
+    async def event_stream() -> AsyncIterator[str]:
+        # FastAPI closes yield dependencies before a streaming body runs,
+        # so the stream owns its database session.
+        async with AsyncSessionLocal() as db:
+            chat_service = ChatService(db)
+            
+            try:
+                if not message_request.conversation_id:
+                    conversation, _ = await chat_service.start_conversation(user_id)
+                    conversation_id = conversation.id
+                else:
+                    conversation_id = message_request.conversation_id
+                
+                async for chunk in chat_service.process_message_stream(
+                    conversation_id,
+                    message_request.message,
+                    user_id
+                ):
+                    if isinstance(chunk, dict):
+                        yield _sse_event("question", chunk)
+                    else:
+                        yield _sse_event("token", {"text": chunk})
+                
+                yield _sse_event("done", {
+                    "conversation_id": conversation_id,
+                    "message_id": chat_service.message_id,
+                    "timestamp": datetime.utcnow().isoformat()
+                })
+            
+            except Exception as e:
+                yield _sse_event("error", {"detail": f"Error processing message: {str(e)}"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/conversations", response_model=ConversationPage)
 async def get_conversations(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    before: Optional[str] = Query(None, description="Return conversations older than this cursor"),
+    after: Optional[str] = Query(None, description="Return conversations newer than this cursor"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get all conversations for current user
+    """Get the current user's conversations, newest first, one page at a time
     
     Args:
+        limit: Page size
+        before: Cursor from a previous page, to page towards older conversations
+        after: Cursor from a previous page, to page towards newer conversations
         current_user: Current authenticated user
         db: Database session
         
     Returns:
-        List of conversations
+        Page of conversations with the cursor for the next one
     """
     chat_service = ChatService(db)
-    conversations = chat_service.get_user_conversations(current_user.id)
-    return conversations
+    try:
+        conversations, next_cursor = await chat_service.get_user_conversations(
+            current_user.id,
+            limit,
+            before=before,
+            after=after
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    return ConversationPage(items=conversations, next_cursor=next_cursor)
+
+
+@router.get("/usage", response_model=UsageSummaryResponse)
+async def get_usage(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get LLM token usage and latency across all of the user's conversations
+    
+    Args:
+        current_user: Current authenticated user
+        db: Database session
+        
+    Returns:
+        Usage totals and per-template breakdown
+    """
+    return await UsageService(db).summarize(user_id=current_user.id)
 
 
 @router.get("/conversations/{conversation_id}", response_model=ConversationResponse)
 async def get_conversation(
     conversation_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a specific conversation
     
@@ -135,7 +238,7 @@ async def get_conversation(
         Conversation object
     """
     chat_service = ChatService(db)
-    conversation = chat_service.get_conversation(conversation_id, current_user.id)
+    conversation = await chat_service.get_conversation(conversation_id, current_user.id)
     
     if not conversation:
         raise HTTPException(
@@ -146,36 +249,132 @@ async def get_conversation(
     return conversation
 
 
-@router.get("/conversations/{conversation_id}/messages", response_model=List[MessageResponse])
+@router.get("/conversations/{conversation_id}/messages", response_model=MessagePage)
 async def get_conversation_messages(
     conversation_id: str,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    before: Optional[str] = Query(None, description="Return messages older than this cursor"),
+    after: Optional[str] = Query(None, description="Return messages newer than this cursor"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get all messages in a conversation
+    """Get a conversation's messages, oldest first, one page at a time
+    
+    Without a cursor the latest page is returned, so a client shows the end
+    of the transcript first and pages back with ``before``.
     
     Args:
         conversation_id: Conversation ID
+        limit: Page size
+        before: Cursor from a previous page, to page towards older messages
+        after: Cursor from a previous page, to page towards newer messages
         current_user: Current authenticated user
         db: Database session
         
     Returns:
-        List of messages
+        Page of messages with the cursor for the next one
     """
     # Verify conversation belongs to user
-    conversation = db.query(Conversation).filter(
-        Conversation.id == conversation_id,
-        Conversation.user_id == current_user.id
-    ).first()
+    result = await db.execute(
+        select(Conversation.id).where(
+            Conversation.id == conversation_id,
+            Conversation.user_id == current_user.id
+        )
+    )
     
-    if not conversation:
+    if result.first() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Conversation not found"
         )
     
-    messages = db.query(Message).filter(
-        Message.conversation_id == conversation_id
-    ).order_by(Message.created_at).all()
+    try:
+        messages, next_cursor = await fetch_page(
+            db,
+            select(Message).where(Message.conversation_id == conversation_id),
+            Message.created_at,
+            Message.id,
+            limit,
+            before=before,
+            after=after
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    return MessagePage(items=messages, next_cursor=next_cursor)
+
+
+@router.get("/conversations/{conversation_id}/question-job", response_model=QuestionJobResponse)
+async def get_question_job(
+    conversation_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get the status of the conversation's technical question generation
+    
+    Clients poll this after the tech stack turn; once the job has completed
+    the questions are included (and also posted as an assistant message).
+    Read from the primary, so a poll never sees a job state older than the
+    one a previous poll returned.
+    
+    Args:
+        conversation_id: Conversation ID
+        current_user: Current authenticated user
+        db: Database session
+        
+    Returns:
+        Latest question job of the conversation
+    """
+    chat_service = ChatService(db)
+    conversation = await chat_service.get_conversation(conversation_id, current_user.id)
+    job = await question_jobs.latest(db, conversation_id) if conversation else None
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Question job not found"
+        )
+    
+    questions = None
+    if job.status == QuestionJobStatus.COMPLETED:
+        candidate = await db.get(Candidate, job.candidate_id)
+        questions = candidate.technical_questions if candidate else None
+    
+    return QuestionJobResponse(
+        id=job.id,
+        status=job.status.value,
+        attempts=job.attempts,
+        error=job.error,
+        message_id=job.message_id,
+        questions=questions,
+        created_at=job.created_at,
+        completed_at=job.completed_at
+    )
+
+
+@router.get("/conversations/{conversation_id}/usage", response_model=UsageSummaryResponse)
+async def get_conversation_usage(
+    conversation_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get LLM token usage and latency for a conversation
+    
+    Args:
+        conversation_id: Conversation ID
+        current_user: Current authenticated user
+        db: Database session
+        
+    Returns:
+        Usage totals and per-template breakdown
+    """
+    chat_service = ChatService(db)
+    conversation = await chat_service.get_conversation(conversation_id, current_user.id)
+    
+    if not conversation:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Conversation not found"
+        )
     
-    return messages
+    return await UsageService(db).summarize(conversation_id=conversation_id)
@@ -1,9 +1,11 @@
 """API dependencies and utilities"""
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from typing import Optional
-from app.core.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncGenerator, Optional
+from app.core.database import get_async_db
+from app.core.replicas import replica_router
 from app.core.security import verify_token
 from app.models import User
 
@@ -12,7 +14,7 @@ security = HTTPBearer()
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
     """Get current authenticated user from JWT token
     
@@ -45,7 +47,8 @@ async def get_current_user(
         )
     
     # Get user from database
-    user = db.query(User).filter(User.id == user_id).first()
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalars().first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -81,3 +84,18 @@ async def get_current_active_user(
             detail="Inactive user"
         )
     return current_user
+
+
+async def get_read_db(
+    current_user: User = Depends(get_current_user)
+) -> AsyncGenerator[AsyncSession, None]:
+    """Get a session for the current user's read-only queries
+    
+    Args:
+        current_user: Current user, kept on the primary right after their writes
+        
+    Yields:
+        AsyncSession: Session on a read replica or the primary
+    """
+    async with await replica_router.session(current_user.id) as db:
+        yield db
@@ -1,7 +1,7 @@
 """Application configuration using Pydantic Settings"""
 from pydantic_settings import BaseSettings
 from pydantic import Field, validator
-from typing import List, Optional
+from typing import Dict, List, Optional
 import os
 
 
@@ -24,6 +24,22 @@ class Settings(BaseSettings):
         description="PostgreSQL database URL"
     )
     DATABASE_ECHO: bool = False
+    DATABASE_AUTO_MIGRATE: bool = True  # Apply pending Alembic migrations on startup
+    
+    # Database Connection Pool (per engine and worker: up to POOL_SIZE + MAX_OVERFLOW connections)
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_MAX_OVERFLOW: int = 20
+    DATABASE_POOL_TIMEOUT: float = 30.0  # Seconds a checkout waits for a free connection
+    DATABASE_POOL_RECYCLE: int = 1800  # Replace connections older than this (seconds, -1 = never)
+    DATABASE_POOL_PRE_PING: bool = False  # Test every checkout with a round trip (recycling usually suffices)
+    DATABASE_PGBOUNCER: bool = False  # Behind pgbouncer transaction pooling: no in-process pool, no prepared statements
+    
+    # Read Replicas (GET endpoints and history reads; none = every read on the primary)
+    DATABASE_REPLICA_URLS: List[str] = []
+    DATABASE_REPLICA_STICKY_SECONDS: float = 10.0  # A user's reads stay on the primary this long after their writes
+    DATABASE_REPLICA_MAX_LAG_SECONDS: float = 5.0  # Replicas further behind are skipped (keep <= the sticky window)
+    DATABASE_REPLICA_LAG_POLL_SECONDS: float = 2.0
+    DATABASE_REPLICA_STICKY_BACKEND: str = "memory"  # "memory" (write times per worker process) or "redis" (shared via REDIS_URL)
     
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
@@ -34,6 +50,87 @@ class Settings(BaseSettings):
     GEMINI_TEMPERATURE: float = 0.7
     GEMINI_MAX_TOKENS: int = 8192  # Gemini 2.0 supports larger context
     
+    # LLM Provider ("gemini", or "fake" to run offline for load tests and benchmarks)
+    LLM_PROVIDER: str = "gemini"
+    FAKE_LLM_MODEL: str = "fake-llm"  # Model name the fake reports (rate limits and usage are keyed by it)
+    FAKE_LLM_LATENCY_MS: float = 800.0  # Median call latency
+    FAKE_LLM_LATENCY_MS_BY_TEMPLATE: Dict[str, float] = {}  # Per-template medians, e.g. {"question_generation": 3000}
+    FAKE_LLM_LATENCY_SIGMA: float = 0.5  # Lognormal spread of latencies (0 = fixed)
+    FAKE_LLM_FIRST_CHUNK_SHARE: float = 0.2  # Share of a streamed call's latency before the first chunk
+    FAKE_LLM_STREAM_CHUNK_CHARS: int = 24
+    FAKE_LLM_ERROR_RATE: float = 0.0  # Share of calls failing with a transient server error
+    FAKE_LLM_RATE_LIMIT_RATE: float = 0.0  # Share of calls rejected with a 429
+    FAKE_LLM_SEED: Optional[int] = None  # Seed for reproducible latencies and failures
+    
+    # LLM Retry Policy
+    LLM_MAX_ATTEMPTS: int = 3
+    LLM_ATTEMPT_TIMEOUT_SECONDS: float = 20.0  # Deadline for a single Gemini call
+    LLM_RETRY_BASE_DELAY_SECONDS: float = 0.5
+    LLM_RETRY_MAX_DELAY_SECONDS: float = 4.0
+    LLM_TURN_BUDGET_SECONDS: float = 30.0  # Total LLM time allowed per chat turn before falling back
+    
+    # LLM Rate Governor (per-model quotas shared by all workers in redis mode)
+    LLM_RATE_LIMIT_ENABLED: Optional[bool] = None  # Unset: on with the redis backend, off with memory
+    LLM_RATE_LIMIT_BACKEND: str = "memory"  # "memory" (each worker process gets the full quota) or "redis" (via REDIS_URL)
+    LLM_RATE_LIMIT_RPM: int = 15  # Default requests per minute per model
+    LLM_RATE_LIMIT_TPM: int = 1000000  # Default tokens per minute per model
+    LLM_RATE_LIMITS: Dict[str, Dict[str, int]] = {}  # Per-model overrides, e.g. {"gemini-2.0-flash-exp": {"rpm": 10}}
+    LLM_RATE_QUEUE_SIZE: int = 64  # Calls allowed to wait per model before new ones are rejected
+    LLM_RATE_MAX_WAIT_SECONDS: float = 10.0
+    LLM_RATE_BACKGROUND_RESERVE: float = 0.2  # Share of each bucket background calls may not use
+    LLM_RATE_EXPECTED_OUTPUT_TOKENS: int = 512  # Output tokens reserved per call in the TPM estimate
+    
+    # LLM Request Hedging (duplicate slow interactive calls, first response wins)
+    LLM_HEDGE_ENABLED: bool = False
+    LLM_HEDGE_TEMPLATES: List[str] = ["response"]
+    LLM_HEDGE_PERCENTILE: float = 0.95  # Hedge once a call is slower than this share of recent calls
+    LLM_HEDGE_BUDGET: float = 0.05  # Maximum extra requests, as a fraction of hedgeable calls
+    LLM_HEDGE_MIN_SAMPLES: int = 20  # Latencies observed per template before hedging starts
+    LLM_HEDGE_MIN_DELAY_MS: float = 250.0
+    
+    # Response Prompt Context
+    LLM_CONTEXT_TOKEN_BUDGET: int = 2000  # Prompt cap for free-form responses, excluding the system instruction
+    LLM_CONTEXT_RECENT_MESSAGES: int = 6  # Messages kept verbatim before being folded into the summary
+    LLM_CONTEXT_SUMMARY_BATCH: int = 6  # Messages folded into the summary at a time
+    LLM_CONTEXT_SUMMARY_MAX_TOKENS: int = 256
+    
+    # LLM Response Cache (deterministic prompts only, opted in per template)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_TEMPLATES: List[str] = ["tech_stack_parser", "validation", "greeting", "closing"]
+    LLM_CACHE_MAX_ENTRIES: int = 1024
+    LLM_CACHE_TTL_SECONDS: int = 3600
+    LLM_CACHE_REDIS_ENABLED: bool = False  # Share cached responses across workers via REDIS_URL
+    
+    # Tech Stack Parsing
+    TECH_STACK_LLM_FALLBACK: bool = True  # Ask the LLM about items missing from the skill taxonomy
+    TECH_STACK_PIPELINE: str = "fused"  # "fused" (one structured call) or "sequential" (parse, then questions)
+    
+    # Screening Field Extraction
+    PHONE_DEFAULT_REGION: str = "US"  # Country assumed for phone numbers without a +country code
+    FIELD_VALIDATION_LLM_FALLBACK: bool = True  # Ask the LLM about names the local check rejects
+    
+    # Greeting/Closing Message Pool
+    MESSAGE_POOL_ENABLED: bool = True
+    MESSAGE_POOL_SIZE: int = 20  # Variants kept per message kind
+    MESSAGE_POOL_LOW_WATERMARK: int = 5  # Refill early when fewer fresh variants remain
+    MESSAGE_POOL_MAX_AGE_HOURS: int = 24  # Variants older than this are replaced
+    MESSAGE_POOL_REFRESH_SECONDS: int = 600
+    
+    # Speculative Question Bank Warming (once position and experience are known)
+    SPECULATIVE_WARMING_ENABLED: bool = True
+    SPECULATIVE_TECHNOLOGIES: int = 6  # Technologies predicted per candidate
+    SPECULATIVE_MIN_BANK_QUESTIONS: int = 4  # Warm technologies with fewer stored questions per band
+    SPECULATIVE_QUESTIONS_PER_TECHNOLOGY: int = 2
+    SPECULATIVE_HISTORY_SIZE: int = 500  # Recent candidates the prediction is drawn from
+    SPECULATIVE_MAX_CONCURRENT: int = 2  # Warming tasks per process; more are skipped
+    
+    # Background Question Generation (tech stack turn returns at once; questions arrive later)
+    QUESTION_JOBS_ENABLED: bool = True
+    QUESTION_JOB_WORKERS: int = 2  # Jobs run concurrently per process
+    QUESTION_JOB_POLL_SECONDS: int = 5  # Scan for pending jobs and expired leases
+    QUESTION_JOB_LEASE_SECONDS: int = 120  # Retry a running job after this long (keep above LLM_TURN_BUDGET_SECONDS)
+    QUESTION_JOB_MAX_ATTEMPTS: int = 3
+    
     # JWT Authentication
     JWT_SECRET_KEY: str = Field(
         default="your-super-secret-jwt-key-change-this-in-production",
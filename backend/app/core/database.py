@@ -1,26 +1,205 @@
 """Database configuration and session management"""
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, event, exc, inspect, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+from typing import Any, AsyncGenerator, Dict, Generator, Iterator, Optional
+import time
+import uuid
 from app.core.config import settings
+from app.core.metrics import metrics
 
-# Create database engine
+
+def get_async_database_url(url: str) -> str:
+    """Map a sync database URL onto its asyncio driver
+    
+    Args:
+        url: Database URL as configured in settings
+    
+    Returns:
+        URL using asyncpg for PostgreSQL (aiosqlite for SQLite)
+    """
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+
+class PoolTelemetry:
+    """Pool mixin exporting checkout wait, connections in use and overflow
+    
+    Series are labelled with the pool's logging name (``pool_logging_name``
+    on the engine), which survives ``dispose()`` recreating the pool.
+    ``_do_get``/``_do_return_conn`` are the QueuePool hooks every checkout
+    and checkin goes through.
+    """
+    
+    @property
+    def label(self) -> str:
+        """Metric label of this pool"""
+        return self.logging_name or "db"
+    
+    def _do_get(self):
+        """Check out a connection, recording the wait and any overflow"""
+        started = time.monotonic()
+        overflow = self.overflow()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            metrics.increment("db_pool_timeouts_total", pool=self.label)
+            raise
+        metrics.observe("db_pool_checkout_wait_ms", (time.monotonic() - started) * 1000, pool=self.label)
+        if self.overflow() > max(overflow, 0):
+            metrics.increment("db_pool_overflow_total", pool=self.label)
+        metrics.set_gauge("db_pool_in_use", self.checkedout(), pool=self.label)
+        return record
+    
+    def _do_return_conn(self, record) -> None:
+        """Check a connection back in"""
+        super()._do_return_conn(record)
+        metrics.set_gauge("db_pool_in_use", self.checkedout(), pool=self.label)
+
+
+class InstrumentedQueuePool(PoolTelemetry, QueuePool):
+    """QueuePool with telemetry (sync engine)"""
+
+
+class InstrumentedAsyncQueuePool(PoolTelemetry, AsyncAdaptedQueuePool):
+    """QueuePool with telemetry (asyncio engines)"""
+
+
+def get_engine_options(url: str, label: str, is_async: bool) -> Dict[str, Any]:
+    """Engine keyword arguments for the configured pooling mode
+    
+    SQLite keeps SQLAlchemy's default pool for its driver. With
+    ``DATABASE_PGBOUNCER`` connections are not pooled in-process (pgbouncer
+    pools them) and asyncpg's prepared statements, which do not survive
+    transaction pooling, are disabled. Otherwise an instrumented QueuePool
+    is sized from the ``DATABASE_POOL_*`` settings.
+    
+    Args:
+        url: Database URL
+        label: Pool name used as the metric label
+        is_async: Whether the engine is created with ``create_async_engine``
+    
+    Returns:
+        Keyword arguments for ``create_engine``/``create_async_engine``
+    """
+    options: Dict[str, Any] = {"echo": settings.DATABASE_ECHO}
+    if url.startswith("sqlite"):
+        return options
+    
+    if settings.DATABASE_PGBOUNCER:
+        options["poolclass"] = NullPool
+        if is_async:
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__"
+            }
+        return options
+    
+    options.update(
+        poolclass=InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        pool_logging_name=label,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        pool_pre_ping=settings.DATABASE_POOL_PRE_PING
+    )
+    return options
+
+
+# Create database engine (sync - used by scripts and setup checks)
 engine = create_engine(
     settings.DATABASE_URL,
-    echo=settings.DATABASE_ECHO,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+    **get_engine_options(settings.DATABASE_URL, "primary_sync", is_async=False)
 )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Create async database engine (used by the API)
+async_engine = create_async_engine(
+    get_async_database_url(settings.DATABASE_URL),
+    **get_engine_options(settings.DATABASE_URL, "primary", is_async=True)
+)
+
+# Create async session factory. Objects stay usable after commit so routes can
+# serialize them without an implicit (and, under asyncio, illegal) lazy reload.
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Create base class for models
 Base = declarative_base()
 
 
+@dataclass
+class StatementCount:
+    """SQL statements and commits issued within a counted block"""
+    statements: int = 0
+    commits: int = 0
+
+
+# Counter of the unit of work running in the current context (None outside one)
+_statement_count: ContextVar[Optional[StatementCount]] = ContextVar("db_statement_count", default=None)
+
+
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    """Count a statement against the current unit of work"""
+    count = _statement_count.get()
+    if count is not None:
+        count.statements += 1
+
+
+@event.listens_for(async_engine.sync_engine, "commit")
+def _count_commit(conn) -> None:
+    """Count a commit against the current unit of work"""
+    count = _statement_count.get()
+    if count is not None:
+        count.commits += 1
+
+
+@contextmanager
+def count_statements(kind: str) -> Iterator[StatementCount]:
+    """Count the SQL statements and commits issued in the enclosed block
+    
+    The totals are recorded as ``db_statements_per_turn`` and
+    ``db_commits_per_turn``.
+    
+    Args:
+        kind: Turn kind label for the metrics
+    """
+    count = StatementCount()
+    token = _statement_count.set(count)
+    try:
+        yield count
+    finally:
+        try:
+            _statement_count.reset(token)
+        except ValueError:
+            # A streamed turn may be closed from a different context than it started in
+            _statement_count.set(None)
+        metrics.observe("db_statements_per_turn", count.statements, kind=kind)
+        metrics.observe("db_commits_per_turn", count.commits, kind=kind)
+
+
 def get_db() -> Generator[Session, None, None]:
     """Get database session
     
@@ -34,6 +213,56 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Get async database session
+    
+    Yields:
+        AsyncSession: SQLAlchemy async database session
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Alembic configuration (backend/alembic.ini)
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+# Revision describing the schema create_all produced before migrations existed
+BASELINE_REVISION = "0001_initial_schema"
+
+# PostgreSQL advisory lock held while migrating, so workers starting together take turns
+MIGRATION_LOCK_KEY = 7_211_942
+
+
+def run_migrations(connection: Connection) -> None:
+    """Upgrade the database on a connection to the latest Alembic revision
+    
+    A database whose tables were created by ``create_all`` before migrations
+    existed (tables but no ``alembic_version``) is stamped with the baseline
+    revision first, so only the later migrations run on it.
+    
+    Args:
+        connection: Sync connection, committed by the caller
+    """
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+    
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "migrations"))
+    config.attributes["connection"] = connection
+    
+    tables = set(inspect(connection).get_table_names())
+    if "users" in tables and "alembic_version" not in tables:
+        command.stamp(config, BASELINE_REVISION)
+    command.upgrade(config, "head")
+
+
 def init_db() -> None:
-    """Initialize database - create all tables"""
-    Base.metadata.create_all(bind=engine)
+    """Initialize database - apply pending migrations"""
+    with engine.begin() as conn:
+        run_migrations(conn)
+
+
+async def init_async_db() -> None:
+    """Initialize database - apply pending migrations without blocking the event loop"""
+    async with async_engine.begin() as conn:
+        await conn.run_sync(run_migrations)
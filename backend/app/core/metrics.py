@@ -0,0 +1,122 @@
+"""In-process metrics registry for counters, gauges and latency summaries"""
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, Tuple
+import threading
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+# Number of recent observations kept per summary for percentile estimates
+SUMMARY_WINDOW = 1024
+
+
+def _label_set(labels: Dict[str, Any]) -> LabelSet:
+    """Turn keyword labels into a hashable, ordered label set"""
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _series_name(name: str, labels: LabelSet) -> str:
+    """Format a series name Prometheus-style, e.g. ``llm_calls{template="greeting"}``"""
+    if not labels:
+        return name
+    rendered = ",".join(f'{key}="{value}"' for key, value in labels)
+    return f"{name}{{{rendered}}}"
+
+
+def _percentile(values: Deque[float], fraction: float) -> float:
+    """Nearest-rank percentile of the observed values"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+class MetricsRegistry:
+    """Thread-safe registry of counters, gauges and summaries
+    
+    Metrics are per process; each uvicorn worker reports its own numbers.
+    """
+    
+    def __init__(self):
+        """Initialize empty metric stores"""
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelSet, float]] = defaultdict(lambda: defaultdict(float))
+        self._gauges: Dict[str, Dict[LabelSet, float]] = defaultdict(dict)
+        self._summaries: Dict[str, Dict[LabelSet, Dict[str, Any]]] = defaultdict(dict)
+    
+    def increment(self, name: str, value: float = 1, **labels: Any) -> None:
+        """Increment a counter
+        
+        Args:
+            name: Metric name
+            value: Amount to add
+            **labels: Label values identifying the series
+        """
+        with self._lock:
+            self._counters[name][_label_set(labels)] += value
+    
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        """Set a gauge to its current value
+        
+        Args:
+            name: Metric name
+            value: Current value
+            **labels: Label values identifying the series
+        """
+        with self._lock:
+            self._gauges[name][_label_set(labels)] = value
+    
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Record an observation (e.g. a latency in milliseconds)
+        
+        Args:
+            name: Metric name
+            value: Observed value
+            **labels: Label values identifying the series
+        """
+        with self._lock:
+            summary = self._summaries[name].get(_label_set(labels))
+            if summary is None:
+                summary = {"count": 0, "sum": 0.0, "window": deque(maxlen=SUMMARY_WINDOW)}
+                self._summaries[name][_label_set(labels)] = summary
+            summary["count"] += 1
+            summary["sum"] += value
+            summary["window"].append(value)
+    
+    def get_counter(self, name: str, **labels: Any) -> float:
+        """Get the current value of a counter series"""
+        with self._lock:
+            return self._counters.get(name, {}).get(_label_set(labels), 0)
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Get a JSON-serializable snapshot of every metric
+        
+        Returns:
+            Dictionary of counters, gauges and summaries keyed by series name
+        """
+        with self._lock:
+            counters = {
+                _series_name(name, labels): value
+                for name, series in self._counters.items()
+                for labels, value in series.items()
+            }
+            gauges = {
+                _series_name(name, labels): value
+                for name, series in self._gauges.items()
+                for labels, value in series.items()
+            }
+            summaries = {}
+            for name, series in self._summaries.items():
+                for labels, summary in series.items():
+                    window = summary["window"]
+                    summaries[_series_name(name, labels)] = {
+                        "count": summary["count"],
+                        "sum": round(summary["sum"], 3),
+                        "p50": round(_percentile(window, 0.50), 3),
+                        "p95": round(_percentile(window, 0.95), 3),
+                        "p99": round(_percentile(window, 0.99), 3),
+                    }
+        
+        return {"counters": counters, "gauges": gauges, "summaries": summaries}
+
+
+# Global metrics registry
+metrics = MetricsRegistry()
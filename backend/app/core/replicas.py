@@ -0,0 +1,206 @@
+"""Read-replica routing for read-only queries"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional
+import asyncio
+import itertools
+import time
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, get_async_database_url, get_engine_options
+from app.core.metrics import metrics
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - redis is optional for single-process runs
+    aioredis = None
+
+# Users whose last write is remembered for read-your-writes stickiness
+MAX_TRACKED_WRITERS = 100000
+
+# Seconds a standby's last replayed transaction is behind the primary (0 when fully replayed)
+POSTGRES_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() IS NULL "
+    "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+@dataclass
+class Replica:
+    """One read replica and its last measured lag"""
+    name: str
+    engine: AsyncEngine
+    sessions: async_sessionmaker
+    lag: Optional[float] = None  # Seconds behind the primary; None until measured or while unreachable
+
+
+class ReplicaRouter:
+    """Sends read-only sessions to read replicas, keeping recent writers on the primary
+    
+    Reads are spread round-robin over the replicas whose last measured lag
+    is within ``DATABASE_REPLICA_MAX_LAG_SECONDS``. A user's reads go to the
+    primary for ``DATABASE_REPLICA_STICKY_SECONDS`` after their last write,
+    so they always see their own changes. With the sticky window at least
+    as long as the maximum lag, a replica that is chosen has replayed the
+    write. Replicas are measured by a poller; until their first measurement
+    (or while they cannot be reached) every read goes to the primary.
+    
+    Write times are kept per process, so with several workers a write
+    handled by one only keeps that worker's reads on the primary. The
+    redis backend (``DATABASE_REPLICA_STICKY_BACKEND``) shares them: each
+    write also sets a key in Redis that expires with the sticky window.
+    """
+    
+    KEY_PREFIX = "replica:write:"
+    
+    def __init__(self, urls: List[str]):
+        """Create an engine per replica
+        
+        Args:
+            urls: Replica database URLs (none routes every read to the primary)
+        """
+        self.replicas: List[Replica] = []
+        for index, url in enumerate(urls):
+            name = f"replica-{index}"
+            engine = create_async_engine(get_async_database_url(url), **get_engine_options(url, name, is_async=True))
+            sessions = async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+            self.replicas.append(Replica(name, engine, sessions))
+        self._writes: "OrderedDict[str, float]" = OrderedDict()
+        self._redis = None
+        if self.replicas and settings.DATABASE_REPLICA_STICKY_BACKEND == "redis":
+            if aioredis is not None:
+                self._redis = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+            else:
+                print("Warning: redis is not installed; read-your-writes stickiness is per process")
+        self._turn = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+    
+    async def mark_write(self, user_id: str) -> None:
+        """Record that a user's data just changed on the primary
+        
+        Args:
+            user_id: User ID
+        """
+        if not self.replicas:
+            return
+        now = time.monotonic()
+        self._writes[user_id] = now
+        self._writes.move_to_end(user_id)
+        
+        cutoff = now - settings.DATABASE_REPLICA_STICKY_SECONDS
+        while self._writes and (next(iter(self._writes.values())) < cutoff or len(self._writes) > MAX_TRACKED_WRITERS):
+            self._writes.popitem(last=False)
+        
+        if self._redis is not None:
+            try:
+                await self._redis.set(
+                    self.KEY_PREFIX + user_id,
+                    1,
+                    px=int(settings.DATABASE_REPLICA_STICKY_SECONDS * 1000)
+                )
+            except Exception as e:
+                print(f"Replica write marker Redis write failed: {str(e)}")
+                metrics.increment("db_replica_sticky_errors_total", operation="set")
+    
+    async def _wrote_recently(self, user_id: str) -> bool:
+        """Whether a user wrote within the sticky window, in any worker with the redis backend"""
+        written = self._writes.get(user_id)
+        if written is not None and time.monotonic() - written < settings.DATABASE_REPLICA_STICKY_SECONDS:
+            return True
+        if self._redis is None:
+            return False
+        try:
+            return bool(await self._redis.exists(self.KEY_PREFIX + user_id))
+        except Exception as e:
+            # The primary is always up to date, so read from it when in doubt
+            print(f"Replica write marker Redis read failed: {str(e)}")
+            metrics.increment("db_replica_sticky_errors_total", operation="get")
+            return True
+    
+    async def choose(self, user_id: Optional[str] = None) -> Optional[Replica]:
+        """Replica to read a user's data from
+        
+        Args:
+            user_id: User the data belongs to, for read-your-writes stickiness
+        
+        Returns:
+            Replica, or None to read from the primary
+        """
+        if not self.replicas:
+            return None
+        
+        if user_id and await self._wrote_recently(user_id):
+            metrics.increment("db_reads_total", target="primary", reason="sticky")
+            return None
+        
+        healthy = [
+            replica for replica in self.replicas
+            if replica.lag is not None and replica.lag <= settings.DATABASE_REPLICA_MAX_LAG_SECONDS
+        ]
+        if not healthy:
+            metrics.increment("db_reads_total", target="primary", reason="no_replica")
+            return None
+        
+        replica = healthy[next(self._turn) % len(healthy)]
+        metrics.increment("db_reads_total", target=replica.name, reason="replica")
+        return replica
+    
+    async def session(self, user_id: Optional[str] = None) -> AsyncSession:
+        """Session for read-only queries on behalf of a user
+        
+        Args:
+            user_id: User the data belongs to, for read-your-writes stickiness
+        
+        Returns:
+            Session on a replica, or on the primary if none can be used
+        """
+        replica = await self.choose(user_id)
+        return replica.sessions() if replica else AsyncSessionLocal()
+    
+    async def measure_lag(self) -> None:
+        """Measure every replica's lag and export it as ``db_replica_lag_seconds``"""
+        for replica in self.replicas:
+            try:
+                async with replica.engine.connect() as conn:
+                    if conn.dialect.name == "postgresql":
+                        replica.lag = float((await conn.execute(POSTGRES_LAG_QUERY)).scalar() or 0)
+                    else:
+                        # No replication to measure (e.g. a SQLite copy used in development)
+                        await conn.execute(text("SELECT 1"))
+                        replica.lag = 0.0
+                metrics.set_gauge("db_replica_lag_seconds", replica.lag, replica=replica.name)
+                metrics.set_gauge("db_replica_up", 1, replica=replica.name)
+            except Exception as e:
+                replica.lag = None
+                metrics.set_gauge("db_replica_up", 0, replica=replica.name)
+                print(f"Replica lag check error ({replica.name}): {str(e)}")
+    
+    async def _poll_forever(self) -> None:
+        """Measure replica lag periodically (first at startup)"""
+        while True:
+            await self.measure_lag()
+            await asyncio.sleep(settings.DATABASE_REPLICA_LAG_POLL_SECONDS)
+    
+    def start(self) -> None:
+        """Start the lag poller"""
+        if self.replicas and self._task is None:
+            self._task = asyncio.create_task(self._poll_forever())
+    
+    async def stop(self) -> None:
+        """Stop the lag poller and close the replica connections"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+# Global replica router instance
+replica_router = ReplicaRouter(settings.DATABASE_REPLICA_URLS)
+
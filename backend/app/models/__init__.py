@@ -2,5 +2,9 @@
 from app.models.user import User
 from app.models.candidate import Candidate
 from app.models.conversation import Conversation, Message
+from app.models.question_bank import QuestionBankEntry
+from app.models.message_pool import PooledMessage
+from app.models.llm_usage import LLMUsage
+from app.models.question_job import QuestionJob
 
-__all__ = ["User", "Candidate", "Conversation", "Message"]
+__all__ = ["User", "Candidate", "Conversation", "Message", "QuestionBankEntry", "PooledMessage", "LLMUsage", "QuestionJob"]
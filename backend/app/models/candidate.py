@@ -1,5 +1,5 @@
 """Candidate model for storing candidate information"""
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text, JSON
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -10,6 +10,9 @@ class Candidate(Base):
     """Candidate model storing all information gathered during screening"""
     
     __tablename__ = "candidates"
+    __table_args__ = (
+        Index("ix_candidates_created", "created_at"),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, ForeignKey("users.id"), unique=True, nullable=False)
@@ -1,5 +1,5 @@
 """Conversation and Message models for chat history"""
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Enum, Integer
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Enum, Integer, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -25,6 +25,9 @@ class Conversation(Base):
     """Conversation model for tracking chat sessions"""
     
     __tablename__ = "conversations"
+    __table_args__ = (
+        Index("ix_conversations_user_started", "user_id", "started_at", "id"),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
@@ -37,6 +40,10 @@ class Conversation(Base):
     ended_at = Column(DateTime(timezone=True), nullable=True)
     message_count = Column(Integer, default=0)
     
+    # Rolling summary of the messages older than the verbatim prompt window
+    summary = Column(Text, nullable=True)
+    summary_message_count = Column(Integer, default=0)  # Leading messages folded into the summary
+    
     # Relationships
     user = relationship("User", back_populates="conversations")
     messages = relationship("Message", back_populates="conversation", cascade="all, delete-orphan")
@@ -49,6 +56,9 @@ class Message(Base):
     """Message model for individual chat messages"""
     
     __tablename__ = "messages"
+    __table_args__ = (
+        Index("ix_messages_conversation_created", "conversation_id", "created_at", "id"),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     conversation_id = Column(String, ForeignKey("conversations.id"), nullable=False)
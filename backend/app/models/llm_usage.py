@@ -0,0 +1,34 @@
+"""LLM usage model for per-call token and latency accounting"""
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Float, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+import uuid
+
+
+class LLMUsage(Base):
+    """Token counts and latency of one LLM call made during a chat turn"""
+    
+    __tablename__ = "llm_usage"
+    __table_args__ = (
+        Index("ix_llm_usage_conversation", "conversation_id"),
+        Index("ix_llm_usage_user", "user_id"),
+    )
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    conversation_id = Column(String, ForeignKey("conversations.id"), nullable=True)
+    user_id = Column(String, ForeignKey("users.id"), nullable=True)
+    message_id = Column(String, ForeignKey("messages.id"), nullable=True)  # Assistant message the call produced
+    
+    # Call details
+    template = Column(String, nullable=False)  # Prompt template, e.g. "question_generation"
+    model = Column(String, nullable=False)
+    prompt_tokens = Column(Integer, default=0)
+    output_tokens = Column(Integer, default=0)
+    total_tokens = Column(Integer, default=0)
+    latency_ms = Column(Float, default=0.0)
+    
+    # Metadata
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self):
+        return f"<LLMUsage {self.template}: {self.total_tokens} tokens>"
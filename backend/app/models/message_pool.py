@@ -0,0 +1,24 @@
+"""Message pool model for pre-generated greeting and closing variants"""
+from sqlalchemy import Column, String, DateTime, Text, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+import uuid
+
+
+class PooledMessage(Base):
+    """Pre-generated assistant message served instead of a synchronous LLM call"""
+    
+    __tablename__ = "message_pool"
+    __table_args__ = (
+        Index("ix_message_pool_kind_created", "kind", "created_at"),
+    )
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    kind = Column(String, nullable=False)  # greeting, closing
+    content = Column(Text, nullable=False)
+    
+    # Metadata
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self):
+        return f"<PooledMessage {self.kind}: {self.content[:50]}...>"
@@ -0,0 +1,33 @@
+"""Question bank model for reusable technical interview questions"""
+from sqlalchemy import Column, String, Integer, DateTime, Text, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+import uuid
+
+
+class QuestionBankEntry(Base):
+    """Technical question stored for reuse across candidates with similar profiles"""
+    
+    __tablename__ = "question_bank"
+    __table_args__ = (
+        Index("ix_question_bank_lookup", "technology", "experience_band", "difficulty"),
+    )
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    
+    # Lookup keys
+    technology = Column(String, nullable=False)  # Canonical technology key, e.g. "postgresql"
+    experience_band = Column(String, nullable=False)  # "0-2", "3-5" or "6+"
+    difficulty = Column(String, nullable=False, default="medium")  # easy, medium, hard
+    position = Column(String, nullable=True)  # Normalized position the question was generated for
+    
+    # Content
+    technology_label = Column(String, nullable=False)  # Display name, e.g. "PostgreSQL"
+    question = Column(Text, nullable=False)
+    source = Column(String, default="llm")  # llm, seed
+    
+    # Metadata
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self):
+        return f"<QuestionBankEntry {self.technology} [{self.experience_band}/{self.difficulty}]>"
@@ -0,0 +1,48 @@
+"""Question job model for background technical question generation"""
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Enum, Integer, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+import uuid
+import enum
+
+
+class QuestionJobStatus(str, enum.Enum):
+    """Question job status enumeration"""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class QuestionJob(Base):
+    """Technical question generation for a candidate's tech stack, run off the request path
+    
+    The row is the job's only state, so a job whose worker died (restart,
+    crash) is picked up again once its lease expires.
+    """
+    
+    __tablename__ = "question_jobs"
+    __table_args__ = (
+        Index("ix_question_jobs_status_started", "status", "started_at"),
+        Index("ix_question_jobs_conversation_created", "conversation_id", "created_at"),
+    )
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    candidate_id = Column(String, ForeignKey("candidates.id"), nullable=False)
+    conversation_id = Column(String, ForeignKey("conversations.id"), nullable=False)
+    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    
+    # Job input and state
+    tech_stack_raw = Column(Text, nullable=False)
+    status = Column(Enum(QuestionJobStatus), default=QuestionJobStatus.PENDING, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    error = Column(Text, nullable=True)  # Last failure, if any
+    message_id = Column(String, ForeignKey("messages.id"), nullable=True)  # Assistant message with the questions
+    
+    # Metadata
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)  # Start of the current attempt (lease)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+    
+    def __repr__(self):
+        return f"<QuestionJob {self.id}: {self.status}>"
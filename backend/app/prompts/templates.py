@@ -87,6 +87,32 @@ Return ONLY a valid JSON array in this exact format:
 
 Generate exactly {num_questions} questions."""
 
+TECH_STACK_QUESTIONS_PROMPT = """A candidate described their tech stack as: {tech_stack_raw}
+
+Already categorized: {known_stack}
+
+Do two things:
+1. Categorize these remaining items into languages, frameworks, databases and tools: {unknown_items}
+2. Generate {num_questions} technical interview questions for a candidate with {years_exp} years of experience applying for {position}, focusing on: {focus}
+
+Questions should match the experience level, mix conceptual and practical topics, cover different technologies and be clear and answerable.
+
+Return ONLY a JSON object matching this schema:
+{schema}"""
+
+STRUCTURED_REPAIR_PROMPT = """Your previous response did not match the required JSON schema.
+
+Schema:
+{schema}
+
+Validation errors:
+{errors}
+
+Previous response:
+{response}
+
+Fix only what the errors point out and return ONLY the corrected JSON."""
+
 VALIDATION_PROMPT = """Validate if the following {field_type} is in the correct format:
 
 Value: {value}
@@ -115,3 +141,42 @@ Include:
 - Wish them well
 
 Keep it professional and encouraging, under 4 sentences."""
+
+CONVERSATION_SUMMARY_PROMPT = """Update the running summary of a candidate screening conversation.
+
+Current summary:
+{summary}
+
+New messages:
+{messages}
+
+Write the updated summary in under 120 words. Keep the candidate's answers to technical questions, any concerns or requests they raised, and which questions remain unanswered. Return only the summary text."""
+
+# Static messages served when the pre-generated pool is empty
+GREETING_FALLBACK = """Welcome to TalentScout! 👋 I'm your hiring assistant, and I'll gather some information about you and then ask a few technical questions based on your skills. Please be as honest and detailed as you can. To get started, what's your full name?"""
+
+CLOSING_FALLBACK = """Thank you for your time! We have all the information we need, and our team will review your profile and contact you about next steps. Best of luck!"""
+
+# Local replies for messages the intent classifier routes away from the LLM
+OFF_TOPIC_REPLY = """I'm here to help with your TalentScout screening, so let's stay on track."""
+
+PROCESS_INFO_REPLY = """I'm TalentScout's hiring assistant. I collect a few details about you, then ask some technical questions based on your tech stack. Our recruiters review everything and contact you about next steps."""
+
+QA_FOLLOW_UP = """Feel free to answer the technical questions above, or say "bye" when you're done."""
+
+# Text around the technical questions in the tech stack step's response
+QUESTIONS_INTRO = """Perfect! I've analyzed your tech stack. ✅
+
+Based on your skills, here are some technical questions:
+
+"""
+
+QUESTIONS_OUTRO = """
+Feel free to answer these questions, or let me know if you have any concerns!"""
+
+# Replies while technical questions are generated in the background
+QUESTIONS_PENDING_REPLY = """Thanks! I'm analyzing your tech stack and preparing a few technical questions for you. They'll appear here in a moment. ⏳"""
+
+QUESTIONS_GENERATING_REPLY = """I'm still preparing your technical questions. They'll appear here in a moment."""
+
+QUESTIONS_FAILED_REPLY = """Sorry, I couldn't prepare technical questions for your tech stack just now. Could you list your programming languages, frameworks, databases and tools again?"""
@@ -75,12 +75,52 @@ class MessageResponse(BaseModel):
     id: str
     role: str
     content: str
+    tokens_used: Optional[int] = None
     created_at: datetime
     
     class Config:
         from_attributes = True
 
 
+class ConversationPage(BaseModel):
+    """One page of a user's conversations, newest first"""
+    items: List[ConversationResponse]
+    next_cursor: Optional[str] = None  # Cursor for the following page; None on the last one
+
+
+class MessagePage(BaseModel):
+    """One page of a conversation's messages, oldest first"""
+    items: List[MessageResponse]
+    next_cursor: Optional[str] = None  # Cursor for the following page; None on the last one
+
+
+class QuestionJobResponse(BaseModel):
+    """Background technical question generation status"""
+    id: str
+    status: str
+    attempts: int
+    error: Optional[str] = None
+    message_id: Optional[str] = None  # Assistant message presenting the questions
+    questions: Optional[List[Dict[str, Any]]] = None  # Set once completed
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+
+
+class UsageTotals(BaseModel):
+    """LLM usage totals"""
+    calls: int = 0
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    total_tokens: int = 0
+    latency_ms: float = 0.0
+
+
+class UsageSummaryResponse(BaseModel):
+    """LLM usage rolled up overall and per prompt template"""
+    totals: UsageTotals
+    by_template: Dict[str, UsageTotals]
+
+
 # Candidate Schemas
 class CandidateResponse(BaseModel):
     """Candidate response"""
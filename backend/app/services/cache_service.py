@@ -0,0 +1,225 @@
+"""Content-addressed cache for LLM responses to deterministic prompts"""
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+import asyncio
+import hashlib
+import json
+import re
+import time
+from app.core.config import settings
+from app.core.metrics import metrics
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - redis is optional for single-process runs
+    aioredis = None
+
+T = TypeVar("T")
+
+
+class LRUTTLCache:
+    """In-process LRU cache whose entries also expire after a fixed TTL"""
+    
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        """Initialize the cache
+        
+        Args:
+            max_entries: Maximum number of entries before the least recently used is evicted
+            ttl_seconds: Seconds an entry stays valid after it was stored
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached value, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: str, value: str) -> None:
+        """Store a value, evicting the least recently used entry when full"""
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class LLMResponseCache:
+    """Two-tier (in-process LRU+TTL, optional Redis) cache for LLM responses
+    
+    Entries are addressed by a hash of the model, prompt template, normalized
+    template arguments and generation config, so only prompts that would
+    produce an equivalent request share an entry. Caching is opt-in per
+    template via ``settings.LLM_CACHE_TEMPLATES``.
+    """
+    
+    KEY_PREFIX = "talentscout:llm-cache:"
+    
+    def __init__(self):
+        """Initialize cache tiers from settings"""
+        self.memory = LRUTTLCache(
+            max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.LLM_CACHE_TTL_SECONDS
+        )
+        self._redis = None
+        if settings.LLM_CACHE_REDIS_ENABLED and aioredis is not None:
+            self._redis = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+    
+    def is_enabled(self, template: Optional[str]) -> bool:
+        """Check whether responses for a template may be cached"""
+        return bool(
+            settings.LLM_CACHE_ENABLED
+            and template
+            and template in settings.LLM_CACHE_TEMPLATES
+        )
+    
+    @staticmethod
+    def normalize(value: Any) -> Any:
+        """Normalize template arguments so trivially different inputs share a key
+        
+        Strings are case-folded with whitespace collapsed; containers are
+        normalized recursively.
+        """
+        if isinstance(value, str):
+            return re.sub(r"\s+", " ", value).strip().casefold()
+        if isinstance(value, dict):
+            return {str(k): LLMResponseCache.normalize(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [LLMResponseCache.normalize(v) for v in value]
+        return value
+    
+    @classmethod
+    def make_key(
+        cls,
+        model: str,
+        template: str,
+        arguments: Dict[str, Any],
+        generation_config: Dict[str, Any]
+    ) -> str:
+        """Build the content address for a request
+        
+        Args:
+            model: Model name
+            template: Prompt template name
+            arguments: Template arguments
+            generation_config: Generation parameters (and system instruction)
+        
+        Returns:
+            Hex digest identifying the request
+        """
+        payload = json.dumps(
+            {
+                "model": model,
+                "template": template,
+                "arguments": cls.normalize(arguments),
+                "generation_config": generation_config,
+            },
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    async def get(self, template: str, key: str) -> Optional[str]:
+        """Look a response up in memory, then Redis
+        
+        Args:
+            template: Prompt template name (for metrics)
+            key: Content address from make_key
+        
+        Returns:
+            Cached response text or None
+        """
+        value = self.memory.get(key)
+        if value is not None:
+            metrics.increment("llm_cache_hits_total", template=template, tier="memory")
+            return value
+        
+        if self._redis is not None:
+            try:
+                value = await self._redis.get(self.KEY_PREFIX + key)
+            except Exception as e:
+                print(f"LLM cache Redis read failed: {str(e)}")
+                metrics.increment("llm_cache_errors_total", template=template, operation="get")
+                value = None
+            
+            if value is not None:
+                self.memory.set(key, value)
+                metrics.increment("llm_cache_hits_total", template=template, tier="redis")
+                return value
+        
+        metrics.increment("llm_cache_misses_total", template=template)
+        return None
+    
+    async def set(self, template: str, key: str, value: str) -> None:
+        """Store a response in every tier
+        
+        Args:
+            template: Prompt template name (for metrics)
+            key: Content address from make_key
+            value: Response text
+        """
+        self.memory.set(key, value)
+        metrics.set_gauge("llm_cache_memory_entries", len(self.memory))
+        
+        if self._redis is not None:
+            try:
+                await self._redis.set(
+                    self.KEY_PREFIX + key,
+                    value,
+                    ex=settings.LLM_CACHE_TTL_SECONDS
+                )
+            except Exception as e:
+                print(f"LLM cache Redis write failed: {str(e)}")
+                metrics.increment("llm_cache_errors_total", template=template, operation="set")
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into one execution
+    
+    The first caller for a key starts the work as a task; callers arriving
+    while it is in flight await the same task instead of repeating it. The
+    task is shielded, so a caller that is cancelled (e.g. a dropped request)
+    does not cancel the work the others are waiting on.
+    """
+    
+    def __init__(self):
+        """Initialize the in-flight call table"""
+        self._calls: Dict[str, "asyncio.Task[Any]"] = {}
+    
+    async def do(self, key: str, work: Callable[[], Awaitable[T]], label: Optional[str] = None) -> T:
+        """Run ``work`` once for all concurrent callers of ``key``
+        
+        Args:
+            key: Identity of the call (e.g. an LLM cache key)
+            work: Coroutine factory performing the call
+            label: Template name for metrics
+        
+        Returns:
+            The shared result of ``work``
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(work())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        else:
+            metrics.increment("llm_coalesced_total", template=label or "unknown")
+        
+        metrics.set_gauge("llm_inflight_requests", len(self._calls))
+        return await asyncio.shield(task)
+
+
+# Global LLM response cache instance
+response_cache = LLMResponseCache()
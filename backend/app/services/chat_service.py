@@ -1,12 +1,59 @@
 """Chat service for managing conversations and message flow"""
-from typing import List, Dict, Any, Optional, Tuple
-from sqlalchemy.orm import Session
+from typing import AsyncIterator, List, Dict, Any, Optional, Set, Tuple, Union
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, count_statements
+from app.core.metrics import metrics
+from app.core.replicas import replica_router
 from app.models import Conversation, Message, Candidate, User
 from app.models.conversation import MessageRole, ConversationStatus
+from app.prompts.templates import (
+    OFF_TOPIC_REPLY,
+    PROCESS_INFO_REPLY,
+    QA_FOLLOW_UP,
+    QUESTIONS_INTRO,
+    QUESTIONS_OUTRO,
+    QUESTIONS_PENDING_REPLY,
+    QUESTIONS_GENERATING_REPLY
+)
+from app.services.intent_classifier import Intent, intent_classifier
+from app.services.field_extraction import (
+    FieldResult,
+    extract_email,
+    extract_name,
+    extract_phone,
+    extract_years_experience
+)
 from app.services.llm_service import llm_service
+from app.services.message_pool_service import message_pool
+from app.services.pagination import DEFAULT_PAGE_SIZE, fetch_page
+from app.services.question_bank_service import QuestionBankService
+from app.services.question_job_service import format_question, format_questions, question_jobs
+from app.services.retry_policy import turn_budget
+from app.services.speculation_service import speculative_warmer
+from app.services.usage_service import LLMCallUsage, UsageService, track_usage
 from app.services.vector_db_service import vector_db_service
-from datetime import datetime
+from datetime import datetime, timezone
+import asyncio
 import json
+import uuid
+
+# Conversations whose summary is being refreshed, and the tasks doing it
+_summarizing: Set[str] = set()
+_background_tasks: Set[asyncio.Task] = set()
+
+# Question asked for each profile field, in collection order
+STEP_QUESTIONS = {
+    "name": "What's your full name?",
+    "email": "What's your email address?",
+    "phone": "What's your phone number?",
+    "experience": "How many years of experience do you have in tech?",
+    "position": "What position(s) are you interested in?",
+    "location": "Where are you currently located?",
+    "tech_stack": "Please list your tech stack: programming languages, frameworks, databases and tools.",
+}
 
 
 class ChatService:
@@ -26,15 +73,17 @@ class ChatService:
         "COMPLETED": 10
     }
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         """Initialize chat service
         
         Args:
-            db: Database session
+            db: Async database session
         """
         self.db = db
+        self.message_id: Optional[str] = None  # Last message stored by this service
+        self._uncounted_messages = 0  # Messages added but not yet in conversation.message_count
     
-    def start_conversation(self, user_id: str) -> Tuple[Conversation, str]:
+    async def start_conversation(self, user_id: str) -> Tuple[Conversation, str]:
         """Start a new conversation
         
         Args:
@@ -43,25 +92,29 @@ class ChatService:
         Returns:
             Tuple of (conversation object, greeting message)
         """
-        # Create new conversation
-        conversation = Conversation(
-            user_id=user_id,
-            title="Candidate Screening",
-            status=ConversationStatus.ACTIVE
-        )
-        self.db.add(conversation)
-        self.db.commit()
-        self.db.refresh(conversation)
-        
-        # Generate greeting
-        greeting = llm_service.generate_greeting()
-        
-        # Store greeting message
-        self._add_message(conversation.id, MessageRole.ASSISTANT, greeting)
+        with turn_budget(kind="start"), count_statements("start"):
+            # Create new conversation
+            conversation = Conversation(
+                id=str(uuid.uuid4()),
+                user_id=user_id,
+                title="Candidate Screening",
+                status=ConversationStatus.ACTIVE,
+                started_at=datetime.now(timezone.utc),
+                message_count=1
+            )
+            self.db.add(conversation)
+            
+            # Serve a pre-generated greeting
+            greeting = await message_pool.get("greeting")
+            
+            # Store greeting message
+            self._add_message(conversation.id, MessageRole.ASSISTANT, greeting, counted=True)
+            await self.db.commit()
+            await replica_router.mark_write(user_id)
         
         return conversation, greeting
     
-    def process_message(
+    async def process_message(
         self,
         conversation_id: str,
         user_message: str,
@@ -69,6 +122,10 @@ class ChatService:
     ) -> str:
         """Process user message and generate response
         
+        The turn is one unit of work: the conversation and candidate are
+        loaded together, every change is committed once at the end, and
+        the ID of the stored response is left in ``message_id``.
+        
         Args:
             conversation_id: Conversation ID
             user_message: User's message
@@ -77,71 +134,327 @@ class ChatService:
         Returns:
             Assistant's response
         """
-        # Get conversation
-        conversation = self.db.query(Conversation).filter(
-            Conversation.id == conversation_id,
-            Conversation.user_id == user_id
-        ).first()
+        with turn_budget(kind="message"), track_usage() as usage, count_statements("message"):
+            # Get conversation and candidate data
+            conversation, candidate = await self._load_turn(conversation_id, user_id)
+            
+            if not conversation:
+                return "Conversation not found. Please start a new conversation."
+            
+            # Classify the message locally before deciding whether the LLM is needed
+            step = self._current_step(candidate)
+            intent = intent_classifier.classify(user_message, step).intent
+            if intent == Intent.END:
+                self._add_message(conversation_id, MessageRole.USER, user_message)
+                return await self._end_conversation(conversation)
+            
+            # Get conversation history (before this turn, so it matches the stored message_count)
+            history = await self._get_conversation_history(conversation_id, user_id)
+            
+            # Store user message
+            self._add_message(conversation_id, MessageRole.USER, user_message)
+            
+            # Determine current state and update candidate data
+            response = self._local_reply(intent, step, candidate)
+            job = None
+            if response is None and step == "tech_stack" and settings.QUESTION_JOBS_ENABLED:
+                # Generate the questions off the request path
+                job = question_jobs.create(self.db, candidate, conversation_id, user_message)
+                response = QUESTIONS_PENDING_REPLY
+            elif response is None:
+                response = await self._process_conversation_flow(
+                    candidate,
+                    user_message,
+                    self._unsummarized_history(conversation, history),
+                    conversation.summary
+                )
+            
+            await self._finish_turn(conversation, user_message, response, candidate, history, usage)
+            self._schedule_summary_refresh(conversation)
+            
+            # Start the job once the acknowledgement is stored, so the questions follow it
+            if job is not None:
+                question_jobs.submit(job.id)
+            
+            return response
+    
+    async def process_message_stream(
+        self,
+        conversation_id: str,
+        user_message: str,
+        user_id: str
+    ) -> AsyncIterator[Union[str, Dict[str, Any]]]:
+        """Process user message, yielding the response as it is generated
         
-        if not conversation:
-            return "Conversation not found. Please start a new conversation."
+        Collection steps are yielded in one piece; free-form turns stream
+        from Gemini token by token. On the tech stack step each technical
+        question is yielded as soon as it has been generated, both as a
+        question dictionary and as its line of response text. The assistant
+        message is stored once the stream has completed, and its ID is left
+        in ``message_id``.
         
-        # Store user message
-        self._add_message(conversation_id, MessageRole.USER, user_message)
+        Args:
+            conversation_id: Conversation ID
+            user_message: User's message
+            user_id: User ID
+            
+        Yields:
+            Chunks of the assistant's response (str) and generated
+            technical questions (dict with index, technology, question
+            and difficulty)
+        """
+        with turn_budget(kind="stream"), track_usage() as usage, count_statements("stream"):
+            conversation, candidate = await self._load_turn(conversation_id, user_id)
+            
+            if not conversation:
+                yield "Conversation not found. Please start a new conversation."
+                return
+            
+            step = self._current_step(candidate)
+            intent = intent_classifier.classify(user_message, step).intent
+            if intent == Intent.END:
+                self._add_message(conversation_id, MessageRole.USER, user_message)
+                yield await self._end_conversation(conversation)
+                return
+            
+            history = await self._get_conversation_history(conversation_id, user_id)
+            self._add_message(conversation_id, MessageRole.USER, user_message)
+            local_reply = self._local_reply(intent, step, candidate)
+            
+            if local_reply is not None:
+                response = local_reply
+                yield response
+            elif step is None:
+                chunks = []
+                async for chunk in llm_service.stream_response(
+                    user_message,
+                    self._unsummarized_history(conversation, history),
+                    self._candidate_to_dict(candidate),
+                    conversation.summary
+                ):
+                    chunks.append(chunk)
+                    yield chunk
+                response = "".join(chunks)
+            elif step == "tech_stack":
+                # Questions are committed as they arrive; count the user message with the first of them
+                await self._count_messages(conversation)
+                chunks = []
+                async for chunk in self._stream_tech_stack_questions(candidate, user_message):
+                    if isinstance(chunk, str):
+                        chunks.append(chunk)
+                    yield chunk
+                response = "".join(chunks)
+            else:
+                response = await self._process_conversation_flow(
+                    candidate,
+                    user_message,
+                    self._unsummarized_history(conversation, history),
+                    conversation.summary
+                )
+                yield response
+            
+            await self._finish_turn(conversation, user_message, response, candidate, history, usage)
+            self._schedule_summary_refresh(conversation)
+    
+    async def _load_turn(
+        self,
+        conversation_id: str,
+        user_id: str
+    ) -> Tuple[Optional[Conversation], Optional[Candidate]]:
+        """Load a conversation and its user's candidate profile in one query
         
-        # Check if user wants to end conversation
-        if llm_service.detect_conversation_end(user_message):
-            return self._end_conversation(conversation)
+        A missing candidate profile is created empty and stored with the
+        turn's commit.
         
-        # Get candidate data
-        candidate = self.db.query(Candidate).filter(
-            Candidate.user_id == user_id
-        ).first()
+        Args:
+            conversation_id: Conversation ID
+            user_id: User ID for authorization
+            
+        Returns:
+            Tuple of (conversation, candidate), or (None, None) if the
+            conversation does not exist or belongs to another user
+        """
+        result = await self.db.execute(
+            select(Conversation, Candidate)
+            .outerjoin(Candidate, Candidate.user_id == Conversation.user_id)
+            .where(
+                Conversation.id == conversation_id,
+                Conversation.user_id == user_id
+            )
+        )
+        row = result.first()
+        if row is None:
+            return None, None
         
-        if not candidate:
-            candidate = Candidate(user_id=user_id)
+        conversation, candidate = row
+        if candidate is None:
+            candidate = Candidate(id=str(uuid.uuid4()), user_id=user_id)
             self.db.add(candidate)
-            self.db.commit()
-            self.db.refresh(candidate)
+        return conversation, candidate
+    
+    async def _finish_turn(
+        self,
+        conversation: Conversation,
+        user_message: str,
+        response: str,
+        candidate: Candidate,
+        history: List[Dict[str, str]],
+        usage: Optional[List[LLMCallUsage]] = None
+    ) -> None:
+        """Store the assistant response, its LLM usage and the turn's context
         
-        # Get conversation history
-        history = self._get_conversation_history(conversation_id)
+        Commits the turn.
         
-        # Determine current state and update candidate data
-        response = self._process_conversation_flow(
-            candidate,
-            user_message,
-            history
+        Args:
+            conversation: Conversation object
+            user_message: User's message
+            response: Assistant's response
+            candidate: Candidate object
+            history: Conversation history before this turn
+            usage: LLM calls made to produce the response
+        """
+        # Store assistant response with the tokens spent on it
+        message = self._add_message(
+            conversation.id,
+            MessageRole.ASSISTANT,
+            response,
+            tokens_used=sum(call.total_tokens for call in usage) if usage else None
         )
+        if usage:
+            UsageService(self.db).add(usage, conversation.id, candidate.user_id, message.id)
+        await self._count_messages(conversation)
+        await self.db.commit()
+        await replica_router.mark_write(conversation.user_id)
         
-        # Store assistant response
-        self._add_message(conversation_id, MessageRole.ASSISTANT, response)
-        
-        # Store context in vector DB
+        # Store context in vector DB (embedding runs off the event loop)
         candidate_data = self._candidate_to_dict(candidate)
-        vector_db_service.store_conversation_context(
-            conversation_id,
+        await asyncio.to_thread(
+            vector_db_service.store_conversation_context,
+            conversation.id,
             history + [
                 {"role": "user", "content": user_message},
                 {"role": "assistant", "content": response}
             ],
             candidate_data
         )
+    
+    def _current_step(self, candidate: Candidate) -> Optional[str]:
+        """Profile field currently being collected
+        
+        Args:
+            candidate: Candidate object
+            
+        Returns:
+            Key of ``STEP_QUESTIONS``, or None once the conversation has
+            moved on to free-form Q&A
+        """
+        if not candidate.full_name:
+            return "name"
+        if not candidate.email:
+            return "email"
+        if not candidate.phone:
+            return "phone"
+        if candidate.years_experience is None:
+            return "experience"
+        if not candidate.desired_positions:
+            return "position"
+        if not candidate.current_location:
+            return "location"
+        if not candidate.tech_stack_raw:
+            return "tech_stack"
+        return None
+    
+    def _local_reply(self, intent: Intent, step: Optional[str], candidate: Candidate) -> Optional[str]:
+        """Reply that needs no LLM call for the message's intent, if any
+        
+        Off-topic messages get a redirect and questions about the process
+        asked mid-collection get a short explanation, both followed by the
+        pending question. While the technical questions are still being
+        generated, every message is told to wait for them. Answers, and
+        questions during Q&A, return None and go through the normal flow.
+        
+        Args:
+            intent: Classified intent of the message
+            step: Profile field being collected, or None during Q&A
+            candidate: Candidate object
+            
+        Returns:
+            Local reply, or None
+        """
+        if step is None and candidate.screening_status == "generating_questions":
+            return QUESTIONS_GENERATING_REPLY
+        
+        follow_up = STEP_QUESTIONS[step] if step else QA_FOLLOW_UP
+        if intent == Intent.OFF_TOPIC:
+            return f"{OFF_TOPIC_REPLY} {follow_up}"
+        if intent == Intent.INFO and step is not None:
+            return f"{PROCESS_INFO_REPLY}\n\n{follow_up}"
+        return None
+    
+    async def _stream_tech_stack_questions(
+        self,
+        candidate: Candidate,
+        user_message: str
+    ) -> AsyncIterator[Union[str, Dict[str, Any]]]:
+        """Handle the tech stack step, yielding each question as it is generated
         
-        return response
+        Every question is stored on the candidate before it is yielded, so a
+        stream the client abandons halfway keeps the questions already sent.
+        The fused parse + questions call returns all questions at once, so
+        this path always parses the stack first and streams the questions.
+        
+        Args:
+            candidate: Candidate object
+            user_message: User's tech stack description
+            
+        Yields:
+            Response text chunks and question dictionaries
+        """
+        exclude = [q["question"] for q in candidate.technical_questions or []]
+        candidate.tech_stack_raw = user_message
+        candidate.tech_stack = await llm_service.parse_tech_stack(user_message)
+        candidate.technical_questions = []
+        speculative_warmer.resolve(candidate.id, candidate.tech_stack)
+        await self.db.commit()
+        
+        yield QUESTIONS_INTRO
+        
+        index = 0
+        async for question in llm_service.stream_technical_questions(
+            candidate.tech_stack,
+            candidate.years_experience or 1,
+            candidate.desired_positions[0] if candidate.desired_positions else "Developer",
+            num_questions=5,
+            question_bank=QuestionBankService(self.db),
+            exclude=exclude
+        ):
+            index += 1
+            # Reassign so the JSON column is flagged as modified
+            candidate.technical_questions = candidate.technical_questions + [question]
+            await self.db.commit()
+            
+            yield {"index": index, **question}
+            yield format_question(index, question)
+        
+        candidate.screening_status = "questions_generated"
+        await self.db.commit()
+        
+        yield QUESTIONS_OUTRO
     
-    def _process_conversation_flow(
+    async def _process_conversation_flow(
         self,
         candidate: Candidate,
         user_message: str,
-        history: List[Dict[str, str]]
+        history: List[Dict[str, str]],
+        summary: Optional[str] = None
     ) -> str:
         """Process conversation flow based on current state
         
         Args:
             candidate: Candidate object
             user_message: Current user message
-            history: Conversation history
+            history: Recent conversation history not yet summarized
+            summary: Rolling summary of older messages
             
         Returns:
             Assistant response
@@ -157,38 +470,42 @@ class ChatService:
         
         # Update candidate based on conversation context
         if needs_name:
-            candidate.full_name = user_message.strip()
-            self.db.commit()
+            result = await self._extract_name(user_message)
+            if not result.is_valid:
+                return result.message
+            candidate.full_name = result.value
             return f"Nice to meet you, {candidate.full_name}! 👋\n\nWhat's your email address?"
         
         elif needs_email:
-            candidate.email = user_message.strip()
-            self.db.commit()
+            result = extract_email(user_message)
+            if not result.is_valid:
+                return result.message
+            candidate.email = result.value
             return f"Great! What's your phone number?"
         
         elif needs_phone:
-            candidate.phone = user_message.strip()
-            self.db.commit()
+            result = extract_phone(user_message, settings.PHONE_DEFAULT_REGION)
+            if not result.is_valid:
+                return result.message
+            candidate.phone = result.value
             return f"Perfect! How many years of experience do you have in tech?"
         
         elif needs_experience:
-            try:
-                years = int(''.join(filter(str.isdigit, user_message)))
-                candidate.years_experience = years
-                self.db.commit()
-                return f"{years} years - excellent! What position(s) are you interested in?"
-            except:
-                return "Please provide your years of experience as a number (e.g., 3, 5, 10)"
+            result = extract_years_experience(user_message)
+            if not result.is_valid:
+                return result.message
+            candidate.years_experience = result.value
+            return f"{result.value} years - excellent! What position(s) are you interested in?"
         
         elif needs_position:
             positions = [p.strip() for p in user_message.split(',')]
             candidate.desired_positions = positions
-            self.db.commit()
+            # Position and experience are known: warm the question bank for the likely stack
+            speculative_warmer.schedule(candidate)
             return f"Great choice! Where are you currently located?"
         
         elif needs_location:
             candidate.current_location = user_message.strip()
-            self.db.commit()
             return ("Excellent! Now, please tell me about your technical skills.\n\n"
                    "List your tech stack including:\n"
                    "- Programming languages\n"
@@ -197,43 +514,55 @@ class ChatService:
                    "- Tools & technologies")
         
         elif needs_tech_stack:
-            # Parse tech stack
+            # Parse tech stack and generate technical questions
             candidate.tech_stack_raw = user_message
-            tech_stack = llm_service.parse_tech_stack(user_message)
-            candidate.tech_stack = tech_stack
-            
-            # Generate technical questions
-            questions = llm_service.generate_technical_questions(
-                tech_stack,
+            tech_stack, questions = await llm_service.parse_tech_stack_and_questions(
+                user_message,
                 candidate.years_experience or 1,
                 candidate.desired_positions[0] if candidate.desired_positions else "Developer",
-                num_questions=5
+                num_questions=5,
+                question_bank=QuestionBankService(self.db),
+                exclude=[q["question"] for q in candidate.technical_questions or []]
             )
+            candidate.tech_stack = tech_stack
             candidate.technical_questions = questions
+            speculative_warmer.resolve(candidate.id, tech_stack)
             candidate.screening_status = "questions_generated"
-            self.db.commit()
-            
-            # Format questions response
-            response = ("Perfect! I've analyzed your tech stack. ✅\n\n"
-                       "Based on your skills, here are some technical questions:\n\n")
-            
-            for i, q in enumerate(questions, 1):
-                response += f"{i}. **{q['technology']}**: {q['question']}\n\n"
             
-            response += "\nFeel free to answer these questions, or let me know if you have any concerns!"
-            return response
+            return format_questions(questions)
         
         else:
             # All info collected, handle Q&A or generate response
             candidate_data = self._candidate_to_dict(candidate)
-            response = llm_service.generate_response(
+            response = await llm_service.generate_response(
                 user_message,
                 history,
-                candidate_data
+                candidate_data,
+                summary
             )
             return response
     
-    def _end_conversation(self, conversation: Conversation) -> str:
+    async def _extract_name(self, user_message: str) -> FieldResult:
+        """Extract the candidate's name, asking the LLM only about unusual input
+        
+        Args:
+            user_message: User's message
+            
+        Returns:
+            Extraction result
+        """
+        result = extract_name(user_message)
+        if result.is_valid or not settings.FIELD_VALIDATION_LLM_FALLBACK:
+            return result
+        
+        metrics.increment("field_validation_llm_fallback_total", field="name")
+        validation = await llm_service.validate_field("full name", user_message.strip())
+        corrected = str(validation.get("corrected_value") or user_message).strip()
+        if validation.get("is_valid") and corrected:
+            return FieldResult(True, corrected)
+        return result
+    
+    async def _end_conversation(self, conversation: Conversation) -> str:
         """End the conversation
         
         Args:
@@ -244,61 +573,201 @@ class ChatService:
         """
         conversation.status = ConversationStatus.COMPLETED
         conversation.ended_at = datetime.utcnow()
-        self.db.commit()
+        await self._count_messages(conversation)
+        await self.db.commit()
+        await replica_router.mark_write(conversation.user_id)
         
-        return llm_service.generate_closing_message()
+        return await message_pool.get("closing")
     
     def _add_message(
         self,
         conversation_id: str,
         role: MessageRole,
-        content: str
+        content: str,
+        tokens_used: Optional[int] = None,
+        counted: bool = False
     ) -> Message:
-        """Add a message to the conversation
+        """Add a message to the conversation (stored with the turn's commit)
+        
+        The ID and timestamp are assigned here rather than by the database,
+        so the message needs no refresh and messages stored in the same
+        transaction keep their order.
         
         Args:
             conversation_id: Conversation ID
             role: Message role
             content: Message content
+            tokens_used: LLM tokens spent producing the message
+            counted: Whether the conversation's message_count already
+                includes the message
             
         Returns:
             Created message object
         """
         message = Message(
+            id=str(uuid.uuid4()),
             conversation_id=conversation_id,
             role=role,
-            content=content
+            content=content,
+            tokens_used=tokens_used,
+            created_at=datetime.now(timezone.utc)
         )
         self.db.add(message)
+        self.message_id = message.id
+        if not counted:
+            self._uncounted_messages += 1
+        return message
+    
+    async def _count_messages(self, conversation: Conversation) -> None:
+        """Add the messages added so far to the conversation's message_count
         
-        # Update conversation message count
-        conversation = self.db.query(Conversation).filter(
-            Conversation.id == conversation_id
-        ).first()
-        if conversation:
-            conversation.message_count += 1
+        Uses a single atomic UPDATE, so concurrent turns never lose an
+        increment, and reads the new count back from it.
         
-        self.db.commit()
-        self.db.refresh(message)
-        return message
+        Args:
+            conversation: Conversation object
+        """
+        if not self._uncounted_messages:
+            return
+        result = await self.db.execute(
+            update(Conversation)
+            .where(Conversation.id == conversation.id)
+            .values(message_count=func.coalesce(Conversation.message_count, 0) + self._uncounted_messages)
+            .returning(Conversation.message_count)
+            .execution_options(synchronize_session=False)
+        )
+        set_committed_value(conversation, "message_count", result.scalar_one())
+        self._uncounted_messages = 0
     
-    def _get_conversation_history(
+    def _unsummarized_history(
+        self,
+        conversation: Conversation,
+        history: List[Dict[str, str]]
+    ) -> List[Dict[str, str]]:
+        """Drop the messages already folded into the conversation summary
+        
+        Args:
+            conversation: Conversation object
+            history: Most recent messages (chronological), read before this
+                turn's messages were added
+            
+        Returns:
+            The trailing messages newer than the summary
+        """
+        # message_count excludes this turn's messages until _count_messages, and so does history
+        unsummarized = (conversation.message_count or 0) - (conversation.summary_message_count or 0)
+        if unsummarized <= 0:
+            return []
+        return history[-unsummarized:]
+    
+    def _schedule_summary_refresh(self, conversation: Conversation) -> None:
+        """Fold older messages into the summary in the background once enough have piled up
+        
+        Args:
+            conversation: Conversation object
+        """
+        stored = (conversation.message_count or 0) + self._uncounted_messages
+        unsummarized = stored - (conversation.summary_message_count or 0)
+        if unsummarized - settings.LLM_CONTEXT_RECENT_MESSAGES < settings.LLM_CONTEXT_SUMMARY_BATCH:
+            return
+        if conversation.id in _summarizing:
+            return
+        
+        _summarizing.add(conversation.id)
+        task = asyncio.create_task(self._refresh_summary(conversation.id))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+    
+    @staticmethod
+    async def _refresh_summary(conversation_id: str) -> None:
+        """Fold messages beyond the verbatim window into the rolling summary
+        
+        Runs in its own sessions, since the request's session may be closed
+        by the time it does. Messages are read in one short session and the
+        summary is written in another, so no connection is held while the
+        LLM summarizes.
+        
+        Args:
+            conversation_id: Conversation ID
+        """
+        try:
+            while True:
+                async with AsyncSessionLocal() as db:
+                    conversation = await db.get(Conversation, conversation_id)
+                    if not conversation:
+                        break
+                    folded = conversation.summary_message_count or 0
+                    foldable = (conversation.message_count or 0) - folded - settings.LLM_CONTEXT_RECENT_MESSAGES
+                    if foldable < settings.LLM_CONTEXT_SUMMARY_BATCH:
+                        break
+                    
+                    result = await db.execute(
+                        select(Message)
+                        .where(Message.conversation_id == conversation_id)
+                        .order_by(Message.created_at, Message.id)
+                        .offset(folded)
+                        .limit(settings.LLM_CONTEXT_SUMMARY_BATCH)
+                    )
+                    messages = [
+                        {"role": msg.role.value, "content": msg.content}
+                        for msg in result.scalars().all()
+                    ]
+                
+                summary = await llm_service.summarize_conversation(conversation.summary, messages)
+                if not summary:
+                    break
+                
+                async with AsyncSessionLocal() as db:
+                    # Only apply the fold if nobody else moved the summary on meanwhile
+                    result = await db.execute(
+                        update(Conversation)
+                        .where(
+                            Conversation.id == conversation_id,
+                            func.coalesce(Conversation.summary_message_count, 0) == folded
+                        )
+                        .values(summary=summary, summary_message_count=folded + len(messages))
+                        .execution_options(synchronize_session=False)
+                    )
+                    await db.commit()
+                if result.rowcount != 1:
+                    break
+                metrics.increment("conversation_summary_folds_total")
+        except Exception as e:
+            print(f"Conversation summary error: {str(e)}")
+        finally:
+            _summarizing.discard(conversation_id)
+    
+    async def _get_conversation_history(
         self,
         conversation_id: str,
+        user_id: str,
         limit: int = 20
     ) -> List[Dict[str, str]]:
         """Get conversation history
         
+        Read from a replica unless the user wrote recently; earlier turns
+        are committed, so a replica past the sticky window has them all.
+        
         Args:
             conversation_id: Conversation ID
+            user_id: User ID, for read-your-writes routing
             limit: Maximum number of messages
             
         Returns:
             List of messages as dictionaries
         """
-        messages = self.db.query(Message).filter(
-            Message.conversation_id == conversation_id
-        ).order_by(Message.created_at.desc()).limit(limit).all()
+        query = (
+            select(Message)
+            .where(Message.conversation_id == conversation_id)
+            .order_by(Message.created_at.desc())
+            .limit(limit)
+        )
+        replica = await replica_router.choose(user_id)
+        if replica is None:
+            messages = list((await self.db.execute(query)).scalars().all())
+        else:
+            async with replica.sessions() as db:
+                messages = list((await db.execute(query)).scalars().all())
         
         messages.reverse()  # Chronological order
         
@@ -307,7 +776,7 @@ class ChatService:
             for msg in messages
         ]
     
-    def get_conversation(self, conversation_id: str, user_id: str) -> Optional[Conversation]:
+    async def get_conversation(self, conversation_id: str, user_id: str) -> Optional[Conversation]:
         """Get conversation by ID
         
         Args:
@@ -317,23 +786,45 @@ class ChatService:
         Returns:
             Conversation object or None
         """
-        return self.db.query(Conversation).filter(
-            Conversation.id == conversation_id,
-            Conversation.user_id == user_id
-        ).first()
+        result = await self.db.execute(
+            select(Conversation).where(
+                Conversation.id == conversation_id,
+                Conversation.user_id == user_id
+            )
+        )
+        return result.scalars().first()
     
-    def get_user_conversations(self, user_id: str) -> List[Conversation]:
-        """Get all conversations for a user
+    async def get_user_conversations(
+        self,
+        user_id: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        before: Optional[str] = None,
+        after: Optional[str] = None
+    ) -> Tuple[List[Conversation], Optional[str]]:
+        """Get one page of a user's conversations, newest first
         
         Args:
             user_id: User ID
+            limit: Page size
+            before: Cursor of the conversation the page ends before (older ones)
+            after: Cursor of the conversation the page starts after (newer ones)
             
         Returns:
-            List of conversations
+            Tuple of (conversations, next_cursor)
+        
+        Raises:
+            ValueError: If a cursor is malformed or both are given
         """
-        return self.db.query(Conversation).filter(
-            Conversation.user_id == user_id
-        ).order_by(Conversation.started_at.desc()).all()
+        return await fetch_page(
+            self.db,
+            select(Conversation).where(Conversation.user_id == user_id),
+            Conversation.started_at,
+            Conversation.id,
+            limit,
+            before=before,
+            after=after,
+            newest_first=True
+        )
     
     def _candidate_to_dict(self, candidate: Candidate) -> Dict[str, Any]:
         """Convert candidate to dictionary
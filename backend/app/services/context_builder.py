@@ -0,0 +1,138 @@
+"""Token-budgeted prompt context for free-form chat responses"""
+from typing import Any, Dict, List, Optional
+import json
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.rate_governor import estimate_tokens
+
+# Candidate fields the assistant needs once screening has moved on to Q&A
+RESPONSE_FIELDS = ("full_name", "years_experience", "desired_positions", "tech_stack", "technical_questions")
+
+
+def compact_candidate(candidate_data: Optional[Dict[str, Any]], include_questions: bool = True) -> str:
+    """Serialize the turn-relevant candidate fields as compact JSON
+    
+    Empty fields and tech stack categories are dropped and technical
+    questions are reduced to "Technology: question" lines.
+    
+    Args:
+        candidate_data: Candidate data dictionary
+        include_questions: Whether to include the technical questions
+    
+    Returns:
+        Compact JSON string (empty if nothing is relevant)
+    """
+    compact: Dict[str, Any] = {}
+    for field in RESPONSE_FIELDS:
+        value = (candidate_data or {}).get(field)
+        if field == "tech_stack" and value:
+            value = {category: items for category, items in value.items() if items}
+        elif field == "technical_questions":
+            if not include_questions:
+                continue
+            value = [
+                f"{item.get('technology')}: {item.get('question')}"
+                for item in value or []
+                if isinstance(item, dict) and item.get("question")
+            ]
+        if value:
+            compact[field] = value
+    
+    if not compact:
+        return ""
+    return json.dumps(compact, separators=(",", ":"), ensure_ascii=False)
+
+
+class ContextBuilder:
+    """Builds the response prompt within ``LLM_CONTEXT_TOKEN_BUDGET``
+    
+    The prompt holds, in order of priority: the user's message, the
+    turn-relevant candidate data, the rolling conversation summary and as
+    many of the most recent turns as still fit, newest first. Turns older
+    than that are expected to be covered by the summary.
+    """
+    
+    def __init__(self, token_budget: Optional[int] = None):
+        """Initialize context builder
+        
+        Args:
+            token_budget: Prompt token cap, excluding the system instruction
+                (defaults to settings.LLM_CONTEXT_TOKEN_BUDGET)
+        """
+        self.token_budget = token_budget or settings.LLM_CONTEXT_TOKEN_BUDGET
+    
+    def build_response_prompt(
+        self,
+        user_message: str,
+        history: List[Dict[str, str]],
+        candidate_data: Optional[Dict[str, Any]] = None,
+        summary: Optional[str] = None
+    ) -> str:
+        """Build the free-form response prompt
+        
+        Args:
+            user_message: User's message
+            history: Recent messages not yet folded into the summary (chronological)
+            candidate_data: Candidate data dictionary
+            summary: Rolling summary of older turns
+        
+        Returns:
+            Rendered prompt
+        """
+        # The current message is stored before the turn runs; don't repeat it
+        if history and history[-1]["role"] == "user" and history[-1]["content"] == user_message:
+            history = history[:-1]
+        
+        candidate_json = compact_candidate(candidate_data)
+        fixed = self._render(user_message, [], candidate_json, summary)
+        if estimate_tokens(fixed) > self.token_budget:
+            candidate_json = compact_candidate(candidate_data, include_questions=False)
+            fixed = self._render(user_message, [], candidate_json, summary)
+        
+        remaining = self.token_budget - estimate_tokens(fixed)
+        turns: List[str] = []
+        for msg in reversed(history):
+            role = "User" if msg["role"] == "user" else "Assistant"
+            line = f"{role}: {msg['content']}"
+            cost = estimate_tokens(line)
+            if cost > remaining:
+                break
+            turns.insert(0, line)
+            remaining -= cost
+        
+        dropped = len(history) - len(turns)
+        prompt = self._render(user_message, turns, candidate_json, summary)
+        prompt_tokens = estimate_tokens(prompt)
+        metrics.observe("llm_prompt_tokens_estimated", prompt_tokens, template="response")
+        if dropped:
+            metrics.increment("llm_context_turns_dropped_total", dropped)
+            print(f"Response prompt capped at {self.token_budget} tokens: dropped {dropped} older turns")
+        if prompt_tokens > self.token_budget:
+            print(f"Response prompt is {prompt_tokens} tokens, over the {self.token_budget} token cap")
+        return prompt
+    
+    @staticmethod
+    def _render(
+        user_message: str,
+        turns: List[str],
+        candidate_json: str,
+        summary: Optional[str]
+    ) -> str:
+        """Render the prompt sections"""
+        sections = []
+        if summary:
+            sections.append(f"Conversation Summary:\n{summary}")
+        if turns:
+            sections.append("Recent Conversation:\n" + "\n".join(turns))
+        if candidate_json:
+            sections.append(f"Candidate Info:\n{candidate_json}")
+        sections.append(f"User: {user_message}")
+        sections.append(
+            "Please respond as the TalentScout assistant. Remember to ask only ONE "
+            "question at a time and be professional yet friendly."
+        )
+        return "\n\n".join(sections)
+
+
+# Global context builder instance
+context_builder = ContextBuilder()
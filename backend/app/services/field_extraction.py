@@ -0,0 +1,216 @@
+"""Local extraction and validation of screening fields
+
+Shared by the FastAPI backend and the standalone Streamlit app, so it only
+depends on the standard library, ``email-validator`` and ``phonenumbers`` and
+must not import anything else from ``app``. Nothing here makes network calls.
+"""
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+import re
+from email_validator import EmailNotValidError, validate_email as check_email
+import phonenumbers
+
+# Email-shaped substrings; email-validator decides whether they are valid
+EMAIL_PATTERN = re.compile(r"[^\s<>()\[\],;:\"']+@[^\s<>()\[\],;:\"']+\.[^\s<>()\[\],;:\"']+")
+
+# "3 to 5 years", "3-5 yrs", "between 3 and 5"
+YEARS_RANGE_PATTERN = re.compile(
+    r"(\d+(?:\.\d+)?)\s*(?:-|–|to|and)\s*(\d+(?:\.\d+)?)\s*\+?\s*(years?|yrs?|y|months?|mos?)?\b"
+)
+
+# "5 years", "5+ yrs", "18 months"
+YEARS_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*\+?\s*(years?|yrs?|y|months?|mos?)\b")
+
+# A bare number ("5", "about 2.5") when no unit was given
+NUMBER_PATTERN = re.compile(r"\d+(?:\.\d+)?")
+
+# Answers meaning no professional experience yet
+NO_EXPERIENCE_PATTERN = re.compile(
+    r"\b(?:none|no experience|fresher|fresh graduate|new grad|entry[- ]level|less than (?:a|one) year|"
+    r"under (?:a|one) year|just started|student)\b"
+)
+
+WORD_NUMBERS = {
+    "zero": 0, "one": 1, "a": 1, "an": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+    "thirteen": 13, "fourteen": 14, "fifteen": 15, "sixteen": 16, "seventeen": 17,
+    "eighteen": 18, "nineteen": 19, "twenty": 20, "thirty": 30, "forty": 40,
+}
+WORD_YEARS_PATTERN = re.compile(
+    r"\b(" + "|".join(WORD_NUMBERS) + r")\s+(years?|yrs?|months?|mos?)\b"
+)
+
+# Longest career we accept as a plausible answer
+MAX_YEARS_EXPERIENCE = 60
+
+# Lead-ins people put before their name ("Hi, my name is ...")
+NAME_PREFIX_PATTERN = re.compile(
+    r"^(?:(?:hi|hello|hey)\b[\s,!.]*)?(?:my name is|my name's|i am|i'm|im|this is|it's|name is|name:)\s*",
+    re.IGNORECASE
+)
+
+# Letters in any script, joined by spaces, apostrophes, hyphens or periods
+NAME_PATTERN = re.compile(r"^[^\W\d_]+(?:[\s'’.-]+[^\W\d_]+)*\.?$")
+
+MAX_NAME_WORDS = 6
+
+# Greetings and filler that are never a name on their own ("hi", "hello there", "ok thanks")
+NOT_NAME_WORDS = {
+    "hi", "hii", "hello", "hey", "hiya", "howdy", "yo", "greetings", "good", "morning", "afternoon",
+    "evening", "day", "there", "all", "everyone", "thanks", "thank", "you", "ok", "okay", "yes", "yeah",
+    "yep", "no", "nope", "sure", "hmm", "um", "uh", "what", "why", "the", "a", "an", "my", "name", "is",
+    "i", "am", "me", "it", "this", "skip", "none", "nothing", "anonymous", "test", "bye",
+}
+
+
+@dataclass
+class FieldResult:
+    """Outcome of extracting one field from a message"""
+    is_valid: bool
+    value: Any = None  # Normalized value when valid
+    message: str = ""  # What to ask the user when invalid
+
+
+def extract_email(text: str) -> FieldResult:
+    """Find and normalize an email address in a message
+    
+    Args:
+        text: User message
+    
+    Returns:
+        Result with the normalized address (domain lower-cased)
+    """
+    for candidate in EMAIL_PATTERN.findall(text):
+        try:
+            email = check_email(candidate.rstrip("."), check_deliverability=False)
+        except EmailNotValidError:
+            continue
+        return FieldResult(True, email.normalized)
+    return FieldResult(False, message="That doesn't look like a valid email address. Could you double-check it?")
+
+
+def extract_phone(text: str, default_region: str = "US") -> FieldResult:
+    """Find and normalize a phone number in a message
+    
+    Args:
+        text: User message
+        default_region: ISO country code assumed for numbers without a
+            ``+`` country prefix
+    
+    Returns:
+        Result with the number in E.164 format
+    """
+    for match in phonenumbers.PhoneNumberMatcher(text, default_region):
+        return FieldResult(True, phonenumbers.format_number(match.number, phonenumbers.PhoneNumberFormat.E164))
+    
+    if any(phonenumbers.PhoneNumberMatcher(text, default_region, leniency=phonenumbers.Leniency.POSSIBLE)):
+        return FieldResult(False, message=(
+            "I couldn't verify that phone number. Could you include your country code "
+            "(e.g., +1 415 555 2671)?"
+        ))
+    return FieldResult(False, message="Please provide a valid phone number, including your country code.")
+
+
+def extract_years_experience(text: str) -> FieldResult:
+    """Parse years of experience from a message
+    
+    Ranges resolve to their lower bound ("3 to 5 years" -> 3), months are
+    converted to whole years and answers such as "fresher" count as 0.
+    
+    Args:
+        text: User message
+    
+    Returns:
+        Result with whole years of experience
+    """
+    lowered = text.casefold()
+    
+    match = YEARS_RANGE_PATTERN.search(lowered)
+    if match:
+        years = _to_years(match.group(1), match.group(3))
+    else:
+        match = YEARS_PATTERN.search(lowered)
+        word_match = WORD_YEARS_PATTERN.search(lowered)
+        number_match = NUMBER_PATTERN.search(lowered)
+        if match:
+            years = _to_years(match.group(1), match.group(2))
+        elif NO_EXPERIENCE_PATTERN.search(lowered):
+            years = 0
+        elif word_match:
+            years = _to_years(str(WORD_NUMBERS[word_match.group(1)]), word_match.group(2))
+        elif number_match:
+            years = _to_years(number_match.group(), None)
+        else:
+            return FieldResult(False, message="Please provide your years of experience as a number (e.g., 3, 5, 10)")
+    
+    if years > MAX_YEARS_EXPERIENCE:
+        return FieldResult(False, message="That seems like a lot! How many years of experience do you have in tech?")
+    return FieldResult(True, years)
+
+
+def _to_years(number: str, unit: Optional[str]) -> int:
+    """Whole years from a number and an optional unit"""
+    value = float(number)
+    if unit and unit.startswith("mo"):
+        value /= 12
+    return int(value)
+
+
+def extract_name(text: str, require_full_name: bool = False) -> FieldResult:
+    """Extract a person's name from a message
+    
+    Args:
+        text: User message
+        require_full_name: Require at least a first and a last name
+    
+    Returns:
+        Result with the name, title-cased if it was typed in one case
+    """
+    name = NAME_PREFIX_PATTERN.sub("", text.strip()).strip(" \t\n,!?")
+    name = " ".join(name.split())
+    
+    words = name.split()
+    if (
+        not name
+        or not NAME_PATTERN.match(name)
+        or len(words) > MAX_NAME_WORDS
+        or all(word.strip(".").casefold() in NOT_NAME_WORDS for word in words)
+    ):
+        return FieldResult(False, message="I didn't catch your name. Could you tell me your full name?")
+    if require_full_name and len(words) < 2:
+        return FieldResult(False, message="Could you please provide your first and last name?")
+    
+    if name.islower() or name.isupper():
+        name = name.title()
+    return FieldResult(True, name)
+
+
+def extract_text(text: str) -> FieldResult:
+    """Accept any non-empty free-text answer (positions, locations)"""
+    value = " ".join(text.split())
+    if not value:
+        return FieldResult(False, message="Could you tell me a bit more?")
+    return FieldResult(True, value)
+
+
+FIELD_EXTRACTORS: Dict[str, Callable[[str], FieldResult]] = {
+    "name": extract_name,
+    "email": extract_email,
+    "phone": extract_phone,
+    "experience": extract_years_experience,
+    "position": extract_text,
+    "location": extract_text,
+}
+
+
+def extract_field(field: str, text: str) -> FieldResult:
+    """Extract a screening field by name
+    
+    Args:
+        field: One of ``FIELD_EXTRACTORS``
+        text: User message
+    
+    Returns:
+        Extraction result
+    """
+    return FIELD_EXTRACTORS[field](text)
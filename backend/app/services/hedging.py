@@ -0,0 +1,175 @@
+"""Hedged LLM requests to cut tail latency on interactive turns"""
+from collections import deque
+from contextlib import suppress
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, TypeVar
+import asyncio
+import time
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.rate_governor import Priority, current_priority
+
+T = TypeVar("T")
+
+# Successful call latencies kept per template for the hedge delay
+LATENCY_WINDOW = 256
+
+# Most unspent hedge credit that may accumulate (limits hedge bursts)
+MAX_HEDGE_CREDIT = 5.0
+
+
+class Hedger:
+    """Sends a duplicate request when the first one is slower than usual
+    
+    If a call on an enabled template has not completed by the configured
+    percentile of that template's recent latencies, an identical request is
+    sent and whichever finishes first wins; the other is cancelled. Each
+    primary call earns ``budget`` hedge credit and each hedge spends one, so
+    hedges never exceed that share of extra requests. Only interactive calls
+    are hedged, and a hedge is only sent when the caller's admission check
+    (the rate governor) lets it through without waiting.
+    """
+    
+    def __init__(
+        self,
+        enabled: bool,
+        templates: List[str],
+        percentile: float,
+        budget: float,
+        min_samples: int,
+        min_delay: float
+    ):
+        """Initialize hedger
+        
+        Args:
+            enabled: Whether hedging is on
+            templates: Prompt templates whose calls may be hedged
+            percentile: Latency percentile (0-1) after which a hedge is sent
+            budget: Maximum extra requests, as a fraction of hedgeable calls
+            min_samples: Latencies needed for a template before hedging it
+            min_delay: Shortest hedge delay in seconds
+        """
+        self.enabled = enabled
+        self.templates = set(templates)
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._credit = 0.0
+    
+    @classmethod
+    def from_settings(cls) -> "Hedger":
+        """Build the hedger configured in settings"""
+        return cls(
+            enabled=settings.LLM_HEDGE_ENABLED,
+            templates=settings.LLM_HEDGE_TEMPLATES,
+            percentile=settings.LLM_HEDGE_PERCENTILE,
+            budget=settings.LLM_HEDGE_BUDGET,
+            min_samples=settings.LLM_HEDGE_MIN_SAMPLES,
+            min_delay=settings.LLM_HEDGE_MIN_DELAY_MS / 1000
+        )
+    
+    def observe(self, template: Optional[str], seconds: float) -> None:
+        """Record the latency of a successful call"""
+        if template in self.templates:
+            self._latencies.setdefault(template, deque(maxlen=LATENCY_WINDOW)).append(seconds)
+    
+    def hedge_delay(self, template: Optional[str]) -> Optional[float]:
+        """Seconds to wait before hedging a call, or None if it is not hedged"""
+        if not self.enabled or template not in self.templates:
+            return None
+        if current_priority() != Priority.INTERACTIVE:
+            return None
+        latencies = self._latencies.get(template)
+        if not latencies or len(latencies) < self.min_samples:
+            return None
+        
+        ordered = sorted(latencies)
+        index = min(len(ordered) - 1, max(0, int(round(self.percentile * len(ordered))) - 1))
+        return max(self.min_delay, ordered[index])
+    
+    async def run(
+        self,
+        template: Optional[str],
+        call: Callable[[], Awaitable[T]],
+        timeout: float,
+        admit_hedge: Callable[[], Awaitable[bool]],
+        release: Optional[Callable[[T], Awaitable[None]]] = None
+    ) -> T:
+        """Run a call, hedging it if it is slower than the hedge delay
+        
+        Losing requests are cancelled and awaited, so their errors are
+        retrieved, and any result a loser produced anyway is passed to
+        ``release``.
+        
+        Args:
+            template: Prompt template name
+            call: Factory starting one request
+            timeout: Deadline for the call (including any hedge) in seconds
+            admit_hedge: Admission check run before a hedge is sent
+            release: Cleanup for the result of a losing request (e.g.
+                closing a stream nobody will read)
+        
+        Returns:
+            Result of the first request to succeed
+        
+        Raises:
+            asyncio.TimeoutError: If no request succeeded before the deadline
+            Exception: The last request's error if every request failed
+        """
+        started = time.monotonic()
+        delay = self.hedge_delay(template)
+        if delay is None or delay >= timeout:
+            result = await asyncio.wait_for(call(), timeout=timeout)
+            self.observe(template, time.monotonic() - started)
+            return result
+        
+        label = template or "unknown"
+        self._credit = min(MAX_HEDGE_CREDIT, self._credit + self.budget)
+        primary = asyncio.ensure_future(call())
+        start_times = {primary: started}
+        winner: Optional[asyncio.Future] = None
+        
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if not done:
+                if self._credit < 1:
+                    metrics.increment("llm_hedges_total", template=label, outcome="skipped_budget")
+                elif not await admit_hedge():
+                    metrics.increment("llm_hedges_total", template=label, outcome="skipped_quota")
+                else:
+                    self._credit -= 1
+                    hedge = asyncio.ensure_future(call())
+                    start_times[hedge] = time.monotonic()
+                    metrics.increment("llm_hedges_total", template=label, outcome="sent")
+            
+            pending = set(start_times)
+            error: Optional[BaseException] = None
+            while pending:
+                remaining = started + timeout - time.monotonic()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError("hedged call timed out")
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=remaining,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    self.observe(template, time.monotonic() - start_times[task])
+                    if len(start_times) > 1:
+                        which = "primary" if task is primary else "hedge"
+                        metrics.increment("llm_hedges_total", template=label, outcome=f"{which}_won")
+                    winner = task
+                    return task.result()
+            raise error
+        finally:
+            losers = [task for task in start_times if task is not winner]
+            for task in losers:
+                task.cancel()
+            for outcome in await asyncio.gather(*losers, return_exceptions=True):
+                if release is not None and not isinstance(outcome, BaseException):
+                    with suppress(Exception):
+                        await release(outcome)
@@ -0,0 +1,173 @@
+"""Local intent classification of incoming chat messages"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import enum
+import re
+from app.core.metrics import metrics
+from app.services.tech_stack_parser import tech_stack_parser
+
+
+class Intent(str, enum.Enum):
+    """What a user message is trying to do"""
+    END = "end"  # Wants to finish the conversation
+    OFF_TOPIC = "off_topic"  # Unrelated to the screening
+    ANSWER = "answer"  # Answers the current question
+    INFO = "info"  # Asks about the process, the role or the assistant
+
+
+# Words, keeping contractions together ("that's", "i'm")
+WORD_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+# Weighted phrases per intent, matched on whole tokens
+PHRASES: Dict[Intent, Dict[str, float]] = {
+    Intent.END: {
+        "bye": 3.0, "goodbye": 3.0, "good bye": 3.0, "bye bye": 3.0, "see you": 1.5,
+        "exit": 2.0, "quit": 2.0, "stop": 1.0, "end": 1.0, "done": 1.0, "finish": 1.0,
+        "i'm done": 2.0, "im done": 2.0, "i am done": 2.0, "we're done": 2.0,
+        "that's all": 2.5, "thats all": 2.5, "that is all": 2.5, "no thanks": 1.5,
+        "end the conversation": 4.0, "end this conversation": 4.0, "end the chat": 4.0, "end chat": 3.0,
+        "stop the interview": 4.0, "talk later": 2.0, "have to go": 2.5, "gotta go": 2.5,
+        "thanks": 0.5, "thank you": 0.5,
+    },
+    Intent.OFF_TOPIC: {
+        "weather": 2.5, "joke": 2.5, "jokes": 2.5, "movie": 2.0, "movies": 2.0, "recipe": 2.5,
+        "football": 2.0, "soccer": 2.0, "cricket": 2.0, "politics": 2.5, "election": 2.0,
+        "president": 1.5, "song": 1.5, "poem": 2.0, "horoscope": 2.5, "lottery": 2.5,
+        "favorite color": 2.5, "favourite colour": 2.5, "who won": 1.5, "girlfriend": 2.0,
+        "boyfriend": 2.0, "your age": 2.0, "meaning of life": 2.5,
+    },
+    Intent.INFO: {
+        "what is this": 2.5, "how does this work": 3.0, "how long": 2.0, "what happens next": 3.0,
+        "next steps": 2.0, "next step": 2.0, "who are you": 2.5, "are you a bot": 3.0, "are you human": 3.0,
+        "talentscout": 1.0, "salary": 2.5, "compensation": 2.5, "benefits": 2.0, "which company": 2.5,
+        "why do you need": 3.0, "why do you want": 2.5, "privacy": 2.5, "my data": 2.0,
+        "job description": 2.5, "recruiter": 1.5, "the process": 1.5, "remote": 1.0,
+    },
+}
+
+# Phrases that only end the conversation at the end of the message
+# ("I'm done" vs "I'm done with React", "stop" vs "stop words", "bye" vs "Goodbye Street 5")
+TERMINAL_PHRASES = {
+    "stop", "end", "done", "finish", "exit", "quit", "i'm done", "im done", "i am done", "we're done",
+    "bye", "goodbye", "good bye", "bye bye", "see you",
+}
+TRAILING_FILLERS = {"now", "please", "thanks", "thank", "you", "for", "today", "here", "then", "bye", "later", "soon"}
+
+# Openers that make a message a question or a request
+QUESTION_OPENERS = {
+    "what", "what's", "whats", "why", "how", "who", "when", "where", "which",
+    "can", "could", "do", "does", "is", "are", "will", "tell",
+}
+
+# Linear scoring model: bias per intent plus feature weights
+BIAS = {Intent.END: 0.0, Intent.OFF_TOPIC: 0.0, Intent.ANSWER: 1.0, Intent.INFO: 0.0}
+QUESTION_WEIGHTS = {Intent.INFO: 1.0, Intent.ANSWER: -1.0}
+TECHNOLOGY_WEIGHT = 1.5  # Added to ANSWER when known technologies are mentioned
+COLLECTING_WEIGHT = 1.0  # Added to ANSWER while a profile field is being collected
+LONG_MESSAGE_TOKENS = 12
+LONG_MESSAGE_WEIGHT = 1.0  # Added to ANSWER for long messages
+STATEMENT_OFF_TOPIC_FACTOR = 0.5  # Off-topic words count less outside questions/requests
+
+# Lowest score with which a non-answer intent overrides ANSWER
+MIN_INTENT_SCORE = 2.0
+
+
+@dataclass
+class IntentDecision:
+    """Classifier output for one message"""
+    intent: Intent
+    scores: Dict[Intent, float] = field(default_factory=dict)
+    matched: List[str] = field(default_factory=list)  # Phrases that fired
+
+
+class IntentClassifier:
+    """Keyword/phrase matcher with a small linear scoring model
+    
+    Phrases are matched on whole tokens, so "backend" or "recommend" never
+    look like "end". Each intent's score is its bias plus the weights of its
+    matched phrases (scaled by how much of the message they cover) and a few
+    message features: question form, mentioned technologies, length and
+    whether a profile field is being collected. The highest score wins; the
+    non-answer intents must also reach ``MIN_INTENT_SCORE``, and ties go to
+    ANSWER so an ambiguous message is never mistaken for a goodbye.
+    """
+    
+    def __init__(self):
+        """Index phrases by their first token"""
+        self._phrases: Dict[str, List[Tuple[Tuple[str, ...], Intent, float]]] = {}
+        for intent, phrases in PHRASES.items():
+            for phrase, weight in phrases.items():
+                tokens = tuple(phrase.split())
+                self._phrases.setdefault(tokens[0], []).append((tokens, intent, weight))
+        for candidates in self._phrases.values():
+            candidates.sort(key=lambda item: len(item[0]), reverse=True)
+    
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        """Lower-cased word tokens"""
+        return WORD_PATTERN.findall(text.casefold().replace("’", "'"))
+    
+    def _match(self, tokens: List[str]) -> List[Tuple[str, Intent, float]]:
+        """Longest phrase matches, left to right, without overlaps"""
+        matches = []
+        index = 0
+        while index < len(tokens):
+            for phrase, intent, weight in self._phrases.get(tokens[index], []):
+                end = index + len(phrase)
+                if tuple(tokens[index:end]) != phrase:
+                    continue
+                text = " ".join(phrase)
+                trailing = tokens[end:]
+                if text in TERMINAL_PHRASES and any(token not in TRAILING_FILLERS for token in trailing):
+                    continue
+                coverage = len(phrase) / len(tokens)
+                matches.append((text, intent, weight * (1 + coverage)))
+                index = end - 1
+                break
+            index += 1
+        return matches
+    
+    def classify(self, message: str, step: Optional[str] = None) -> IntentDecision:
+        """Classify a message
+        
+        Args:
+            message: User message
+            step: Profile field being collected, or None during Q&A
+        
+        Returns:
+            Decision with the winning intent and every intent's score
+        """
+        tokens = self.tokenize(message)
+        scores = dict(BIAS)
+        if not tokens:
+            return IntentDecision(Intent.ANSWER, scores)
+        
+        is_question = message.strip().endswith("?") or tokens[0] in QUESTION_OPENERS
+        matches = self._match(tokens)
+        for text, intent, weight in matches:
+            if intent == Intent.OFF_TOPIC and not is_question:
+                weight *= STATEMENT_OFF_TOPIC_FACTOR
+            scores[intent] += weight
+        
+        if is_question:
+            for intent, weight in QUESTION_WEIGHTS.items():
+                scores[intent] += weight
+        if tech_stack_parser.parse(message).skills:
+            scores[Intent.ANSWER] += TECHNOLOGY_WEIGHT
+        if step is not None:
+            scores[Intent.ANSWER] += COLLECTING_WEIGHT
+        if len(tokens) >= LONG_MESSAGE_TOKENS:
+            scores[Intent.ANSWER] += LONG_MESSAGE_WEIGHT
+        
+        intent = Intent.ANSWER
+        best = scores[Intent.ANSWER]
+        for candidate in (Intent.END, Intent.INFO, Intent.OFF_TOPIC):
+            if scores[candidate] >= MIN_INTENT_SCORE and scores[candidate] > best:
+                intent, best = candidate, scores[candidate]
+        
+        metrics.increment("intent_decisions_total", intent=intent.value, step=step or "qa")
+        return IntentDecision(intent, scores, [text for text, _, _ in matches])
+
+
+# Global intent classifier instance
+intent_classifier = IntentClassifier()
@@ -0,0 +1,420 @@
+"""LLM provider backends: Google Gemini and an offline fake for load testing"""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import google.generativeai as genai
+import asyncio
+import json
+import random
+import re
+from app.core.config import settings
+from app.prompts.templates import GREETING_FALLBACK, CLOSING_FALLBACK
+from app.services.rate_governor import estimate_tokens
+from app.services.retry_policy import LLMRateLimited, LLMUnavailable
+from app.services.tech_stack_parser import tech_stack_parser
+
+
+@dataclass
+class LLMResult:
+    """Text and token counts of a completed LLM call"""
+    text: str
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+
+
+class LLMStream(ABC):
+    """A streamed completion
+    
+    Iterating yields text chunks; ``prompt_tokens`` and ``output_tokens``
+    hold the call's token counts once the stream has been consumed.
+    """
+    
+    def __init__(self):
+        """Initialize token counts"""
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+    
+    @abstractmethod
+    def __aiter__(self) -> AsyncIterator[str]:
+        """Iterate over the text chunks of the completion"""
+    
+    async def aclose(self) -> None:
+        """Stop a completion that will not be read (e.g. a losing hedge)"""
+
+
+class LLMProvider(ABC):
+    """Backend that runs prompts for ``LLMService``
+    
+    Providers raise ``LLMRateLimited``/``LLMUnavailable`` (or their SDK's own
+    exceptions) so the retry policy can classify failures.
+    """
+    
+    name: str = ""
+    model: str = ""
+    
+    @abstractmethod
+    async def generate(
+        self,
+        prompt: str,
+        generation_config: Dict[str, Any],
+        system_instruction: Optional[str] = None,
+        template: Optional[str] = None
+    ) -> LLMResult:
+        """Run a prompt to completion
+        
+        Args:
+            prompt: Fully rendered prompt
+            generation_config: Temperature and output token limit
+            system_instruction: Optional system instruction
+            template: Prompt template name (a hint; real providers ignore it)
+        
+        Returns:
+            Completion text and token counts
+        """
+    
+    @abstractmethod
+    async def stream(
+        self,
+        prompt: str,
+        generation_config: Dict[str, Any],
+        system_instruction: Optional[str] = None,
+        template: Optional[str] = None
+    ) -> LLMStream:
+        """Start a streamed completion
+        
+        Returns once the provider has accepted the request; the stream is
+        then iterated for text chunks.
+        """
+
+
+class GeminiStream(LLMStream):
+    """Streamed Gemini response"""
+    
+    def __init__(self, response: Any):
+        """Initialize stream
+        
+        Args:
+            response: Streaming response from ``generate_content_async``
+        """
+        super().__init__()
+        self._response = response
+    
+    async def __aiter__(self) -> AsyncIterator[str]:
+        async for chunk in self._response:
+            try:
+                text = chunk.text
+            except ValueError:
+                # Chunk without text parts (e.g. safety or finish metadata)
+                continue
+            if text:
+                yield text
+        
+        # Usage metadata is complete once the stream has been consumed
+        self.prompt_tokens, self.output_tokens = GeminiProvider.token_counts(self._response)
+    
+    async def aclose(self) -> None:
+        """Cancel the streaming RPC, so an unread response stops generating"""
+        # The SDK response has no public close; its chunk iterator is the gRPC call
+        call = getattr(self._response, "_iterator", None)
+        if call is not None and hasattr(call, "cancel"):
+            call.cancel()
+
+
+class GeminiProvider(LLMProvider):
+    """Google Gemini via the google-generativeai SDK"""
+    
+    name = "gemini"
+    
+    def __init__(self):
+        """Initialize Google Gemini client"""
+        genai.configure(api_key=settings.GEMINI_API_KEY)
+        self.model = settings.GEMINI_MODEL
+        self._default_model = genai.GenerativeModel(self.model)
+        self._instructed_models: Dict[str, genai.GenerativeModel] = {}
+    
+    def _get_model(self, system_instruction: Optional[str] = None) -> genai.GenerativeModel:
+        """Get a model, reusing one instance per system instruction"""
+        if not system_instruction:
+            return self._default_model
+        
+        model = self._instructed_models.get(system_instruction)
+        if model is None:
+            model = genai.GenerativeModel(
+                self.model,
+                system_instruction=system_instruction
+            )
+            self._instructed_models[system_instruction] = model
+        return model
+    
+    @staticmethod
+    def token_counts(response: Any) -> Tuple[int, int]:
+        """Prompt and output token counts from a response's usage metadata"""
+        usage_metadata = getattr(response, "usage_metadata", None)
+        return (
+            getattr(usage_metadata, "prompt_token_count", 0) or 0,
+            getattr(usage_metadata, "candidates_token_count", 0) or 0
+        )
+    
+    async def generate(
+        self,
+        prompt: str,
+        generation_config: Dict[str, Any],
+        system_instruction: Optional[str] = None,
+        template: Optional[str] = None
+    ) -> LLMResult:
+        response = await self._get_model(system_instruction).generate_content_async(
+            prompt,
+            generation_config=generation_config
+        )
+        prompt_tokens, output_tokens = self.token_counts(response)
+        return LLMResult(response.text if response else "", prompt_tokens, output_tokens)
+    
+    async def stream(
+        self,
+        prompt: str,
+        generation_config: Dict[str, Any],
+        system_instruction: Optional[str] = None,
+        template: Optional[str] = None
+    ) -> LLMStream:
+        response = await self._get_model(system_instruction).generate_content_async(
+            prompt,
+            generation_config=generation_config,
+            stream=True
+        )
+        return GeminiStream(response)
+
+
+# Prompt markers used to recognize the template when the caller gave none
+TEMPLATE_MARKERS = (
+    ("Your previous response did not match", "structured_repair"),
+    ("Parse the following tech stack", "tech_stack_parser"),
+    ("interview questions for a candidate with the following profile", "question_generation"),
+    ("A candidate described their tech stack as", "tech_stack_questions"),
+    ("Validate if the following", "validation"),
+    ("Update the running summary", "conversation_summary"),
+    ("greeting for a candidate", "greeting"),
+    ("closing message for a candidate", "closing"),
+    ("This seems off-topic", "fallback_response"),
+)
+
+CANNED_RESPONSES = {
+    "greeting": GREETING_FALLBACK,
+    "closing": CLOSING_FALLBACK,
+    "fallback_response": (
+        "Thanks for sharing! Let's keep our focus on your screening so we can "
+        "move things along - could you answer the current question?"
+    ),
+    "response": (
+        "Thanks, that's a helpful answer. Could you walk me through a concrete "
+        "example from a recent project where you applied this?"
+    ),
+    "conversation_summary": (
+        "The candidate has shared their profile and tech stack and is working "
+        "through the technical questions. No concerns raised so far."
+    ),
+}
+
+
+class FakeStream(LLMStream):
+    """Canned completion streamed in fixed-size chunks"""
+    
+    def __init__(self, text: str, prompt_tokens: int, chunk_delay: float, chunk_chars: int):
+        """Initialize stream
+        
+        Args:
+            text: Full completion text
+            prompt_tokens: Prompt token count to report
+            chunk_delay: Seconds between chunks
+            chunk_chars: Characters per chunk
+        """
+        super().__init__()
+        self._text = text
+        self._prompt_tokens = prompt_tokens
+        self._chunk_delay = chunk_delay
+        self._chunk_chars = chunk_chars
+    
+    async def __aiter__(self) -> AsyncIterator[str]:
+        for start in range(0, len(self._text), self._chunk_chars):
+            if start:
+                await asyncio.sleep(self._chunk_delay)
+            yield self._text[start:start + self._chunk_chars]
+        self.prompt_tokens = self._prompt_tokens
+        self.output_tokens = estimate_tokens(self._text)
+
+
+class FakeProvider(LLMProvider):
+    """In-process provider returning canned, schema-valid output
+    
+    Every template in ``app/prompts/templates.py`` gets a deterministic
+    response in the shape its caller parses (JSON for the parser, question,
+    validation and structured templates). Latency is drawn from a lognormal
+    distribution around a per-template median, and a configurable share of
+    calls fails with a 429 or a transient server error, so the whole chat
+    pipeline can be load-tested offline.
+    """
+    
+    name = "fake"
+    
+    def __init__(self):
+        """Initialize fake provider from the FAKE_LLM_* settings"""
+        self.model = settings.FAKE_LLM_MODEL
+        self.latency_ms = settings.FAKE_LLM_LATENCY_MS
+        self.latency_ms_by_template = settings.FAKE_LLM_LATENCY_MS_BY_TEMPLATE
+        self.latency_sigma = settings.FAKE_LLM_LATENCY_SIGMA
+        self.first_chunk_share = settings.FAKE_LLM_FIRST_CHUNK_SHARE
+        self.chunk_chars = settings.FAKE_LLM_STREAM_CHUNK_CHARS
+        self.error_rate = settings.FAKE_LLM_ERROR_RATE
+        self.rate_limit_rate = settings.FAKE_LLM_RATE_LIMIT_RATE
+        self._random = random.Random(settings.FAKE_LLM_SEED)
+    
+    def _latency(self, template: str) -> float:
+        """Draw a call latency in seconds"""
+        median = self.latency_ms_by_template.get(template, self.latency_ms)
+        if self.latency_sigma <= 0:
+            return median / 1000
+        return median * self._random.lognormvariate(0, self.latency_sigma) / 1000
+    
+    async def _admit(self, template: str) -> float:
+        """Apply injected failures and return the call's latency in seconds"""
+        latency = self._latency(template)
+        roll = self._random.random()
+        if roll < self.rate_limit_rate:
+            # Quota rejections come back quickly
+            await asyncio.sleep(min(latency, 0.05))
+            raise LLMRateLimited(f"fake provider: quota exceeded for {self.model}")
+        if roll < self.rate_limit_rate + self.error_rate:
+            await asyncio.sleep(latency)
+            raise LLMUnavailable("fake provider: injected server error")
+        return latency
+    
+    async def generate(
+        self,
+        prompt: str,
+        generation_config: Dict[str, Any],
+        system_instruction: Optional[str] = None,
+        template: Optional[str] = None
+    ) -> LLMResult:
+        template = self._resolve_template(prompt, template)
+        await asyncio.sleep(await self._admit(template))
+        text = self.render(prompt, template)
+        return LLMResult(
+            text,
+            estimate_tokens(prompt + (system_instruction or "")),
+            estimate_tokens(text)
+        )
+    
+    async def stream(
+        self,
+        prompt: str,
+        generation_config: Dict[str, Any],
+        system_instruction: Optional[str] = None,
+        template: Optional[str] = None
+    ) -> LLMStream:
+        template = self._resolve_template(prompt, template)
+        latency = await self._admit(template)
+        await asyncio.sleep(latency * self.first_chunk_share)
+        
+        text = self.render(prompt, template)
+        chunk_count = max(1, -(-len(text) // self.chunk_chars))
+        return FakeStream(
+            text,
+            estimate_tokens(prompt + (system_instruction or "")),
+            latency * (1 - self.first_chunk_share) / chunk_count,
+            self.chunk_chars
+        )
+    
+    @staticmethod
+    def _resolve_template(prompt: str, template: Optional[str]) -> str:
+        """The caller's template name, or one recognized from the prompt"""
+        if template:
+            # Pool variants and repairs render like their base template
+            return re.sub(r"_(pool|repair)$", "", template)
+        for marker, name in TEMPLATE_MARKERS:
+            if marker in prompt:
+                return name
+        return "response"
+    
+    def render(self, prompt: str, template: str) -> str:
+        """Canned output for a template, derived from the prompt's arguments"""
+        if template == "tech_stack_parser":
+            raw = self._field(prompt, r"Tech Stack Description: (.*)")
+            return json.dumps(self._categorize(raw), indent=2)
+        
+        if template == "question_generation":
+            try:
+                tech_stack = json.loads(self._field(prompt, r"Tech Stack: (\{.*?\})\n- Years", re.DOTALL))
+            except json.JSONDecodeError:
+                tech_stack = {}
+            technologies = [name for names in tech_stack.values() for name in names]
+            count = int(self._field(prompt, r"Generate (\d+) technical") or 5)
+            return json.dumps(self._questions(technologies, count), indent=2)
+        
+        if template in ("tech_stack_questions", "structured_repair"):
+            unknown = [
+                item.strip()
+                for item in self._field(prompt, r"databases and tools: (.*)").split(",")
+                if item.strip()
+            ]
+            focus = [item.strip() for item in self._field(prompt, r"focusing on: (.*)").split(",") if item.strip()]
+            count = int(self._field(prompt, r"Generate (\d+) technical") or 5)
+            return json.dumps({
+                "tech_stack": {"tools": unknown},
+                "questions": self._questions(focus, count)
+            })
+        
+        if template == "validation":
+            value = self._field(prompt, r"Value: (.*)")
+            return json.dumps({"is_valid": True, "corrected_value": value, "message": ""})
+        
+        return CANNED_RESPONSES.get(template, CANNED_RESPONSES["response"])
+    
+    @staticmethod
+    def _field(prompt: str, pattern: str, flags: int = 0) -> str:
+        """First group of ``pattern`` in the prompt, or an empty string"""
+        match = re.search(pattern, prompt, flags)
+        return match.group(1).strip() if match else ""
+    
+    @staticmethod
+    def _categorize(tech_stack_raw: str) -> Dict[str, List[str]]:
+        """Categorize a stack with the local taxonomy, filing unknown items as tools"""
+        parsed = tech_stack_parser.parse(tech_stack_raw)
+        tech_stack = {category: list(names) for category, names in parsed.tech_stack.items()}
+        tech_stack.setdefault("tools", []).extend(parsed.unknown)
+        return tech_stack
+    
+    @staticmethod
+    def _questions(technologies: List[str], count: int) -> List[Dict[str, str]]:
+        """Deterministic questions cycling through the given technologies"""
+        technologies = technologies or ["Software Engineering"]
+        difficulties = ("easy", "medium", "hard")
+        questions = []
+        for index in range(count):
+            technology = technologies[index % len(technologies)]
+            round_number = index // len(technologies) + 1
+            questions.append({
+                "technology": technology,
+                "question": f"Describe a {difficulties[index % 3]} problem you solved with {technology} (#{round_number}).",
+                "difficulty": difficulties[index % 3]
+            })
+        return questions
+
+
+PROVIDERS = {
+    "gemini": GeminiProvider,
+    "fake": FakeProvider,
+}
+
+
+def create_provider(name: Optional[str] = None) -> LLMProvider:
+    """Create the LLM provider selected in settings
+    
+    Args:
+        name: Provider name (defaults to settings.LLM_PROVIDER)
+    
+    Returns:
+        Provider instance
+    """
+    name = (name or settings.LLM_PROVIDER).lower()
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown LLM provider '{name}' (expected one of: {', '.join(PROVIDERS)})")
+    return PROVIDERS[name]()
@@ -1,9 +1,32 @@
 """LLM Service for interacting with Google Gemini and managing prompts"""
-from typing import List, Dict, Any, Optional
-import google.generativeai as genai
+from typing import AsyncIterator, Iterable, List, Dict, Any, Optional, Tuple
+import asyncio
 import json
+import logging
 import re
+import time
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.cache_service import SingleFlight, response_cache
+from app.services.context_builder import context_builder
+from app.services.hedging import Hedger
+from app.services.llm_providers import create_provider
+from app.services import structured_output
+from app.services.rate_governor import (
+    Priority,
+    RateLimitExceeded,
+    estimate_tokens,
+    llm_priority,
+    rate_governor
+)
+from app.services.retry_policy import RetryPolicy
+from app.services.usage_service import record_usage, usage_from_response
+from app.services.tech_stack_parser import tech_stack_parser
+from app.services.question_bank_service import (
+    QuestionBankService,
+    canonical_technology,
+    stack_technologies
+)
 from app.prompts.templates import (
     SYSTEM_PROMPT,
     GREETING_PROMPT,
@@ -11,67 +34,303 @@ from app.prompts.templates import (
     QUESTION_GENERATION_PROMPT,
     VALIDATION_PROMPT,
     FALLBACK_RESPONSE_PROMPT,
-    CLOSING_PROMPT
+    CLOSING_PROMPT,
+    CONVERSATION_SUMMARY_PROMPT,
+    TECH_STACK_QUESTIONS_PROMPT,
+    STRUCTURED_REPAIR_PROMPT
 )
 
+logger = logging.getLogger(__name__)
+
+# Response schema of the fused tech stack + questions call
+TECH_STACK_QUESTIONS_SCHEMA = {
+    "type": "object",
+    "required": ["tech_stack", "questions"],
+    "properties": {
+        "tech_stack": {
+            "type": "object",
+            "additionalProperties": {"type": "array", "items": {"type": "string"}}
+        },
+        "questions": {
+            "type": "array",
+            "minItems": 1,
+            "items": {
+                "type": "object",
+                "required": ["technology", "question", "difficulty"],
+                "properties": {
+                    "technology": {"type": "string", "minLength": 1},
+                    "question": {"type": "string", "minLength": 1},
+                    "difficulty": {"type": "string", "enum": ["easy", "medium", "hard"]}
+                }
+            }
+        }
+    }
+}
+
 
 class LLMService:
-    """Service for interacting with Google Gemini Language Model"""
+    """Service for interacting with the configured language model (Google Gemini by default)"""
     
     def __init__(self):
-        """Initialize Google Gemini client"""
-        genai.configure(api_key=settings.GEMINI_API_KEY)
-        self.model = genai.GenerativeModel(settings.GEMINI_MODEL)
+        """Initialize the LLM provider selected in settings"""
+        self.provider = create_provider()
         self.temperature = settings.GEMINI_TEMPERATURE
         self.max_tokens = settings.GEMINI_MAX_TOKENS
+        self.retry_policy = RetryPolicy.from_settings()
+        self.hedger = Hedger.from_settings()
+        self._single_flight = SingleFlight()
     
-    def _call_llm(
+    async def _call_llm(
         self,
         prompt: str,
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
         system_instruction: Optional[str] = None,
-        max_retries: int = 3
+        max_retries: Optional[int] = None,
+        template: Optional[str] = None,
+        cache_args: Optional[Dict[str, Any]] = None
     ) -> str:
-        """Call Google Gemini API with retry logic"""
-        for attempt in range(1, max_retries + 1):
+        """Call the LLM provider with caching and retry logic
+        
+        Uses the provider's async generation so a slow round trip never
+        blocks the event loop serving other requests. Concurrent calls for
+        the same request (same key as the cache) are coalesced into one.
+        
+        Args:
+            prompt: Fully rendered prompt
+            temperature: Sampling temperature (defaults to settings)
+            max_tokens: Output token limit (defaults to settings)
+            system_instruction: Optional system instruction
+            max_retries: Maximum number of attempts (defaults to the retry policy)
+            template: Prompt template name, used for cache opt-in and metrics
+            cache_args: Template arguments addressing the cache entry and
+                identifying coalesced calls (defaults to the rendered prompt)
+        
+        Returns:
+            Response text, or a rule-based fallback if every attempt failed
+        """
+        generation_config = {
+            "temperature": temperature or self.temperature,
+            "max_output_tokens": max_tokens or self.max_tokens,
+        }
+        
+        request_key = response_cache.make_key(
+            self.provider.model,
+            template,
+            cache_args if cache_args is not None else {"prompt": prompt},
+            {**generation_config, "system_instruction": system_instruction}
+        )
+        cache_key = request_key if response_cache.is_enabled(template) else None
+        if cache_key is not None:
+            cached = await response_cache.get(template, cache_key)
+            if cached is not None:
+                return cached
+        
+        # Identical requests already in flight share one Gemini call
+        text = await self._single_flight.do(
+            request_key,
+            lambda: self._generate_and_cache(
+                prompt, generation_config, system_instruction, max_retries, template, cache_key
+            ),
+            template
+        )
+        if text is None:
+            return self._generate_fallback_response_from_error(prompt)
+        return text
+    
+    async def _generate_and_cache(
+        self,
+        prompt: str,
+        generation_config: Dict[str, Any],
+        system_instruction: Optional[str],
+        max_retries: Optional[int],
+        template: Optional[str],
+        cache_key: Optional[str]
+    ) -> Optional[str]:
+        """Generate a response and store it under ``cache_key`` if caching applies"""
+        text = await self._generate(prompt, generation_config, system_instruction, max_retries, template)
+        if text is not None and cache_key is not None:
+            await response_cache.set(template, cache_key, text)
+        return text
+    
+    async def _generate(
+        self,
+        prompt: str,
+        generation_config: Dict[str, Any],
+        system_instruction: Optional[str],
+        max_retries: Optional[int] = None,
+        template: Optional[str] = None
+    ) -> Optional[str]:
+        """Run the provider request under the retry policy
+        
+        Each attempt is bounded by the policy's per-attempt deadline and the
+        remaining turn budget; only errors classified as transient are retried,
+        with jittered backoff that never outlives the budget.
+        
+        Returns:
+            Response text, or None if every attempt failed or the budget ran out
+        """
+        policy = self.retry_policy
+        attempts = max_retries or policy.max_attempts
+        delay = policy.base_delay
+        started = time.monotonic()
+        
+        for attempt in range(1, attempts + 1):
             try:
-                generation_config = {
-                    "temperature": temperature or self.temperature,
-                    "max_output_tokens": max_tokens or self.max_tokens,
-                }
-                
-                if system_instruction:
-                    model = genai.GenerativeModel(
-                        settings.GEMINI_MODEL,
-                        system_instruction=system_instruction
-                    )
-                else:
-                    model = self.model
-                
-                response = model.generate_content(
-                    prompt,
-                    generation_config=generation_config
+                await rate_governor.acquire(
+                    self.provider.model,
+                    self._estimate_cost(prompt, generation_config, system_instruction)
+                )
+            except RateLimitExceeded as e:
+                logger.warning(f"LLM call ({template or 'unknown'}) not admitted, falling back: {str(e)}")
+                policy.record(template, "give_up", "rate_governed")
+                return None
+            
+            timeout = policy.attempt_deadline()
+            if timeout is None:
+                policy.record(template, "give_up", "budget_exhausted")
+                return None
+            
+            try:
+                result = await self.hedger.run(
+                    template,
+                    lambda: self.provider.generate(
+                        prompt,
+                        generation_config,
+                        system_instruction,
+                        template
+                    ),
+                    timeout,
+                    lambda: self._admit_hedge(prompt, generation_config, system_instruction)
                 )
                 
-                if response and response.text:
-                    return response.text
-                    
-            except Exception as e:
-                error_msg = str(e).lower()
-                print(f"Gemini API Error (Attempt {attempt}/{max_retries}): {str(e)}")
+                if result.text:
+                    record_usage(usage_from_response(
+                        result,
+                        template,
+                        self.provider.model,
+                        (time.monotonic() - started) * 1000
+                    ))
+                    return result.text
+                retryable, reason = True, "empty_response"
                 
-                # If quota or rate limit, wait and retry
-                if attempt < max_retries and ('quota' in error_msg or 'rate' in error_msg or '429' in error_msg):
-                    import time
-                    time.sleep(2 ** attempt)  # Exponential backoff
-                    continue
-                    
-                # Last attempt failed
-                if attempt == max_retries:
-                    return self._generate_fallback_response_from_error(prompt)
+            except Exception as e:
+                retryable, reason = policy.classify(e)
+                print(f"LLM API Error (Attempt {attempt}/{attempts}): {type(e).__name__}: {str(e)}")
+            
+            if not retryable:
+                policy.record(template, "give_up", reason)
+                return None
+            if attempt == attempts:
+                policy.record(template, "give_up", "attempts_exhausted")
+                return None
+            
+            delay = policy.next_delay(delay)
+            if not policy.can_wait(delay):
+                policy.record(template, "give_up", "budget_exhausted")
+                return None
+            
+            policy.record(template, "retry", reason)
+            metrics.observe("llm_retry_backoff_ms", delay * 1000, template=template or "unknown")
+            await asyncio.sleep(delay)
         
-        return self._generate_fallback_response_from_error(prompt)
+        return None
+    
+    async def _admit_hedge(
+        self,
+        prompt: str,
+        generation_config: Dict[str, Any],
+        system_instruction: Optional[str]
+    ) -> bool:
+        """Take quota for a hedged duplicate only if it is free right now
+        
+        Hedges leave the background reserve untouched, like background work,
+        so they never use quota a queued or upcoming chat turn needs.
+        """
+        return await rate_governor.try_acquire(
+            self.provider.model,
+            self._estimate_cost(prompt, generation_config, system_instruction),
+            reserve=settings.LLM_RATE_BACKGROUND_RESERVE
+        )
+    
+    def _estimate_cost(
+        self,
+        prompt: str,
+        generation_config: Dict[str, Any],
+        system_instruction: Optional[str]
+    ) -> int:
+        """Estimate the tokens a call will count against the TPM quota"""
+        expected_output = min(
+            generation_config["max_output_tokens"],
+            settings.LLM_RATE_EXPECTED_OUTPUT_TOKENS
+        )
+        return estimate_tokens(prompt + (system_instruction or "")) + expected_output
+    
+    async def _stream_llm(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        system_instruction: Optional[str] = None,
+        template: Optional[str] = None,
+        fallback: bool = True
+    ) -> AsyncIterator[str]:
+        """Stream a provider completion chunk by chunk
+        
+        Falls back to the rule-based response when the stream fails before
+        producing any text (unless ``fallback`` is False, in which case it
+        just ends); a stream cut short keeps what was already sent.
+        """
+        generation_config = {
+            "temperature": temperature or self.temperature,
+            "max_output_tokens": max_tokens or self.max_tokens,
+        }
+        produced = False
+        started = time.monotonic()
+        
+        try:
+            await rate_governor.acquire(
+                self.provider.model,
+                self._estimate_cost(prompt, generation_config, system_instruction)
+            )
+            
+            timeout = self.retry_policy.attempt_deadline()
+            if timeout is None:
+                raise asyncio.TimeoutError("turn budget exhausted")
+            
+            # Hedging covers the wait for the stream to start
+            stream = await self.hedger.run(
+                template,
+                lambda: self.provider.stream(
+                    prompt,
+                    generation_config,
+                    system_instruction,
+                    template
+                ),
+                timeout,
+                lambda: self._admit_hedge(prompt, generation_config, system_instruction),
+                release=lambda losing_stream: losing_stream.aclose()
+            )
+            
+            async for text in stream:
+                produced = True
+                yield text
+            
+            # Token counts are complete once the stream has been consumed
+            record_usage(usage_from_response(
+                stream,
+                template,
+                self.provider.model,
+                (time.monotonic() - started) * 1000
+            ))
+        
+        except RateLimitExceeded as e:
+            logger.warning(f"LLM stream ({template or 'unknown'}) not admitted, falling back: {str(e)}")
+        except Exception as e:
+            print(f"LLM API Streaming Error: {str(e)}")
+        
+        if not produced and fallback:
+            yield self._generate_fallback_response_from_error(prompt)
     
     def _generate_fallback_response_from_error(self, prompt: str) -> str:
         """Generate intelligent fallback when Gemini fails"""
@@ -93,73 +352,359 @@ class LLMService:
         else:
             return "Thank you for sharing that information! Is there anything else you'd like to add?"
     
-    def generate_greeting(self) -> str:
+    async def generate_greeting(self) -> str:
         """Generate initial greeting"""
-        return self._call_llm(GREETING_PROMPT, temperature=0.8, system_instruction=SYSTEM_PROMPT)
+        return await self._call_llm(
+            GREETING_PROMPT,
+            temperature=0.8,
+            system_instruction=SYSTEM_PROMPT,
+            template="greeting",
+            cache_args={}
+        )
     
-    def generate_response(
+    async def generate_response(
         self,
         user_message: str,
         conversation_history: List[Dict[str, str]],
-        candidate_data: Optional[Dict[str, Any]] = None
+        candidate_data: Optional[Dict[str, Any]] = None,
+        summary: Optional[str] = None
     ) -> str:
         """Generate chatbot response"""
-        context = ""
-        for msg in conversation_history[-10:]:
-            role = "User" if msg["role"] == "user" else "Assistant"
-            context += f"{role}: {msg["content"]}\n"
+        full_prompt = context_builder.build_response_prompt(
+            user_message,
+            conversation_history,
+            candidate_data,
+            summary
+        )
+        return await self._call_llm(full_prompt, system_instruction=SYSTEM_PROMPT, template="response")
+    
+    async def stream_response(
+        self,
+        user_message: str,
+        conversation_history: List[Dict[str, str]],
+        candidate_data: Optional[Dict[str, Any]] = None,
+        summary: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Generate chatbot response, yielding text as Gemini produces it"""
+        full_prompt = context_builder.build_response_prompt(
+            user_message,
+            conversation_history,
+            candidate_data,
+            summary
+        )
+        async for chunk in self._stream_llm(
+            full_prompt,
+            system_instruction=SYSTEM_PROMPT,
+            template="response"
+        ):
+            yield chunk
+    
+    async def summarize_conversation(
+        self,
+        summary: Optional[str],
+        messages: List[Dict[str, str]]
+    ) -> Optional[str]:
+        """Fold messages into the rolling conversation summary
         
-        if candidate_data:
-            context += f"\n\nCandidate Info:\n{json.dumps(candidate_data, indent=2)}\n"
+        Args:
+            summary: Current summary (None for the first fold)
+            messages: Messages to fold in, oldest first
         
-        full_prompt = f"""Conversation History:
-{context}
-
-User: {user_message}
-
-Please respond as the TalentScout assistant. Remember to ask only ONE question at a time and be professional yet friendly."""
+        Returns:
+            Updated summary, or None if generation failed
+        """
+        transcript = "\n".join(
+            f"{'User' if msg['role'] == 'user' else 'Assistant'}: {msg['content']}"
+            for msg in messages
+        )
+        prompt = CONVERSATION_SUMMARY_PROMPT.format(
+            summary=summary or "(none yet)",
+            messages=transcript
+        )
+        generation_config = {
+            "temperature": 0.2,
+            "max_output_tokens": settings.LLM_CONTEXT_SUMMARY_MAX_TOKENS,
+        }
+        with llm_priority(Priority.BACKGROUND):
+            text = await self._generate(prompt, generation_config, None, template="conversation_summary")
+        return text.strip() if text else None
+    
+    async def parse_tech_stack(self, tech_stack_raw: str) -> Dict[str, List[str]]:
+        """Parse tech stack into structured format
+        
+        Technologies in the skill taxonomy are resolved locally; Gemini is
+        only consulted for the items the taxonomy does not recognize.
+        """
+        parsed = tech_stack_parser.parse(tech_stack_raw)
+        if not parsed.unknown or not settings.TECH_STACK_LLM_FALLBACK:
+            metrics.increment("tech_stack_parse_total", path="local")
+            return parsed.tech_stack
         
-        return self._call_llm(full_prompt, system_instruction=SYSTEM_PROMPT)
+        metrics.increment("tech_stack_parse_total", path="local+llm")
+        metrics.increment("tech_stack_unknown_items_total", len(parsed.unknown))
+        llm_stack = await self._llm_parse_tech_stack(", ".join(parsed.unknown))
+        if not llm_stack:
+            return parsed.tech_stack
+        return self._merge_tech_stacks(parsed.tech_stack, llm_stack)
     
-    def parse_tech_stack(self, tech_stack_raw: str) -> Dict[str, List[str]]:
-        """Parse tech stack into structured format"""
+    async def _llm_parse_tech_stack(self, tech_stack_raw: str) -> Optional[Dict[str, List[str]]]:
+        """Ask Gemini to categorize a tech stack
+        
+        Returns:
+            Categorized stack, or None if the response held no valid JSON object
+        """
         prompt = TECH_STACK_PARSER_PROMPT.format(tech_stack_raw=tech_stack_raw)
-        response = self._call_llm(prompt, temperature=0.3)
+        # Order of the listed technologies doesn't change the parse
+        items = sorted({item.strip() for item in re.split(r"[,;\n]", tech_stack_raw.casefold()) if item.strip()})
+        response = await self._call_llm(
+            prompt,
+            temperature=0.3,
+            template="tech_stack_parser",
+            cache_args={"tech_stack_raw": items}
+        )
         
         try:
             json_match = re.search(r"\{.*\}", response, re.DOTALL)
             if json_match:
                 tech_stack = json.loads(json_match.group())
-                return tech_stack
-            else:
-                return self._fallback_tech_stack_parse(tech_stack_raw)
+                if isinstance(tech_stack, dict):
+                    return tech_stack
         except json.JSONDecodeError:
-            return self._fallback_tech_stack_parse(tech_stack_raw)
-    
-    def _fallback_tech_stack_parse(self, tech_stack_raw: str) -> Dict[str, List[str]]:
-        """Fallback tech stack parsing"""
-        text_lower = tech_stack_raw.lower()
-        
-        common_languages = ["python", "javascript", "java", "c++", "c#", "go", "rust", "typescript", "php", "ruby", "swift", "kotlin"]
-        common_frameworks = ["django", "flask", "fastapi", "react", "vue", "angular", "next.js", "express", "spring", "laravel", ".net"]
-        common_databases = ["postgresql", "mysql", "mongodb", "redis", "elasticsearch", "sqlite", "cassandra", "dynamodb"]
-        common_tools = ["docker", "kubernetes", "git", "aws", "gcp", "azure", "jenkins", "terraform", "ansible"]
-        
-        return {
-            "languages": [lang for lang in common_languages if lang in text_lower],
-            "frameworks": [fw for fw in common_frameworks if fw in text_lower],
-            "databases": [db for db in common_databases if db in text_lower],
-            "tools": [tool for tool in common_tools if tool in text_lower]
-        }
+            pass
+        return None
+    
+    def _merge_tech_stacks(
+        self,
+        tech_stack: Dict[str, List[str]],
+        extra: Dict[str, List[str]]
+    ) -> Dict[str, List[str]]:
+        """Merge LLM-categorized items into a locally parsed stack
+        
+        Items the taxonomy can resolve are stored under their canonical name
+        and category; anything else keeps the LLM's category.
+        """
+        merged = {category: list(names) for category, names in tech_stack.items()}
+        seen = {name.casefold() for names in merged.values() for name in names}
+        
+        for category, names in extra.items():
+            if not isinstance(names, list):
+                continue
+            for name in names:
+                if not isinstance(name, str) or not name.strip():
+                    continue
+                skill = tech_stack_parser.lookup(name)
+                if skill:
+                    name, category_key = skill.name, skill.category
+                else:
+                    name = name.strip()
+                    category_key = category if category in merged else "tools"
+                if name.casefold() not in seen:
+                    seen.add(name.casefold())
+                    merged.setdefault(category_key, []).append(name)
+        
+        return merged
+    
+    async def generate_technical_questions(
+        self,
+        tech_stack: Dict[str, List[str]],
+        years_exp: int,
+        position: str,
+        num_questions: int = 5,
+        question_bank: Optional[QuestionBankService] = None,
+        exclude: Optional[Iterable[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Generate technical questions
+        
+        When a question bank is given, the set is assembled from stored
+        questions first and Gemini is only asked to fill the gap; newly
+        generated questions are written back to the bank.
+        
+        Args:
+            tech_stack: Categorized tech stack
+            years_exp: Years of experience
+            position: Desired position
+            num_questions: Number of questions wanted
+            question_bank: Optional question bank to draw from and extend
+            exclude: Question texts the user has already been asked
+            
+        Returns:
+            List of question dictionaries (technology, question, difficulty)
+        """
+        if question_bank is None:
+            questions = await self._request_questions(tech_stack, years_exp, position, num_questions)
+            return questions or self._generate_fallback_questions(tech_stack, num_questions)
+        
+        questions = await question_bank.assemble(
+            tech_stack,
+            years_exp,
+            position,
+            num_questions,
+            exclude=exclude
+        )
+        missing = num_questions - len(questions)
+        if missing <= 0:
+            metrics.increment("question_bank_requests_total", outcome="hit")
+            metrics.increment("question_bank_generations_avoided_total")
+            return questions
+        metrics.increment("question_bank_requests_total", outcome="partial" if questions else "miss")
+        
+        # Ask only about technologies the bank could not cover, if any
+        uncovered_stack = self._uncovered_stack(tech_stack, questions)
+        generated = await self._request_questions(uncovered_stack, years_exp, position, missing)
+        if generated is None:
+            fallback = self._generate_fallback_questions(tech_stack, num_questions)
+            return (questions + fallback)[:num_questions]
+        
+        return await self._add_generated_questions(
+            questions, generated, missing, question_bank, years_exp, position, exclude
+        )
+    
+    async def stream_technical_questions(
+        self,
+        tech_stack: Dict[str, List[str]],
+        years_exp: int,
+        position: str,
+        num_questions: int = 5,
+        question_bank: Optional[QuestionBankService] = None,
+        exclude: Optional[Iterable[str]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Generate technical questions, yielding each one as soon as it is complete
+        
+        Same selection as ``generate_technical_questions``, but bank questions
+        are yielded immediately and Gemini's answer is streamed and parsed
+        incrementally, so each generated question is yielded as its JSON
+        object closes rather than after the whole array has arrived.
+        
+        Args:
+            tech_stack: Categorized tech stack
+            years_exp: Years of experience
+            position: Desired position
+            num_questions: Number of questions wanted
+            question_bank: Optional question bank to draw from and extend
+            exclude: Question texts the user has already been asked
+        
+        Yields:
+            Question dictionaries (technology, question, difficulty)
+        """
+        questions: List[Dict[str, Any]] = []
+        if question_bank is not None:
+            questions = await question_bank.assemble(
+                tech_stack,
+                years_exp,
+                position,
+                num_questions,
+                exclude=exclude
+            )
+            for question in questions:
+                yield question
+            
+            if len(questions) >= num_questions:
+                metrics.increment("question_bank_requests_total", outcome="hit")
+                metrics.increment("question_bank_generations_avoided_total")
+                return
+            metrics.increment("question_bank_requests_total", outcome="partial" if questions else "miss")
+        
+        missing = num_questions - len(questions)
+        prompt = QUESTION_GENERATION_PROMPT.format(
+            tech_stack=json.dumps(self._uncovered_stack(tech_stack, questions), indent=2),
+            years_exp=years_exp,
+            position=position,
+            num_questions=missing
+        )
+        
+        seen = {q["question"].casefold() for q in questions}
+        seen.update(text.casefold() for text in exclude or [])
+        generated: List[Dict[str, Any]] = []
+        parser = structured_output.JSONArrayStream()
+        started = time.monotonic()
+        
+        async for chunk in self._stream_llm(
+            prompt,
+            temperature=0.7,
+            max_tokens=2048,
+            template="question_generation",
+            fallback=False
+        ):
+            for item in parser.feed(chunk):
+                if len(generated) >= missing:
+                    break
+                if not (
+                    isinstance(item, dict) and isinstance(item.get("question"), str)
+                    and isinstance(item.get("technology"), str)
+                ):
+                    continue
+                if item["question"].casefold() in seen:
+                    continue
+                seen.add(item["question"].casefold())
+                generated.append(item)
+                if len(generated) == 1:
+                    metrics.observe(
+                        "llm_first_question_latency_ms",
+                        (time.monotonic() - started) * 1000
+                    )
+                yield item
+        
+        if not generated:
+            # Nothing usable was streamed; fill the gap with template questions
+            fallback = self._generate_fallback_questions(tech_stack, num_questions)
+            for question in fallback:
+                if len(generated) >= missing:
+                    break
+                if question["question"].casefold() not in seen:
+                    seen.add(question["question"].casefold())
+                    generated.append(question)
+                    yield question
+            return
+        
+        if question_bank is not None:
+            await question_bank.add_questions(generated, years_exp, position)
+            metrics.increment("question_bank_questions_served_total", len(generated), source="llm")
     
-    def generate_technical_questions(
+    def _uncovered_stack(
         self,
         tech_stack: Dict[str, List[str]],
+        questions: List[Dict[str, Any]]
+    ) -> Dict[str, List[str]]:
+        """The part of a stack no question covers yet (the whole stack if all are covered)"""
+        covered = {canonical_technology(q["technology"]) for q in questions}
+        uncovered_stack = {
+            category: [name for name in names if canonical_technology(name) not in covered]
+            for category, names in tech_stack.items()
+        }
+        if not stack_technologies(uncovered_stack):
+            return tech_stack
+        return uncovered_stack
+    
+    async def _add_generated_questions(
+        self,
+        questions: List[Dict[str, Any]],
+        generated: List[Dict[str, Any]],
+        missing: int,
+        question_bank: QuestionBankService,
         years_exp: int,
         position: str,
-        num_questions: int = 5
+        exclude: Optional[Iterable[str]] = None
     ) -> List[Dict[str, Any]]:
-        """Generate technical questions"""
+        """Top bank questions up with generated ones and write the new ones back to the bank"""
+        seen = {q["question"].casefold() for q in questions}
+        seen.update(text.casefold() for text in exclude or [])
+        generated = [q for q in generated if q["question"].casefold() not in seen]
+        await question_bank.add_questions(generated, years_exp, position)
+        metrics.increment("question_bank_questions_served_total", len(generated[:missing]), source="llm")
+        return questions + generated[:missing]
+    
+    async def _request_questions(
+        self,
+        tech_stack: Dict[str, List[str]],
+        years_exp: int,
+        position: str,
+        num_questions: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Ask Gemini for technical questions
+        
+        Returns:
+            Parsed questions, or None if the response held no valid question list
+        """
         tech_stack_str = json.dumps(tech_stack, indent=2)
         prompt = QUESTION_GENERATION_PROMPT.format(
             tech_stack=tech_stack_str,
@@ -168,17 +713,205 @@ Please respond as the TalentScout assistant. Remember to ask only ONE question a
             num_questions=num_questions
         )
         
-        response = self._call_llm(prompt, temperature=0.7, max_tokens=2048)
+        response = await self._call_llm(
+            prompt,
+            temperature=0.7,
+            max_tokens=2048,
+            template="question_generation"
+        )
         
         try:
             json_match = re.search(r"\[.*\]", response, re.DOTALL)
             if json_match:
                 questions = json.loads(json_match.group())
-                return questions[:num_questions]
+                questions = [
+                    q for q in questions
+                    if isinstance(q, dict) and isinstance(q.get("question"), str)
+                    and isinstance(q.get("technology"), str)
+                ]
+                return questions[:num_questions] or None
             else:
-                return self._generate_fallback_questions(tech_stack, num_questions)
+                return None
         except json.JSONDecodeError:
-            return self._generate_fallback_questions(tech_stack, num_questions)
+            return None
+    
+    async def parse_tech_stack_and_questions(
+        self,
+        tech_stack_raw: str,
+        years_exp: int,
+        position: str,
+        num_questions: int = 5,
+        question_bank: Optional[QuestionBankService] = None,
+        exclude: Optional[Iterable[str]] = None
+    ) -> Tuple[Dict[str, List[str]], List[Dict[str, Any]]]:
+        """Parse a tech stack and generate technical questions for it
+        
+        With ``TECH_STACK_PIPELINE="fused"``, items the taxonomy does not
+        recognize are categorized in the same structured Gemini call that
+        writes the questions, instead of a parse call followed by a question
+        call. ``"sequential"`` keeps the two-step path for comparison.
+        
+        Args:
+            tech_stack_raw: Tech stack as typed by the candidate
+            years_exp: Years of experience
+            position: Desired position
+            num_questions: Number of questions wanted
+            question_bank: Optional question bank to draw from and extend
+            exclude: Question texts the user has already been asked
+        
+        Returns:
+            Tuple of (categorized tech stack, question dictionaries)
+        """
+        pipeline = settings.TECH_STACK_PIPELINE
+        started = time.monotonic()
+        parsed = tech_stack_parser.parse(tech_stack_raw)
+        unknown = parsed.unknown if settings.TECH_STACK_LLM_FALLBACK else []
+        
+        result = None
+        if pipeline == "fused" and unknown:
+            result = await self._fused_tech_stack_questions(
+                tech_stack_raw, parsed.tech_stack, unknown,
+                years_exp, position, num_questions, question_bank, exclude
+            )
+        
+        if result is not None:
+            tech_stack, questions = result
+        else:
+            # Nothing to fuse when the taxonomy resolved every item (or the fused call failed)
+            tech_stack = await self.parse_tech_stack(tech_stack_raw)
+            questions = await self.generate_technical_questions(
+                tech_stack, years_exp, position, num_questions, question_bank, exclude
+            )
+        
+        metrics.observe(
+            "tech_stack_turn_latency_ms",
+            (time.monotonic() - started) * 1000,
+            pipeline=pipeline if unknown else "local"
+        )
+        return tech_stack, questions
+    
+    async def _fused_tech_stack_questions(
+        self,
+        tech_stack_raw: str,
+        known_stack: Dict[str, List[str]],
+        unknown: List[str],
+        years_exp: int,
+        position: str,
+        num_questions: int,
+        question_bank: Optional[QuestionBankService],
+        exclude: Optional[Iterable[str]]
+    ) -> Optional[Tuple[Dict[str, List[str]], List[Dict[str, Any]]]]:
+        """Categorize unknown items and write questions in one structured call
+        
+        Returns:
+            Tuple of (tech stack, questions), or None if the structured call
+            failed and the sequential path should take over
+        """
+        questions: List[Dict[str, Any]] = []
+        if question_bank is not None:
+            questions = await question_bank.assemble(
+                known_stack, years_exp, position, num_questions, exclude=exclude
+            )
+        missing = num_questions - len(questions)
+        if missing <= 0:
+            # The bank covered the questions; only the parse is left
+            metrics.increment("question_bank_requests_total", outcome="hit")
+            metrics.increment("question_bank_generations_avoided_total")
+            return await self.parse_tech_stack(tech_stack_raw), questions
+        if question_bank is not None:
+            metrics.increment("question_bank_requests_total", outcome="partial" if questions else "miss")
+        
+        focus = [
+            name for names in self._uncovered_stack(known_stack, questions).values() for name in names
+        ] + unknown
+        prompt = TECH_STACK_QUESTIONS_PROMPT.format(
+            tech_stack_raw=tech_stack_raw,
+            known_stack=json.dumps({k: v for k, v in known_stack.items() if v}),
+            unknown_items=", ".join(unknown),
+            num_questions=missing,
+            years_exp=years_exp,
+            position=position,
+            focus=", ".join(dict.fromkeys(focus)),
+            schema=json.dumps(TECH_STACK_QUESTIONS_SCHEMA)
+        )
+        result = await self._request_structured(
+            prompt,
+            TECH_STACK_QUESTIONS_SCHEMA,
+            template="tech_stack_questions",
+            temperature=0.7,
+            max_tokens=2048
+        )
+        if result is None:
+            return None
+        
+        metrics.increment("tech_stack_parse_total", path="fused")
+        metrics.increment("tech_stack_unknown_items_total", len(unknown))
+        tech_stack = self._merge_tech_stacks(known_stack, result["tech_stack"])
+        generated = result["questions"]
+        if question_bank is None:
+            return tech_stack, generated[:num_questions]
+        return tech_stack, await self._add_generated_questions(
+            questions, generated, missing, question_bank, years_exp, position, exclude
+        )
+    
+    async def _request_structured(
+        self,
+        prompt: str,
+        schema: Dict[str, Any],
+        template: str,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None
+    ) -> Optional[Any]:
+        """Request JSON output and validate it against a schema
+        
+        A response that fails validation gets one targeted repair request,
+        listing the validation errors alongside the response, instead of a
+        full regeneration.
+        
+        Args:
+            prompt: Fully rendered prompt asking for JSON
+            schema: JSON schema the response must satisfy
+            template: Prompt template name for metrics
+            temperature: Sampling temperature (defaults to settings)
+            max_tokens: Output token limit (defaults to settings)
+        
+        Returns:
+            Validated JSON value, or None if generation or repair failed
+        """
+        generation_config = {
+            "temperature": temperature or self.temperature,
+            "max_output_tokens": max_tokens or self.max_tokens,
+        }
+        text = await self._generate(prompt, generation_config, None, template=template)
+        if text is None:
+            metrics.increment("llm_structured_output_total", template=template, outcome="failed")
+            return None
+        
+        data, errors = structured_output.load(text, schema)
+        if not errors:
+            metrics.increment("llm_structured_output_total", template=template, outcome="valid")
+            return data
+        
+        print(f"Structured output for {template} failed validation: {'; '.join(errors[:5])}")
+        repair_prompt = STRUCTURED_REPAIR_PROMPT.format(
+            schema=json.dumps(schema),
+            errors="\n".join(f"- {error}" for error in errors[:20]),
+            response=text
+        )
+        text = await self._generate(
+            repair_prompt,
+            {**generation_config, "temperature": 0.0},
+            None,
+            template=f"{template}_repair"
+        )
+        if text is not None:
+            data, errors = structured_output.load(text, schema)
+            if not errors:
+                metrics.increment("llm_structured_output_total", template=template, outcome="repaired")
+                return data
+        
+        metrics.increment("llm_structured_output_total", template=template, outcome="failed")
+        return None
     
     def _generate_fallback_questions(
         self,
@@ -211,10 +944,15 @@ Please respond as the TalentScout assistant. Remember to ask only ONE question a
         
         return questions[:num_questions]
     
-    def validate_field(self, field_type: str, value: str) -> Dict[str, Any]:
+    async def validate_field(self, field_type: str, value: str) -> Dict[str, Any]:
         """Validate a field"""
         prompt = VALIDATION_PROMPT.format(field_type=field_type, value=value)
-        response = self._call_llm(prompt, temperature=0.1)
+        response = await self._call_llm(
+            prompt,
+            temperature=0.1,
+            template="validation",
+            cache_args={"field_type": field_type, "value": value}
+        )
         
         try:
             json_match = re.search(r"\{.*\}", response, re.DOTALL)
@@ -225,23 +963,74 @@ Please respond as the TalentScout assistant. Remember to ask only ONE question a
         
         return {"is_valid": True, "corrected_value": value, "message": ""}
     
-    def generate_fallback_response(self, user_input: str) -> str:
+    async def generate_fallback_response(self, user_input: str) -> str:
         """Generate fallback response"""
         prompt = FALLBACK_RESPONSE_PROMPT.format(user_input=user_input)
-        return self._call_llm(prompt, system_instruction=SYSTEM_PROMPT)
+        return await self._call_llm(prompt, system_instruction=SYSTEM_PROMPT, template="fallback_response")
     
-    def generate_closing_message(self) -> str:
+    async def generate_closing_message(self) -> str:
         """Generate closing message"""
-        return self._call_llm(CLOSING_PROMPT, temperature=0.8, system_instruction=SYSTEM_PROMPT)
-    
-    def detect_conversation_end(self, user_message: str) -> bool:
-        """Detect if user wants to end"""
-        end_keywords = [
-            "bye", "goodbye", "exit", "quit", "stop", "end", "thanks bye",
-            "thank you bye", "that\'s all", "thats all", "no thanks", "done"
-        ]
-        message_lower = user_message.lower().strip()
-        return any(keyword in message_lower for keyword in end_keywords)
+        return await self._call_llm(
+            CLOSING_PROMPT,
+            temperature=0.8,
+            system_instruction=SYSTEM_PROMPT,
+            template="closing",
+            cache_args={}
+        )
+    
+    async def generate_pool_variant(self, kind: str) -> Optional[str]:
+        """Generate a fresh greeting or closing variant for the message pool
+        
+        Bypasses the response cache and request coalescing, since every
+        variant should differ, and runs at background priority.
+        
+        Args:
+            kind: "greeting" or "closing"
+        
+        Returns:
+            Generated message, or None if generation failed
+        """
+        prompt = GREETING_PROMPT if kind == "greeting" else CLOSING_PROMPT
+        generation_config = {
+            "temperature": 0.8,
+            "max_output_tokens": self.max_tokens,
+        }
+        with llm_priority(Priority.BACKGROUND):
+            return await self._generate(prompt, generation_config, SYSTEM_PROMPT, template=f"{kind}_pool")
+    
+    def is_busy(self) -> bool:
+        """Whether calls are already queued for the model's rate limit quota"""
+        return rate_governor.is_busy(self.provider.model)
+    
+    async def warm_question_bank(
+        self,
+        tech_stack: Dict[str, List[str]],
+        years_exp: int,
+        position: str,
+        num_questions: int,
+        question_bank: QuestionBankService
+    ) -> int:
+        """Generate questions ahead of need and store them in the bank
+        
+        Runs at background priority, so the rate governor queues it behind
+        chat turns and keeps the background reserve free.
+        
+        Args:
+            tech_stack: Categorized technologies to write questions for
+            years_exp: Years of experience
+            position: Desired position
+            num_questions: Number of questions to generate
+            question_bank: Question bank to extend (committed by the caller
+                if it is bound to a session)
+        
+        Returns:
+            Number of new bank entries
+        """
+        with llm_priority(Priority.BACKGROUND):
+            questions = await self._request_questions(tech_stack, years_exp, position, num_questions)
+        if not questions:
+            return 0
+        return await question_bank.add_questions(questions, years_exp, position)
 
 
 # Global LLM service instance
@@ -0,0 +1,170 @@
+"""Pool of pre-generated greeting and closing messages"""
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+import asyncio
+import random
+from sqlalchemy import delete, select
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.metrics import metrics
+from app.models import PooledMessage
+from app.prompts.templates import GREETING_FALLBACK, CLOSING_FALLBACK
+from app.services.llm_service import llm_service
+
+# Message kinds kept in the pool, with the static message served when it is empty
+STATIC_MESSAGES = {
+    "greeting": GREETING_FALLBACK,
+    "closing": CLOSING_FALLBACK,
+}
+
+
+def _is_stale(created_at: Optional[datetime], max_age: timedelta) -> bool:
+    """Check whether a pooled variant is older than ``max_age``"""
+    if created_at is None:
+        return False
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return datetime.utcnow() - created_at > max_age
+
+
+class MessagePool:
+    """Pre-generated greeting and closing variants served without an LLM call
+    
+    Variants are persisted in the ``message_pool`` table and mirrored in
+    memory, so serving one is a random pick. A background task tops each kind
+    up to ``MESSAGE_POOL_SIZE`` fresh variants and replaces stale ones; it is
+    woken early when a kind drops below the low watermark.
+    """
+    
+    def __init__(self):
+        """Initialize an empty pool"""
+        self._variants: Dict[str, List[str]] = {kind: [] for kind in STATIC_MESSAGES}
+        self._refill_needed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+    
+    async def get(self, kind: str) -> str:
+        """Get a message of the given kind
+        
+        Args:
+            kind: "greeting" or "closing"
+        
+        Returns:
+            A random pooled variant, the static message if the pool is empty,
+            or a freshly generated message when pooling is disabled
+        """
+        if not settings.MESSAGE_POOL_ENABLED:
+            metrics.increment("message_pool_served_total", kind=kind, source="llm")
+            if kind == "greeting":
+                return await llm_service.generate_greeting()
+            return await llm_service.generate_closing_message()
+        
+        variants = self._variants.get(kind, [])
+        if len(variants) < settings.MESSAGE_POOL_LOW_WATERMARK:
+            self._refill_needed.set()
+        
+        if not variants:
+            metrics.increment("message_pool_served_total", kind=kind, source="static")
+            return STATIC_MESSAGES[kind]
+        
+        metrics.increment("message_pool_served_total", kind=kind, source="pool")
+        return random.choice(variants)
+    
+    async def refill(self) -> int:
+        """Top every kind up to the pool size and replace stale variants
+        
+        Stale variants are only deleted once a replacement was generated, so
+        an LLM outage leaves the existing pool in service.
+        
+        Returns:
+            Number of variants generated
+        """
+        max_age = timedelta(hours=settings.MESSAGE_POOL_MAX_AGE_HOURS)
+        total_generated = 0
+        
+        for kind in STATIC_MESSAGES:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    select(PooledMessage)
+                    .where(PooledMessage.kind == kind)
+                    .order_by(PooledMessage.created_at.desc())
+                )
+                rows = result.scalars().all()
+            fresh = [row for row in rows if not _is_stale(row.created_at, max_age)]
+            stale = [row for row in rows if _is_stale(row.created_at, max_age)]
+            
+            # Other workers refill too; trim anything beyond the pool size
+            retired = fresh[settings.MESSAGE_POOL_SIZE:]
+            fresh = fresh[:settings.MESSAGE_POOL_SIZE]
+            
+            # Serve what is persisted (e.g. after a restart) while new variants are generated
+            self._variants[kind] = [row.content for row in fresh + stale]
+            
+            # Generate without a session open, so no connection waits on the LLM
+            missing = settings.MESSAGE_POOL_SIZE - len(fresh)
+            generated = []
+            for _ in range(missing):
+                content = await llm_service.generate_pool_variant(kind)
+                if not content:
+                    break
+                generated.append(content.strip())
+            
+            # Keep the newest stale variants only for slots nothing new could fill
+            kept_stale = stale[:missing - len(generated)]
+            retired += stale[len(kept_stale):]
+            if generated or retired:
+                async with AsyncSessionLocal() as db:
+                    db.add_all([PooledMessage(kind=kind, content=content) for content in generated])
+                    if retired:
+                        await db.execute(
+                            delete(PooledMessage).where(PooledMessage.id.in_([row.id for row in retired]))
+                        )
+                    await db.commit()
+            
+            self._variants[kind] = [row.content for row in fresh + kept_stale] + generated
+            total_generated += len(generated)
+            metrics.increment("message_pool_generated_total", len(generated), kind=kind)
+            metrics.set_gauge("message_pool_size", len(self._variants[kind]), kind=kind)
+        
+        return total_generated
+    
+    async def run(self) -> None:
+        """Refill the pool periodically, or sooner when it runs low"""
+        while True:
+            generated = 0
+            try:
+                generated = await self.refill()
+            except Exception as e:
+                print(f"Message pool refill error: {str(e)}")
+            self._refill_needed.clear()
+            
+            if generated == 0:
+                # Nothing could be generated; don't let low-pool wakeups spin on a failing LLM
+                await asyncio.sleep(settings.MESSAGE_POOL_REFRESH_SECONDS)
+                continue
+            
+            try:
+                await asyncio.wait_for(
+                    self._refill_needed.wait(),
+                    timeout=settings.MESSAGE_POOL_REFRESH_SECONDS
+                )
+            except asyncio.TimeoutError:
+                pass
+    
+    def start(self) -> None:
+        """Start the background refill task"""
+        if settings.MESSAGE_POOL_ENABLED and self._task is None:
+            self._task = asyncio.create_task(self.run())
+    
+    async def stop(self) -> None:
+        """Stop the background refill task"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Global message pool instance
+message_pool = MessagePool()
@@ -0,0 +1,91 @@
+"""Keyset (cursor) pagination for listing endpoints"""
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+import base64
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+# Page sizes accepted by the listing endpoints
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(timestamp: datetime, row_id: str) -> str:
+    """Opaque cursor pointing at one row of a (timestamp, id) ordering"""
+    return base64.urlsafe_b64encode(f"{timestamp.isoformat()}|{row_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Timestamp and id a cursor points at
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        timestamp, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(timestamp), row_id
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+async def fetch_page(
+    db: AsyncSession,
+    query: Select,
+    timestamp_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    limit: int,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    newest_first: bool = False
+) -> Tuple[List[Any], Optional[str]]:
+    """Fetch one page of rows ordered by (timestamp, id)
+    
+    Without a cursor the newest page is returned, so a tail read costs the
+    same as any other page: a backward scan of the (..., timestamp, id)
+    index that stops after ``limit + 1`` rows. ``before`` pages towards
+    older rows and ``after`` towards newer ones.
+    
+    Args:
+        db: Async database session
+        query: Select of one entity, already filtered
+        timestamp_column: Column the rows are ordered by
+        id_column: Primary key, breaking ties between equal timestamps
+        limit: Page size
+        before: Cursor of the row the page ends before
+        after: Cursor of the row the page starts after
+        newest_first: Return the page newest first instead of oldest first
+    
+    Returns:
+        Tuple of (rows, next_cursor); pass next_cursor as the same parameter
+        (``before``, or ``after`` when paging with it) to get the following
+        page. It is None on the last page.
+    
+    Raises:
+        ValueError: If both cursors are given or a cursor is malformed
+    """
+    if before is not None and after is not None:
+        raise ValueError("Use either before or after, not both")
+    
+    key = tuple_(timestamp_column, id_column)
+    if after is not None:
+        query = query.where(key > tuple_(*decode_cursor(after))).order_by(timestamp_column, id_column)
+    else:
+        if before is not None:
+            query = query.where(key < tuple_(*decode_cursor(before)))
+        query = query.order_by(timestamp_column.desc(), id_column.desc())
+    
+    result = await db.execute(query.limit(limit + 1))
+    rows = list(result.scalars().all())
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, timestamp_column.key), getattr(last, id_column.key))
+    
+    # Rows were fetched in paging direction; flip them if the display order differs
+    if (after is None) != newest_first:
+        rows.reverse()
+    return rows, next_cursor
@@ -0,0 +1,268 @@
+"""Question bank service for reusing generated technical questions"""
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from app.core.database import AsyncSessionLocal
+from app.core.metrics import metrics
+from app.models import QuestionBankEntry
+from app.services.tech_stack_parser import tech_stack_parser
+import re
+
+# Tie-break between equally used difficulties (medium first, then easy, then hard)
+DIFFICULTY_ORDER = {"medium": 0, "easy": 1, "hard": 2}
+
+
+def canonical_technology(name: str) -> str:
+    """Canonical lookup key for a technology name
+    
+    Args:
+        name: Technology as written by the candidate or the LLM
+    
+    Returns:
+        Taxonomy skill id ("postgres" and "PostgreSQL" both map to
+        "postgresql"), or the lower-cased name for unknown technologies
+    """
+    skill = tech_stack_parser.lookup(name)
+    if skill:
+        return skill.id
+    return re.sub(r"\s+", " ", name).strip().casefold()
+
+
+def canonical_position(position: Optional[str]) -> Optional[str]:
+    """Canonical lookup key for a desired position"""
+    if not position:
+        return None
+    return re.sub(r"\s+", " ", position).strip().casefold()
+
+
+def experience_band(years_exp: Optional[int]) -> str:
+    """Bucket years of experience into the bands questions are stored under
+    
+    Args:
+        years_exp: Years of experience
+    
+    Returns:
+        "0-2", "3-5" or "6+"
+    """
+    years = years_exp or 0
+    if years <= 2:
+        return "0-2"
+    if years <= 5:
+        return "3-5"
+    return "6+"
+
+
+def stack_technologies(tech_stack: Dict[str, List[str]]) -> Dict[str, str]:
+    """Flatten a categorized tech stack into canonical key -> display name"""
+    technologies = {}
+    for names in (tech_stack or {}).values():
+        for name in names or []:
+            if isinstance(name, str) and name.strip():
+                technologies.setdefault(canonical_technology(name), name.strip())
+    return technologies
+
+
+class QuestionBankService:
+    """Service for assembling question sets from, and writing them back to, the bank"""
+    
+    def __init__(self, db: Optional[AsyncSession] = None):
+        """Initialize question bank service
+        
+        Args:
+            db: Async database session; without one, every call runs in a
+                short session of its own, so background work holds no
+                connection while it waits for the LLM
+        """
+        self.db = db
+    
+    @asynccontextmanager
+    async def _session(self) -> AsyncIterator[AsyncSession]:
+        """The caller's session, or a short one closed after the call"""
+        if self.db is not None:
+            yield self.db
+            return
+        async with AsyncSessionLocal() as db:
+            yield db
+    
+    async def assemble(
+        self,
+        tech_stack: Dict[str, List[str]],
+        years_exp: int,
+        position: str,
+        num_questions: int,
+        exclude: Optional[Iterable[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Assemble up to ``num_questions`` stored questions for a profile
+        
+        Questions are drawn round-robin across the candidate's technologies so
+        the set covers as much of the stack as possible, and each pick takes
+        the difficulty used least so far so the set mixes easy, medium and
+        hard questions. Within a technology and difficulty, questions
+        generated for the same position are preferred.
+        
+        The database samples the candidates: at most ``num_questions`` (plus
+        the excluded count) random rows per technology and difficulty are
+        fetched, however large the bank grows.
+        
+        Args:
+            tech_stack: Categorized tech stack
+            years_exp: Years of experience
+            position: Desired position
+            num_questions: Number of questions wanted
+            exclude: Question texts the user has already been asked
+        
+        Returns:
+            List of question dictionaries (technology, question, difficulty)
+        """
+        technologies = stack_technologies(tech_stack)
+        if not technologies or num_questions <= 0:
+            return []
+        
+        seen = {text.casefold() for text in exclude or []}
+        wanted_position = canonical_position(position)
+        preference = [func.random()]
+        if wanted_position:
+            preference.insert(0, case((QuestionBankEntry.position == wanted_position, 0), else_=1))
+        ranked = (
+            select(
+                QuestionBankEntry,
+                func.row_number().over(
+                    partition_by=(QuestionBankEntry.technology, QuestionBankEntry.difficulty),
+                    order_by=preference
+                ).label("rank")
+            )
+            .where(
+                QuestionBankEntry.technology.in_(list(technologies)),
+                QuestionBankEntry.experience_band == experience_band(years_exp)
+            )
+            .subquery()
+        )
+        sampled = aliased(QuestionBankEntry, ranked)
+        async with self._session() as db:
+            result = await db.execute(
+                select(sampled)
+                .where(ranked.c.rank <= num_questions + len(seen))
+                .order_by(ranked.c.rank)
+            )
+            entries = result.scalars().all()
+        
+        # Technology -> difficulty -> entries, best first
+        by_technology: Dict[str, Dict[str, List[QuestionBankEntry]]] = defaultdict(lambda: defaultdict(list))
+        for entry in entries:
+            by_technology[entry.technology][entry.difficulty].append(entry)
+        
+        questions = []
+        difficulties_used: Counter = Counter()
+        order = [tech for tech in technologies if by_technology.get(tech)]
+        while len(questions) < num_questions and any(by_technology[tech] for tech in order):
+            for tech in order:
+                pools = by_technology[tech]
+                while pools:
+                    difficulty = min(
+                        pools,
+                        key=lambda level: (difficulties_used[level], DIFFICULTY_ORDER.get(level, len(DIFFICULTY_ORDER)))
+                    )
+                    entry = pools[difficulty].pop(0)
+                    if not pools[difficulty]:
+                        del pools[difficulty]
+                    if entry.question.casefold() in seen:
+                        continue
+                    seen.add(entry.question.casefold())
+                    difficulties_used[difficulty] += 1
+                    questions.append({
+                        "technology": entry.technology_label,
+                        "question": entry.question,
+                        "difficulty": entry.difficulty
+                    })
+                    break
+                if len(questions) >= num_questions:
+                    break
+        
+        metrics.increment("question_bank_questions_served_total", len(questions), source="bank")
+        return questions
+    
+    async def count_by_technology(self, technologies: Iterable[str], years_exp: int) -> Dict[str, int]:
+        """Number of stored questions per technology for an experience band
+        
+        Args:
+            technologies: Canonical technology keys
+            years_exp: Years of experience
+        
+        Returns:
+            Question count per technology (technologies without any are omitted)
+        """
+        async with self._session() as db:
+            result = await db.execute(
+                select(QuestionBankEntry.technology, func.count())
+                .where(
+                    QuestionBankEntry.technology.in_(list(technologies)),
+                    QuestionBankEntry.experience_band == experience_band(years_exp)
+                )
+                .group_by(QuestionBankEntry.technology)
+            )
+            return {technology: count for technology, count in result.all()}
+    
+    async def add_questions(
+        self,
+        questions: List[Dict[str, Any]],
+        years_exp: int,
+        position: str
+    ) -> int:
+        """Write newly generated questions back to the bank
+        
+        The rows are added to the current session and committed with the
+        caller's transaction; without a session they are committed here.
+        
+        Args:
+            questions: Generated question dictionaries
+            years_exp: Years of experience they were generated for
+            position: Desired position they were generated for
+        
+        Returns:
+            Number of new entries added
+        """
+        band = experience_band(years_exp)
+        new_entries = {}
+        for item in questions:
+            technology = item.get("technology")
+            text = item.get("question")
+            if not isinstance(technology, str) or not isinstance(text, str) or not text.strip():
+                continue
+            key = (canonical_technology(technology), text.strip().casefold())
+            new_entries.setdefault(key, item)
+        
+        if not new_entries:
+            return 0
+        
+        async with self._session() as db:
+            result = await db.execute(
+                select(QuestionBankEntry.technology, QuestionBankEntry.question).where(
+                    QuestionBankEntry.technology.in_({tech for tech, _ in new_entries}),
+                    QuestionBankEntry.experience_band == band
+                )
+            )
+            existing = {(tech, text.strip().casefold()) for tech, text in result.all()}
+            
+            added = 0
+            for (tech, text_key), item in new_entries.items():
+                if (tech, text_key) in existing:
+                    continue
+                db.add(QuestionBankEntry(
+                    technology=tech,
+                    technology_label=item["technology"].strip(),
+                    experience_band=band,
+                    difficulty=str(item.get("difficulty") or "medium").lower(),
+                    position=canonical_position(position),
+                    question=item["question"].strip(),
+                    source="llm"
+                ))
+                added += 1
+            
+            if self.db is None:
+                await db.commit()
+        
+        metrics.increment("question_bank_entries_added_total", added)
+        return added
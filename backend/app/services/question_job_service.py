@@ -0,0 +1,323 @@
+"""Background generation of technical questions for the tech stack step"""
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set
+import asyncio
+import logging
+import time
+import uuid
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.metrics import metrics
+from app.core.replicas import replica_router
+from app.models import Candidate, Conversation, Message, QuestionJob
+from app.models.conversation import MessageRole
+from app.models.question_job import QuestionJobStatus
+from app.prompts.templates import QUESTIONS_INTRO, QUESTIONS_OUTRO, QUESTIONS_FAILED_REPLY
+from app.services.llm_service import llm_service
+from app.services.question_bank_service import QuestionBankService
+from app.services.retry_policy import turn_budget
+from app.services.speculation_service import speculative_warmer
+from app.services.usage_service import UsageService, track_usage
+
+logger = logging.getLogger(__name__)
+
+# Jobs the poller queues per scan
+POLL_BATCH_SIZE = 50
+
+
+def format_question(index: int, question: Dict[str, Any]) -> str:
+    """Response line for one technical question"""
+    return f"{index}. **{question['technology']}**: {question['question']}\n\n"
+
+
+def format_questions(questions: List[Dict[str, Any]]) -> str:
+    """Assistant response presenting the technical questions"""
+    lines = "".join(format_question(i, q) for i, q in enumerate(questions, 1))
+    return QUESTIONS_INTRO + lines + QUESTIONS_OUTRO
+
+
+class QuestionJobQueue:
+    """Persisted queue of question generation jobs run by in-process workers
+    
+    A job row is written in the request that receives the tech stack, and
+    its id is handed to a local worker. Workers claim a job with a
+    conditional UPDATE, so only one process runs it at a time; a claim is a
+    lease that expires after ``QUESTION_JOB_LEASE_SECONDS``. A poller
+    re-queues pending jobs and jobs whose lease expired, which is how jobs
+    left behind by a restarted or crashed worker are resumed. The questions
+    land on ``candidate.technical_questions`` and as an assistant message in
+    the conversation.
+    """
+    
+    def __init__(self):
+        """Initialize an idle queue"""
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue()
+        self._queued: Set[str] = set()
+        self._tasks: List[asyncio.Task] = []
+    
+    def create(
+        self,
+        db: AsyncSession,
+        candidate: Candidate,
+        conversation_id: str,
+        tech_stack_raw: str
+    ) -> QuestionJob:
+        """Record the tech stack and add a pending job for it to the session
+        
+        The job is stored with the caller's commit and not handed to a
+        worker until ``submit`` is called, so the caller can store its own
+        reply first.
+        
+        Args:
+            db: Async database session
+            candidate: Candidate object
+            conversation_id: Conversation the questions are posted to
+            tech_stack_raw: Tech stack as typed by the candidate
+        
+        Returns:
+            Created job
+        """
+        candidate.tech_stack_raw = tech_stack_raw
+        candidate.screening_status = "generating_questions"
+        job = QuestionJob(
+            id=str(uuid.uuid4()),
+            candidate_id=candidate.id,
+            conversation_id=conversation_id,
+            user_id=candidate.user_id,
+            tech_stack_raw=tech_stack_raw
+        )
+        db.add(job)
+        metrics.increment("question_jobs_total", outcome="created")
+        return job
+    
+    def submit(self, job_id: str) -> None:
+        """Hand a job to a local worker (the poller finds it otherwise)"""
+        if self._tasks and job_id not in self._queued:
+            self._queued.add(job_id)
+            self._queue.put_nowait(job_id)
+    
+    async def latest(self, db: AsyncSession, conversation_id: str) -> Optional[QuestionJob]:
+        """Most recent job of a conversation
+        
+        Args:
+            db: Async database session
+            conversation_id: Conversation ID
+        
+        Returns:
+            Job, or None if the conversation has none
+        """
+        result = await db.execute(
+            select(QuestionJob)
+            .where(QuestionJob.conversation_id == conversation_id)
+            .order_by(QuestionJob.created_at.desc())
+            .limit(1)
+        )
+        return result.scalars().first()
+    
+    async def _claim(self, db: AsyncSession, job_id: str) -> bool:
+        """Take the lease on a pending job or one whose lease expired"""
+        now = datetime.now(timezone.utc)
+        cutoff = now - timedelta(seconds=settings.QUESTION_JOB_LEASE_SECONDS)
+        result = await db.execute(
+            update(QuestionJob)
+            .where(
+                QuestionJob.id == job_id,
+                QuestionJob.attempts < settings.QUESTION_JOB_MAX_ATTEMPTS,
+                or_(
+                    QuestionJob.status == QuestionJobStatus.PENDING,
+                    and_(QuestionJob.status == QuestionJobStatus.RUNNING, QuestionJob.started_at < cutoff)
+                )
+            )
+            .values(
+                status=QuestionJobStatus.RUNNING,
+                started_at=now,
+                attempts=QuestionJob.attempts + 1
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return result.rowcount == 1
+    
+    async def process(self, job_id: str) -> None:
+        """Run one job if it can be claimed
+        
+        A failed attempt returns the job to pending for the poller to retry;
+        after ``QUESTION_JOB_MAX_ATTEMPTS`` it is marked failed.
+        
+        Args:
+            job_id: Question job ID
+        """
+        async with AsyncSessionLocal() as db:
+            if not await self._claim(db, job_id):
+                return
+            job = await db.get(QuestionJob, job_id, populate_existing=True)
+            candidate = await db.get(Candidate, job.candidate_id)
+        
+        started = time.monotonic()
+        try:
+            await self._run(job, candidate)
+            metrics.increment("question_jobs_total", outcome="completed")
+            metrics.observe("question_job_latency_ms", (time.monotonic() - started) * 1000)
+        except Exception as e:
+            logger.error(f"Question job {job_id} failed: {str(e)}", exc_info=True)
+            async with AsyncSessionLocal() as db:
+                job = await db.get(QuestionJob, job_id)
+                job.error = str(e)
+                if job.attempts >= settings.QUESTION_JOB_MAX_ATTEMPTS:
+                    await self._fail(db, job)
+                else:
+                    job.status = QuestionJobStatus.PENDING
+                    await db.commit()
+                    metrics.increment("question_jobs_total", outcome="retried")
+    
+    async def _run(self, job: QuestionJob, candidate: Candidate) -> None:
+        """Generate the questions and post them to the conversation
+        
+        The LLM calls run without a session (the question bank opens short
+        ones of its own); the results are written in a short session once
+        they are ready.
+        
+        Args:
+            job: Claimed job, loaded by a closed session
+            candidate: Candidate the job belongs to, loaded with it
+        """
+        with turn_budget(kind="question_job"), track_usage() as usage:
+            tech_stack, questions = await llm_service.parse_tech_stack_and_questions(
+                job.tech_stack_raw,
+                candidate.years_experience or 1,
+                candidate.desired_positions[0] if candidate.desired_positions else "Developer",
+                num_questions=5,
+                question_bank=QuestionBankService(),
+                exclude=[q["question"] for q in candidate.technical_questions or []]
+            )
+        speculative_warmer.resolve(candidate.id, tech_stack)
+        
+        async with AsyncSessionLocal() as db:
+            job = await db.get(QuestionJob, job.id)
+            candidate = await db.get(Candidate, job.candidate_id)
+            candidate.tech_stack = tech_stack
+            candidate.technical_questions = questions
+            candidate.screening_status = "questions_generated"
+            
+            message = await self._post(
+                db,
+                job.conversation_id,
+                format_questions(questions),
+                tokens_used=sum(call.total_tokens for call in usage) if usage else None
+            )
+            if usage:
+                UsageService(db).add(usage, job.conversation_id, job.user_id, message.id)
+            
+            job.status = QuestionJobStatus.COMPLETED
+            job.message_id = message.id
+            job.error = None
+            job.completed_at = datetime.now(timezone.utc)
+            await db.commit()
+        await replica_router.mark_write(job.user_id)
+    
+    async def _fail(self, db: AsyncSession, job: QuestionJob) -> None:
+        """Give up on a job and ask the candidate for their tech stack again"""
+        candidate = await db.get(Candidate, job.candidate_id)
+        if candidate and candidate.screening_status == "generating_questions":
+            candidate.tech_stack_raw = None
+            candidate.screening_status = "in_progress"
+            message = await self._post(db, job.conversation_id, QUESTIONS_FAILED_REPLY)
+            job.message_id = message.id
+        
+        job.status = QuestionJobStatus.FAILED
+        job.completed_at = datetime.now(timezone.utc)
+        await db.commit()
+        await replica_router.mark_write(job.user_id)
+        metrics.increment("question_jobs_total", outcome="failed")
+    
+    @staticmethod
+    async def _post(
+        db: AsyncSession,
+        conversation_id: str,
+        content: str,
+        tokens_used: Optional[int] = None
+    ) -> Message:
+        """Add an assistant message to the conversation (committed by the caller)"""
+        message = Message(
+            id=str(uuid.uuid4()),
+            conversation_id=conversation_id,
+            role=MessageRole.ASSISTANT,
+            content=content,
+            tokens_used=tokens_used,
+            created_at=datetime.now(timezone.utc)
+        )
+        db.add(message)
+        await db.execute(
+            update(Conversation)
+            .where(Conversation.id == conversation_id)
+            .values(message_count=func.coalesce(Conversation.message_count, 0) + 1)
+            .execution_options(synchronize_session=False)
+        )
+        return message
+    
+    async def poll(self) -> None:
+        """Queue claimable jobs and fail those out of attempts"""
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.QUESTION_JOB_LEASE_SECONDS)
+        expired = and_(QuestionJob.status == QuestionJobStatus.RUNNING, QuestionJob.started_at < cutoff)
+        
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(QuestionJob)
+                .where(or_(QuestionJob.status == QuestionJobStatus.PENDING, expired))
+                .order_by(QuestionJob.created_at)
+                .limit(POLL_BATCH_SIZE)
+            )
+            for job in result.scalars().all():
+                if job.attempts < settings.QUESTION_JOB_MAX_ATTEMPTS:
+                    self.submit(job.id)
+                else:
+                    job.error = job.error or "Lease expired"
+                    await self._fail(db, job)
+    
+    async def _work(self) -> None:
+        """Run queued jobs one at a time"""
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self.process(job_id)
+            except Exception as e:
+                logger.error(f"Question job {job_id} error: {str(e)}", exc_info=True)
+            finally:
+                self._queued.discard(job_id)
+    
+    async def _poll_forever(self) -> None:
+        """Poll for claimable jobs periodically (first at startup)"""
+        while True:
+            try:
+                await self.poll()
+            except Exception as e:
+                logger.error(f"Question job poll error: {str(e)}")
+            await asyncio.sleep(settings.QUESTION_JOB_POLL_SECONDS)
+    
+    def start(self) -> None:
+        """Start the workers and the poller"""
+        if settings.QUESTION_JOBS_ENABLED and not self._tasks:
+            self._tasks = [asyncio.create_task(self._work()) for _ in range(settings.QUESTION_JOB_WORKERS)]
+            self._tasks.append(asyncio.create_task(self._poll_forever()))
+    
+    async def stop(self) -> None:
+        """Stop the workers and the poller
+        
+        A job interrupted here stays running in the database and is resumed
+        by any process once its lease expires.
+        """
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        self._queued.clear()
+
+
+# Global question job queue instance
+question_jobs = QuestionJobQueue()
@@ -0,0 +1,308 @@
+"""Requests- and tokens-per-minute governor for Gemini calls"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Dict, Iterator, List, Optional, Tuple
+import asyncio
+import heapq
+import itertools
+import time
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.retry_policy import remaining_budget
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - redis is optional for single-process runs
+    aioredis = None
+
+
+class Priority(IntEnum):
+    """Scheduling class of an LLM call (lower values are served first)"""
+    INTERACTIVE = 0  # Chat turns a user is waiting on
+    BACKGROUND = 1  # Pre-generation and other work nobody is waiting on
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a call cannot be admitted within its wait limit"""
+
+
+# Priority of LLM calls made in the current context
+_priority: ContextVar[Priority] = ContextVar("llm_priority", default=Priority.INTERACTIVE)
+
+
+@contextmanager
+def llm_priority(priority: Priority) -> Iterator[None]:
+    """Run the enclosed LLM calls under the given priority class"""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> Priority:
+    """Priority class of LLM calls made in the current context"""
+    return _priority.get()
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)"""
+    return len(text) // 4 + 1
+
+
+@dataclass
+class ModelLimits:
+    """Per-minute quota for one model"""
+    rpm: int
+    tpm: int
+
+
+def _take(
+    state: Tuple[float, float, float],
+    now: float,
+    limits: ModelLimits,
+    cost: int,
+    reserve: float
+) -> Tuple[Tuple[float, float, float], float]:
+    """Refill both buckets and try to take one request and ``cost`` tokens
+    
+    Mirrors ``RedisBuckets.TAKE_SCRIPT``.
+    
+    Args:
+        state: (requests, tokens, updated_at) of the buckets
+        now: Current time in seconds
+        limits: Model quota
+        cost: Estimated tokens for the call
+        reserve: Fraction of each bucket that must be left over afterwards
+    
+    Returns:
+        Tuple of (new state, seconds to wait; 0 when the call was admitted)
+    """
+    requests, tokens, updated_at = state
+    elapsed = max(0.0, now - updated_at)
+    requests = min(limits.rpm, requests + elapsed * limits.rpm / 60)
+    tokens = min(limits.tpm, tokens + elapsed * limits.tpm / 60)
+    
+    cost = min(cost, limits.tpm)
+    need_requests = min(limits.rpm, 1 + reserve * limits.rpm)
+    need_tokens = min(limits.tpm, cost + reserve * limits.tpm)
+    wait = 0.0
+    if requests < need_requests:
+        wait = max(wait, (need_requests - requests) * 60 / limits.rpm)
+    if tokens < need_tokens:
+        wait = max(wait, (need_tokens - tokens) * 60 / limits.tpm)
+    if wait == 0:
+        requests -= 1
+        tokens -= cost
+    return (requests, tokens, now), wait
+
+
+class MemoryBuckets:
+    """Token buckets kept in process memory (single worker runs)"""
+    
+    def __init__(self):
+        """Initialize empty bucket state"""
+        self._state: Dict[str, Tuple[float, float, float]] = {}
+    
+    async def take(self, model: str, limits: ModelLimits, cost: int, reserve: float) -> float:
+        """Try to admit a call; returns seconds to wait (0 when admitted)"""
+        now = time.monotonic()
+        state = self._state.get(model, (limits.rpm, limits.tpm, now))
+        self._state[model], wait = _take(state, now, limits, cost, reserve)
+        return wait
+
+
+class RedisBuckets:
+    """Token buckets shared by every worker through Redis"""
+    
+    KEY_PREFIX = "talentscout:llm-rate:"
+    
+    # Same arithmetic as _take, using the Redis clock so workers agree on time
+    TAKE_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local rpm = tonumber(ARGV[1])
+local tpm = tonumber(ARGV[2])
+local cost = math.min(tonumber(ARGV[3]), tpm)
+local reserve = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'requests', 'tokens', 'updated_at')
+local requests = tonumber(state[1]) or rpm
+local tokens = tonumber(state[2]) or tpm
+local elapsed = math.max(0, now - (tonumber(state[3]) or now))
+requests = math.min(rpm, requests + elapsed * rpm / 60)
+tokens = math.min(tpm, tokens + elapsed * tpm / 60)
+local need_requests = math.min(rpm, 1 + reserve * rpm)
+local need_tokens = math.min(tpm, cost + reserve * tpm)
+local wait = 0
+if requests < need_requests then wait = math.max(wait, (need_requests - requests) * 60 / rpm) end
+if tokens < need_tokens then wait = math.max(wait, (need_tokens - tokens) * 60 / tpm) end
+if wait == 0 then
+    requests = requests - 1
+    tokens = tokens - cost
+end
+redis.call('HSET', KEYS[1], 'requests', requests, 'tokens', tokens, 'updated_at', now)
+redis.call('EXPIRE', KEYS[1], 120)
+return tostring(wait)
+"""
+    
+    def __init__(self, redis_url: str):
+        """Connect to Redis and register the bucket script
+        
+        Args:
+            redis_url: Redis connection URL
+        """
+        self._redis = aioredis.from_url(redis_url, decode_responses=True)
+        self._script = self._redis.register_script(self.TAKE_SCRIPT)
+    
+    async def take(self, model: str, limits: ModelLimits, cost: int, reserve: float) -> float:
+        """Try to admit a call; returns seconds to wait (0 when admitted)"""
+        wait = await self._script(
+            keys=[self.KEY_PREFIX + model],
+            args=[limits.rpm, limits.tpm, cost, reserve]
+        )
+        return float(wait)
+
+
+class RateGovernor:
+    """Admission control for Gemini calls against per-model RPM/TPM quotas
+    
+    Calls wait in a bounded, per-model priority queue; only the head of the
+    queue may take from the buckets, so interactive calls overtake queued
+    background work. Background calls must also leave a reserved share of
+    each bucket untouched, which keeps headroom for chat turns on other
+    workers when the buckets live in Redis.
+    
+    With the memory backend every worker process has its own buckets, so
+    the quota is enforced per process; that is why the governor is only on
+    by default with Redis. A call that cannot be admitted raises
+    ``RateLimitExceeded`` and the caller falls back to its rule-based reply.
+    """
+    
+    # Longest single sleep while waiting, so queue changes are noticed promptly
+    POLL_INTERVAL = 0.25
+    
+    def __init__(self):
+        """Initialize bucket storage from settings"""
+        self.enabled = settings.LLM_RATE_LIMIT_ENABLED
+        if self.enabled is None:
+            self.enabled = settings.LLM_RATE_LIMIT_BACKEND == "redis"
+        self._memory = MemoryBuckets()
+        self._buckets = self._memory
+        if settings.LLM_RATE_LIMIT_BACKEND == "redis" and aioredis is not None:
+            self._buckets = RedisBuckets(settings.REDIS_URL)
+        self._queues: Dict[str, List[Tuple[int, int]]] = {}
+        self._sequence = itertools.count()
+    
+    def limits_for(self, model: str) -> ModelLimits:
+        """Quota configured for a model (falls back to the defaults)"""
+        configured = settings.LLM_RATE_LIMITS.get(model, {})
+        return ModelLimits(
+            rpm=configured.get("rpm", settings.LLM_RATE_LIMIT_RPM),
+            tpm=configured.get("tpm", settings.LLM_RATE_LIMIT_TPM)
+        )
+    
+    async def _take(self, model: str, limits: ModelLimits, cost: int, reserve: float) -> float:
+        """Take from the configured buckets, degrading to memory if Redis fails"""
+        if self._buckets is not self._memory:
+            try:
+                return await self._buckets.take(model, limits, cost, reserve)
+            except Exception as e:
+                print(f"Rate governor Redis error, using local buckets: {str(e)}")
+                metrics.increment("llm_rate_errors_total", model=model)
+        return await self._memory.take(model, limits, cost, reserve)
+    
+    async def acquire(
+        self,
+        model: str,
+        tokens: int,
+        priority: Optional[Priority] = None,
+        max_wait: Optional[float] = None
+    ) -> None:
+        """Wait until a call may be sent to the model
+        
+        Args:
+            model: Model name
+            tokens: Estimated tokens the call will consume
+            priority: Scheduling class (defaults to the context's priority)
+            max_wait: Longest wait in seconds (defaults to settings, and never
+                beyond the remaining turn budget)
+        
+        Raises:
+            RateLimitExceeded: If the queue is full or the wait limit passes
+        """
+        if not self.enabled:
+            return
+        
+        priority = current_priority() if priority is None else priority
+        labels = {"model": model, "priority": priority.name.lower()}
+        if max_wait is None:
+            max_wait = settings.LLM_RATE_MAX_WAIT_SECONDS
+        budget = remaining_budget()
+        if budget is not None:
+            max_wait = min(max_wait, budget)
+        
+        queue = self._queues.setdefault(model, [])
+        if len(queue) >= settings.LLM_RATE_QUEUE_SIZE:
+            metrics.increment("llm_rate_rejected_total", reason="queue_full", **labels)
+            raise RateLimitExceeded(f"Rate governor queue for {model} is full")
+        
+        entry = (int(priority), next(self._sequence))
+        heapq.heappush(queue, entry)
+        metrics.set_gauge("llm_rate_queue_depth", len(queue), model=model)
+        limits = self.limits_for(model)
+        reserve = settings.LLM_RATE_BACKGROUND_RESERVE if priority == Priority.BACKGROUND else 0.0
+        started = time.monotonic()
+        
+        try:
+            while True:
+                wait = self.POLL_INTERVAL
+                if queue[0] == entry:
+                    wait = await self._take(model, limits, tokens, reserve)
+                    if wait == 0:
+                        metrics.observe("llm_rate_wait_ms", (time.monotonic() - started) * 1000, **labels)
+                        return
+                
+                remaining = max_wait - (time.monotonic() - started)
+                if remaining <= 0:
+                    metrics.increment("llm_rate_rejected_total", reason="timeout", **labels)
+                    raise RateLimitExceeded(f"Timed out waiting for {model} quota")
+                await asyncio.sleep(min(wait, remaining, self.POLL_INTERVAL))
+        finally:
+            queue.remove(entry)
+            heapq.heapify(queue)
+            metrics.set_gauge("llm_rate_queue_depth", len(queue), model=model)
+    
+    async def try_acquire(
+        self,
+        model: str,
+        tokens: int,
+        reserve: float = 0.0
+    ) -> bool:
+        """Admit a call only if quota is available right now
+        
+        Never waits and never overtakes queued calls, so optional work (such
+        as hedged duplicates) cannot delay or crowd out required calls.
+        
+        Args:
+            model: Model name
+            tokens: Estimated tokens the call will consume
+            reserve: Fraction of each bucket that must be left over afterwards
+        
+        Returns:
+            True if the call was admitted
+        """
+        if not self.enabled:
+            return True
+        if self.is_busy(model):
+            return False
+        return await self._take(model, self.limits_for(model), tokens, reserve) == 0
+    
+    def is_busy(self, model: str) -> bool:
+        """Whether calls are queued waiting for the model's quota"""
+        return bool(self._queues.get(model))
+
+
+# Global rate governor instance
+rate_governor = RateGovernor()
@@ -0,0 +1,161 @@
+"""Deadline-aware retry policy for LLM calls"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional, Tuple
+import asyncio
+import random
+import time
+from app.core.config import settings
+from app.core.metrics import metrics
+
+try:
+    from google.api_core import exceptions as google_exceptions
+except ImportError:  # pragma: no cover - installed with google-generativeai
+    google_exceptions = None
+
+# Monotonic deadline for all LLM work in the current chat turn (None = unbounded)
+_turn_deadline: ContextVar[Optional[float]] = ContextVar("llm_turn_deadline", default=None)
+
+
+class LLMRateLimited(Exception):
+    """Provider-neutral error for a call rejected over quota (HTTP 429)"""
+
+
+class LLMUnavailable(Exception):
+    """Provider-neutral error for a transient provider failure (HTTP 5xx)"""
+
+
+def _retryable_exception_types() -> Tuple[Tuple[type, str], ...]:
+    """Exception types worth retrying, with the reason recorded in metrics"""
+    types = [
+        (LLMRateLimited, "rate_limited"),
+        (LLMUnavailable, "unavailable"),
+        (asyncio.TimeoutError, "timeout"),
+        (ConnectionError, "connection"),
+    ]
+    if google_exceptions is not None:
+        types = [
+            (google_exceptions.ResourceExhausted, "rate_limited"),
+            (google_exceptions.TooManyRequests, "rate_limited"),
+            (google_exceptions.ServiceUnavailable, "unavailable"),
+            (google_exceptions.InternalServerError, "server_error"),
+            (google_exceptions.DeadlineExceeded, "timeout"),
+            (google_exceptions.GatewayTimeout, "timeout"),
+        ] + types
+    return tuple(types)
+
+
+RETRYABLE_EXCEPTIONS = _retryable_exception_types()
+
+
+@contextmanager
+def turn_budget(seconds: Optional[float] = None, kind: str = "message") -> Iterator[None]:
+    """Bound the total time LLM calls may take within one chat turn
+    
+    Retries stop (and the caller falls back) once the budget is spent. The
+    turn's wall-clock duration is recorded as ``chat_turn_latency_ms``.
+    
+    Args:
+        seconds: Budget in seconds (defaults to settings.LLM_TURN_BUDGET_SECONDS)
+        kind: Turn kind label for the latency metric
+    """
+    budget = settings.LLM_TURN_BUDGET_SECONDS if seconds is None else seconds
+    started = time.monotonic()
+    token = _turn_deadline.set(started + budget)
+    try:
+        yield
+    finally:
+        try:
+            _turn_deadline.reset(token)
+        except ValueError:
+            # A streamed turn may be closed from a different context than it started in
+            _turn_deadline.set(None)
+        metrics.observe("chat_turn_latency_ms", (time.monotonic() - started) * 1000, kind=kind)
+
+
+def remaining_budget() -> Optional[float]:
+    """Seconds left in the current turn's budget, or None outside a turn"""
+    deadline = _turn_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+class RetryPolicy:
+    """Retry policy with per-attempt deadlines and decorrelated jitter
+    
+    Errors are classified by exception type; only rate limiting, transient
+    server errors and timeouts are retried. Backoff follows the
+    "decorrelated jitter" scheme (each delay is drawn between the base delay
+    and three times the previous one, capped), and no attempt or backoff is
+    started that the turn budget cannot accommodate.
+    """
+    
+    def __init__(
+        self,
+        max_attempts: int,
+        attempt_timeout: float,
+        base_delay: float,
+        max_delay: float
+    ):
+        """Initialize retry policy
+        
+        Args:
+            max_attempts: Maximum number of attempts per call
+            attempt_timeout: Deadline for a single attempt in seconds
+            base_delay: Minimum backoff in seconds
+            max_delay: Maximum backoff in seconds
+        """
+        self.max_attempts = max_attempts
+        self.attempt_timeout = attempt_timeout
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+    
+    @classmethod
+    def from_settings(cls) -> "RetryPolicy":
+        """Build the policy configured in settings"""
+        return cls(
+            max_attempts=settings.LLM_MAX_ATTEMPTS,
+            attempt_timeout=settings.LLM_ATTEMPT_TIMEOUT_SECONDS,
+            base_delay=settings.LLM_RETRY_BASE_DELAY_SECONDS,
+            max_delay=settings.LLM_RETRY_MAX_DELAY_SECONDS
+        )
+    
+    def classify(self, error: BaseException) -> Tuple[bool, str]:
+        """Decide whether an error is worth retrying
+        
+        Returns:
+            Tuple of (retryable, reason)
+        """
+        for exception_type, reason in RETRYABLE_EXCEPTIONS:
+            if isinstance(error, exception_type):
+                return True, reason
+        return False, type(error).__name__
+    
+    def attempt_deadline(self) -> Optional[float]:
+        """Timeout for the next attempt, or None if the turn budget is spent"""
+        remaining = remaining_budget()
+        if remaining is None:
+            return self.attempt_timeout
+        if remaining <= 0:
+            return None
+        return min(self.attempt_timeout, remaining)
+    
+    def next_delay(self, previous_delay: float) -> float:
+        """Decorrelated-jitter backoff following ``previous_delay``"""
+        upper = max(self.base_delay, previous_delay * 3)
+        return min(self.max_delay, random.uniform(self.base_delay, upper))
+    
+    def can_wait(self, delay: float) -> bool:
+        """Check the turn budget leaves room to back off and try again"""
+        remaining = remaining_budget()
+        return remaining is None or delay < remaining
+    
+    def record(self, template: Optional[str], decision: str, reason: str) -> None:
+        """Record a retry decision for the given template"""
+        metrics.increment(
+            "llm_retry_decisions_total",
+            template=template or "unknown",
+            decision=decision,
+            reason=reason
+        )
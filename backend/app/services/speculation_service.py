@@ -0,0 +1,205 @@
+"""Speculative question bank warming during the profile collection steps"""
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+import asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.metrics import metrics
+from app.models import Candidate
+from app.services.llm_service import llm_service
+from app.services.question_bank_service import (
+    QuestionBankService,
+    canonical_position,
+    experience_band,
+    stack_technologies
+)
+from app.services.retry_policy import turn_budget
+from app.services.tech_stack_parser import tech_stack_parser
+from app.services.usage_service import track_usage
+
+# Speculations kept in memory while their candidates finish the collection steps
+MAX_TRACKED_SPECULATIONS = 10000
+
+
+@dataclass
+class Speculation:
+    """What was predicted and warmed for one candidate"""
+    predicted: Set[str]  # Canonical technologies expected in the candidate's stack
+    warmed: Set[str] = field(default_factory=set)  # Technologies questions were generated for
+    tokens: int = 0  # Tokens spent generating them
+
+
+class SpeculativeWarmer:
+    """Warms the question bank for a candidate's likely stack before it is typed
+    
+    Once the desired position and years of experience are known, the
+    technologies the candidate is likely to list are predicted from the
+    position itself and from the stacks of earlier candidates who applied
+    for the same position. Questions are generated in the background for
+    the predicted technologies the bank holds too few questions for, so the
+    tech stack step can usually be assembled from the bank. Warming runs at
+    background priority and is skipped while calls are queued for the rate
+    limit quota. When the stack arrives, the prediction is scored for the
+    hit rate and wasted-work metrics.
+    """
+    
+    def __init__(self):
+        """Initialize an idle warmer"""
+        self._speculations: "OrderedDict[str, Speculation]" = OrderedDict()
+        self._warming: Set[str] = set()  # Position/band keys being warmed
+        self._tasks: Set[asyncio.Task] = set()
+    
+    def schedule(self, candidate: Candidate) -> None:
+        """Start warming for a candidate whose position and experience are known
+        
+        Args:
+            candidate: Candidate object
+        """
+        if not settings.SPECULATIVE_WARMING_ENABLED:
+            return
+        if candidate.years_experience is None or not candidate.desired_positions:
+            return
+        
+        position = candidate.desired_positions[0]
+        key = f"{canonical_position(position)}|{experience_band(candidate.years_experience)}"
+        if key in self._warming or len(self._tasks) >= settings.SPECULATIVE_MAX_CONCURRENT:
+            metrics.increment("speculative_warms_total", outcome="skipped_busy")
+            return
+        if llm_service.is_busy():
+            metrics.increment("speculative_warms_total", outcome="skipped_quota")
+            return
+        
+        self._warming.add(key)
+        task = asyncio.create_task(self._warm(candidate.id, position, candidate.years_experience, key))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _warm(self, candidate_id: str, position: str, years_exp: int, key: str) -> None:
+        """Predict the candidate's stack and fill the bank's gaps for it"""
+        try:
+            with turn_budget(kind="speculative"), track_usage() as usage:
+                async with AsyncSessionLocal() as db:
+                    predicted = await self.predict(db, position, years_exp)
+                    counts = await QuestionBankService(db).count_by_technology(predicted, years_exp)
+                thin = {
+                    technology: label for technology, label in predicted.items()
+                    if counts.get(technology, 0) < settings.SPECULATIVE_MIN_BANK_QUESTIONS
+                }
+                
+                added = 0
+                if thin:
+                    # No session is held during generation; the bank stores the questions in its own
+                    added = await llm_service.warm_question_bank(
+                        self._categorize(thin),
+                        years_exp,
+                        position,
+                        len(thin) * settings.SPECULATIVE_QUESTIONS_PER_TECHNOLOGY,
+                        QuestionBankService()
+                    )
+            
+            tokens = sum(call.total_tokens for call in usage)
+            self._remember(candidate_id, Speculation(set(predicted), set(thin), tokens))
+            metrics.increment("speculative_warms_total", outcome="warmed" if thin else "covered")
+            metrics.increment("speculative_questions_generated_total", added)
+            metrics.increment("speculative_tokens_total", tokens)
+        except Exception as e:
+            metrics.increment("speculative_warms_total", outcome="failed")
+            print(f"Speculative warming error: {str(e)}")
+        finally:
+            self._warming.discard(key)
+    
+    async def predict(self, db: AsyncSession, position: str, years_exp: int) -> Dict[str, str]:
+        """Technologies a candidate for a position is likely to list
+        
+        Technologies named in the position come first, then the most common
+        ones among recent candidates for the same position (preferring the
+        same experience band), then the most common ones overall.
+        
+        Args:
+            db: Async database session
+            position: Desired position
+            years_exp: Years of experience
+        
+        Returns:
+            Canonical technology key -> display name, most likely first
+        """
+        limit = settings.SPECULATIVE_TECHNOLOGIES
+        technologies = stack_technologies(tech_stack_parser.parse(position).tech_stack)
+        
+        result = await db.execute(
+            select(Candidate.desired_positions, Candidate.years_experience, Candidate.tech_stack)
+            .order_by(Candidate.created_at.desc())
+            .limit(settings.SPECULATIVE_HISTORY_SIZE)
+        )
+        wanted_position = canonical_position(position)
+        band = experience_band(years_exp)
+        same_position: Counter = Counter()
+        overall: Counter = Counter()
+        labels: Dict[str, str] = {}
+        for positions, years, tech_stack in result.all():
+            stack = stack_technologies(tech_stack) if isinstance(tech_stack, dict) else {}
+            for technology, label in stack.items():
+                labels.setdefault(technology, label)
+            overall.update(stack)
+            if wanted_position in {canonical_position(p) for p in positions or [] if isinstance(p, str)}:
+                # Candidates in the same band count double
+                same_position.update({technology: 2 if experience_band(years) == band else 1 for technology in stack})
+        
+        for counter in (same_position, overall):
+            for technology, _ in counter.most_common():
+                if len(technologies) >= limit:
+                    break
+                technologies.setdefault(technology, labels[technology])
+        return dict(list(technologies.items())[:limit])
+    
+    @staticmethod
+    def _categorize(technologies: Dict[str, str]) -> Dict[str, List[str]]:
+        """Categorized stack of technologies, using the taxonomy's categories"""
+        tech_stack: Dict[str, List[str]] = {}
+        for technology, label in technologies.items():
+            skill = tech_stack_parser.skills.get(technology)
+            tech_stack.setdefault(skill.category if skill else "tools", []).append(label)
+        return tech_stack
+    
+    def _remember(self, candidate_id: str, speculation: Speculation) -> None:
+        """Keep a candidate's speculation until their stack arrives"""
+        self._speculations[candidate_id] = speculation
+        self._speculations.move_to_end(candidate_id)
+        while len(self._speculations) > MAX_TRACKED_SPECULATIONS:
+            self._speculations.popitem(last=False)
+    
+    def resolve(self, candidate_id: str, tech_stack: Optional[Dict[str, List[str]]]) -> None:
+        """Score a candidate's speculation against the stack they listed
+        
+        Predicted technologies in the stack are hits and the rest misses.
+        Tokens spent on warmed technologies the candidate did not list are
+        counted as wasted, although their questions stay in the bank for
+        later candidates.
+        
+        Args:
+            candidate_id: Candidate ID
+            tech_stack: Categorized tech stack the candidate listed
+        """
+        speculation = self._speculations.pop(candidate_id, None)
+        if speculation is None:
+            return
+        
+        actual = set(stack_technologies(tech_stack or {}))
+        metrics.increment("speculative_predictions_total", len(speculation.predicted & actual), outcome="hit")
+        metrics.increment("speculative_predictions_total", len(speculation.predicted - actual), outcome="miss")
+        
+        if speculation.warmed:
+            wasted = speculation.warmed - actual
+            metrics.increment("speculative_warmed_technologies_total", len(speculation.warmed & actual), outcome="used")
+            metrics.increment("speculative_warmed_technologies_total", len(wasted), outcome="wasted")
+            metrics.increment(
+                "speculative_wasted_tokens_total",
+                round(speculation.tokens * len(wasted) / len(speculation.warmed))
+            )
+
+
+# Global speculative warmer instance
+speculative_warmer = SpeculativeWarmer()
@@ -0,0 +1,169 @@
+"""JSON parsing and schema validation for structured LLM output"""
+from typing import Any, Dict, List, Tuple
+import json
+import re
+
+# Markdown code fences models sometimes wrap JSON in
+CODE_FENCE_PATTERN = re.compile(r"^\s*```(?:json)?\s*(.*?)\s*```\s*$", re.DOTALL | re.IGNORECASE)
+
+JSON_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+}
+
+
+def validate(instance: Any, schema: Dict[str, Any], path: str = "$") -> List[str]:
+    """Validate an instance against a JSON schema subset
+    
+    Supports ``type``, ``properties``, ``required``, ``additionalProperties``
+    (as a schema), ``items``, ``minItems``, ``maxItems``, ``minLength`` and
+    ``enum`` - enough for the response schemas in this module's callers.
+    
+    Args:
+        instance: Parsed JSON value
+        schema: JSON schema
+        path: JSON path of the instance, used in error messages
+    
+    Returns:
+        List of validation errors (empty when valid)
+    """
+    expected = schema.get("type")
+    if expected:
+        python_type = JSON_TYPES[expected]
+        if not isinstance(instance, python_type) or (expected != "boolean" and isinstance(instance, bool)):
+            return [f"{path}: expected {expected}, got {type(instance).__name__}"]
+    
+    errors = []
+    if "enum" in schema and instance not in schema["enum"]:
+        errors.append(f"{path}: {instance!r} is not one of {schema['enum']}")
+    if isinstance(instance, str) and len(instance.strip()) < schema.get("minLength", 0):
+        errors.append(f"{path}: string is shorter than {schema['minLength']} characters")
+    
+    if isinstance(instance, dict):
+        for key in schema.get("required", []):
+            if key not in instance:
+                errors.append(f"{path}: missing required property '{key}'")
+        properties = schema.get("properties", {})
+        for key, value in instance.items():
+            if key in properties:
+                errors.extend(validate(value, properties[key], f"{path}.{key}"))
+            elif isinstance(schema.get("additionalProperties"), dict):
+                errors.extend(validate(value, schema["additionalProperties"], f"{path}.{key}"))
+    
+    if isinstance(instance, list):
+        if len(instance) < schema.get("minItems", 0):
+            errors.append(f"{path}: expected at least {schema['minItems']} items, got {len(instance)}")
+        if "maxItems" in schema and len(instance) > schema["maxItems"]:
+            errors.append(f"{path}: expected at most {schema['maxItems']} items, got {len(instance)}")
+        if "items" in schema:
+            for index, item in enumerate(instance):
+                errors.extend(validate(item, schema["items"], f"{path}[{index}]"))
+    
+    return errors
+
+
+def load(text: str, schema: Dict[str, Any]) -> Tuple[Any, List[str]]:
+    """Parse a model response as JSON and validate it
+    
+    Args:
+        text: Raw response text
+        schema: JSON schema the response must satisfy
+    
+    Returns:
+        Tuple of (parsed value or None, validation errors)
+    """
+    fenced = CODE_FENCE_PATTERN.match(text)
+    if fenced:
+        text = fenced.group(1)
+    
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        return None, [f"$: invalid JSON ({e.msg} at line {e.lineno} column {e.colno})"]
+    return data, validate(data, schema)
+
+
+class JSONArrayStream:
+    """Incremental parser for a JSON array arriving in chunks
+    
+    ``feed`` returns each top-level element as soon as its closing character
+    arrives, so callers can act on the first element while the rest is still
+    being generated. Text before the opening bracket (e.g. a code fence) and
+    after the closing bracket is ignored; elements that are not valid JSON
+    are skipped.
+    """
+    
+    def __init__(self):
+        """Initialize parser state"""
+        self._element: List[str] = []  # Characters of the element being read
+        self._depth = 0  # 1 while directly inside the top-level array
+        self._in_string = False
+        self._escaped = False
+        self._started = False
+        self._finished = False
+    
+    def feed(self, chunk: str) -> List[Any]:
+        """Consume a chunk of text
+        
+        Args:
+            chunk: Next piece of the streamed response
+        
+        Returns:
+            Elements completed by this chunk, in order
+        """
+        completed = []
+        for char in chunk:
+            if self._finished:
+                break
+            if not self._started:
+                if char == "[":
+                    self._started = True
+                    self._depth = 1
+                continue
+            
+            if self._in_string:
+                self._element.append(char)
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+            
+            if char == '"':
+                self._in_string = True
+                self._element.append(char)
+            elif char in "[{":
+                self._depth += 1
+                self._element.append(char)
+            elif char in "]}":
+                self._depth -= 1
+                if self._depth == 0:
+                    # End of the array; a trailing scalar element ends here too
+                    self._finished = True
+                    self._flush(completed)
+                    continue
+                self._element.append(char)
+                if self._depth == 1:
+                    self._flush(completed)
+            elif char == "," and self._depth == 1:
+                self._flush(completed)
+            elif self._depth > 1 or not char.isspace():
+                self._element.append(char)
+        return completed
+    
+    def _flush(self, completed: List[Any]) -> None:
+        """Parse the buffered element, if any, into ``completed``"""
+        text = "".join(self._element).strip()
+        self._element = []
+        if not text:
+            return
+        try:
+            completed.append(json.loads(text))
+        except json.JSONDecodeError:
+            pass
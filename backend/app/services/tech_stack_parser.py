@@ -0,0 +1,168 @@
+"""Local tech stack parser driven by the skill taxonomy"""
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import json
+import re
+
+TAXONOMY_PATH = Path(__file__).resolve().parent.parent / "data" / "skill_taxonomy.json"
+
+# Tokens keep the characters that are part of technology names (c++, c#, .net, node.js)
+TOKEN_PATTERN = re.compile(r"\.?[a-z0-9][a-z0-9+#.]*")
+
+# Separators between the items of a listed tech stack
+SEGMENT_PATTERN = re.compile(r"[,;\n|&()]|\band\b|\bor\b", re.IGNORECASE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lower-cased technology tokens"""
+    return [token.rstrip(".") for token in TOKEN_PATTERN.findall(text.casefold()) if token.rstrip(".")]
+
+
+@dataclass
+class Skill:
+    """A technology from the taxonomy"""
+    id: str
+    name: str
+    category: str
+
+
+@dataclass
+class ParsedTechStack:
+    """Result of parsing a tech stack description locally"""
+    tech_stack: Dict[str, List[str]]
+    skills: List[Skill] = field(default_factory=list)
+    unknown: List[str] = field(default_factory=list)  # Items the taxonomy did not recognize
+
+
+class TechStackParser:
+    """Single-pass, longest-match trie matcher over taxonomy aliases
+    
+    Every alias is tokenized the same way as the input and inserted into a
+    token trie, so matching respects word boundaries ("go" never matches
+    inside "django", "java" never inside "javascript") and multi-word
+    aliases such as "spring boot" win over their prefixes.
+    """
+    
+    def __init__(self, taxonomy_path: Path = TAXONOMY_PATH):
+        """Load the taxonomy and build the alias trie
+        
+        Args:
+            taxonomy_path: Path to the skill taxonomy JSON file
+        """
+        with open(taxonomy_path, encoding="utf-8") as f:
+            taxonomy = json.load(f)
+        
+        self.version: str = taxonomy["version"]
+        self.categories: List[str] = taxonomy["categories"]
+        self.stopwords = set(taxonomy.get("stopwords", []))
+        self.skills: Dict[str, Skill] = {}
+        self._trie: Dict = {}
+        
+        for entry in taxonomy["skills"]:
+            skill = Skill(id=entry["id"], name=entry["name"], category=entry["category"])
+            self.skills[skill.id] = skill
+            for alias in [skill.name, *entry.get("aliases", [])]:
+                self._insert(tokenize(alias), skill)
+    
+    def _insert(self, tokens: List[str], skill: Skill) -> None:
+        """Insert an alias token sequence into the trie"""
+        if not tokens:
+            return
+        node = self._trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node.setdefault(None, skill)  # First alias registered for a sequence wins
+    
+    def _match(self, tokens: List[str]) -> Tuple[List[Skill], List[List[str]]]:
+        """Scan tokens once, taking the longest alias match at each position
+        
+        Returns:
+            Tuple of (matched skills in order, runs of consecutive unmatched tokens)
+        """
+        skills: List[Skill] = []
+        unmatched: List[List[str]] = []
+        position = 0
+        run: List[str] = []
+        while position < len(tokens):
+            node = self._trie
+            best: Optional[Tuple[int, Skill]] = None
+            cursor = position
+            while cursor < len(tokens) and tokens[cursor] in node:
+                node = node[tokens[cursor]]
+                cursor += 1
+                if None in node:
+                    best = (cursor, node[None])
+            
+            if best is None:
+                run.append(tokens[position])
+                position += 1
+            else:
+                if run:
+                    unmatched.append(run)
+                    run = []
+                position, skill = best
+                skills.append(skill)
+        if run:
+            unmatched.append(run)
+        return skills, unmatched
+    
+    def _leftover_spans(self, segment: str, runs: List[List[str]]) -> List[str]:
+        """Text of the unrecognized items in a segment, in their original casing
+        
+        Stopwords and bare numbers split an unmatched run into separate items.
+        """
+        spans = []
+        for run in runs:
+            words: List[str] = []
+            for token in [*run, None]:
+                if token is not None and token not in self.stopwords and not token.isdigit():
+                    words.append(token)
+                    continue
+                if words:
+                    pattern = r"(?<![a-z0-9])" + r"[^a-z0-9+#.]*".join(re.escape(word) for word in words) + r"(?![a-z0-9])"
+                    original = re.search(pattern, segment, re.IGNORECASE)
+                    spans.append(original.group(0) if original else " ".join(words))
+                    words = []
+        return spans
+    
+    def parse(self, tech_stack_raw: str) -> ParsedTechStack:
+        """Parse a free-text tech stack into taxonomy categories
+        
+        Args:
+            tech_stack_raw: Tech stack as typed by the candidate
+        
+        Returns:
+            Categorized stack plus any items the taxonomy did not recognize
+        """
+        tech_stack: Dict[str, List[str]] = {category: [] for category in self.categories}
+        found: List[Skill] = []
+        unknown: List[str] = []
+        
+        for segment in SEGMENT_PATTERN.split(tech_stack_raw or ""):
+            tokens = tokenize(segment)
+            skills, unmatched = self._match(tokens)
+            for skill in skills:
+                if skill not in found:
+                    found.append(skill)
+                    tech_stack.setdefault(skill.category, []).append(skill.name)
+            
+            leftover = self._leftover_spans(segment, unmatched)
+            if leftover and not skills:
+                # Nothing recognized: keep the item whole ("Apache Polars", not "Apache", "Polars")
+                unknown.append(segment.strip())
+            else:
+                unknown.extend(span for span in leftover if span not in unknown)
+        
+        return ParsedTechStack(tech_stack=tech_stack, skills=found, unknown=unknown)
+    
+    def lookup(self, name: str) -> Optional[Skill]:
+        """Resolve a single technology name (or alias) to its taxonomy skill"""
+        skills, unmatched = self._match(tokenize(name))
+        if len(skills) == 1 and not [t for run in unmatched for t in run if t not in self.stopwords]:
+            return skills[0]
+        return None
+
+
+# Global tech stack parser instance
+tech_stack_parser = TechStackParser()
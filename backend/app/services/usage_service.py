@@ -0,0 +1,151 @@
+"""Token usage accounting for LLM calls"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.metrics import metrics
+from app.models import LLMUsage
+
+
+@dataclass
+class LLMCallUsage:
+    """Token counts and latency of a single LLM call"""
+    template: str
+    model: str
+    prompt_tokens: int
+    output_tokens: int
+    latency_ms: float
+    
+    @property
+    def total_tokens(self) -> int:
+        """Prompt plus output tokens"""
+        return self.prompt_tokens + self.output_tokens
+
+
+# Calls made during the current chat turn (None outside a tracked turn)
+_turn_usage: ContextVar[Optional[List[LLMCallUsage]]] = ContextVar("llm_turn_usage", default=None)
+
+
+@contextmanager
+def track_usage() -> Iterator[List[LLMCallUsage]]:
+    """Collect the usage of every LLM call made in the enclosed block"""
+    calls: List[LLMCallUsage] = []
+    token = _turn_usage.set(calls)
+    try:
+        yield calls
+    finally:
+        try:
+            _turn_usage.reset(token)
+        except ValueError:
+            # A streamed turn may be closed from a different context than it started in
+            _turn_usage.set(None)
+
+
+def record_usage(usage: LLMCallUsage) -> None:
+    """Record an LLM call in metrics and in the current turn, if any"""
+    labels = {"template": usage.template, "model": usage.model}
+    metrics.increment("llm_calls_total", **labels)
+    metrics.increment("llm_tokens_total", usage.prompt_tokens, kind="prompt", **labels)
+    metrics.increment("llm_tokens_total", usage.output_tokens, kind="output", **labels)
+    metrics.observe("llm_call_latency_ms", usage.latency_ms, **labels)
+    
+    calls = _turn_usage.get()
+    if calls is not None:
+        calls.append(usage)
+
+
+def usage_from_response(response: Any, template: Optional[str], model: str, latency_ms: float) -> LLMCallUsage:
+    """Build a usage record from a provider result's or stream's token counts"""
+    return LLMCallUsage(
+        template=template or "unknown",
+        model=model,
+        prompt_tokens=getattr(response, "prompt_tokens", 0) or 0,
+        output_tokens=getattr(response, "output_tokens", 0) or 0,
+        latency_ms=latency_ms
+    )
+
+
+class UsageService:
+    """Service for persisting and rolling up LLM usage"""
+    
+    def __init__(self, db: AsyncSession):
+        """Initialize usage service
+        
+        Args:
+            db: Async database session
+        """
+        self.db = db
+    
+    def add(
+        self,
+        calls: List[LLMCallUsage],
+        conversation_id: Optional[str],
+        user_id: Optional[str],
+        message_id: Optional[str] = None
+    ) -> None:
+        """Add usage rows for a turn's calls to the session (committed by the caller)
+        
+        Args:
+            calls: Usage of the turn's LLM calls
+            conversation_id: Conversation the calls belong to
+            user_id: User the calls were made for
+            message_id: Assistant message the calls produced
+        """
+        for call in calls:
+            self.db.add(LLMUsage(
+                conversation_id=conversation_id,
+                user_id=user_id,
+                message_id=message_id,
+                template=call.template,
+                model=call.model,
+                prompt_tokens=call.prompt_tokens,
+                output_tokens=call.output_tokens,
+                total_tokens=call.total_tokens,
+                latency_ms=call.latency_ms
+            ))
+    
+    async def summarize(
+        self,
+        conversation_id: Optional[str] = None,
+        user_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Roll usage up overall and per prompt template
+        
+        Args:
+            conversation_id: Restrict to one conversation
+            user_id: Restrict to one user
+        
+        Returns:
+            Dictionary with overall totals and a per-template breakdown
+        """
+        query = select(
+            LLMUsage.template,
+            func.count(LLMUsage.id),
+            func.coalesce(func.sum(LLMUsage.prompt_tokens), 0),
+            func.coalesce(func.sum(LLMUsage.output_tokens), 0),
+            func.coalesce(func.sum(LLMUsage.latency_ms), 0.0)
+        ).group_by(LLMUsage.template)
+        if conversation_id is not None:
+            query = query.where(LLMUsage.conversation_id == conversation_id)
+        if user_id is not None:
+            query = query.where(LLMUsage.user_id == user_id)
+        
+        result = await self.db.execute(query)
+        by_template = {}
+        for template, calls, prompt_tokens, output_tokens, latency_ms in result.all():
+            by_template[template] = {
+                "calls": calls,
+                "prompt_tokens": int(prompt_tokens),
+                "output_tokens": int(output_tokens),
+                "total_tokens": int(prompt_tokens + output_tokens),
+                "latency_ms": round(float(latency_ms), 1)
+            }
+        
+        totals = {
+            key: sum(row[key] for row in by_template.values())
+            for key in ("calls", "prompt_tokens", "output_tokens", "total_tokens", "latency_ms")
+        }
+        totals["latency_ms"] = round(totals["latency_ms"], 1)
+        return {"totals": totals, "by_template": by_template}
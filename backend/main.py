@@ -6,7 +6,8 @@ from datetime import datetime
 import logging
 
 from app.core.config import settings
-from app.core.database import init_db
+from app.core.database import init_async_db
+from app.core.metrics import metrics
 from app.api import auth, chat, candidates
 from app.schemas import HealthResponse
 
@@ -73,10 +74,10 @@ async def health_check():
     """Health check endpoint"""
     try:
         # Check database connection
-        from app.core.database import engine
+        from app.core.database import async_engine
         from sqlalchemy import text
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
         db_status = "healthy"
     except Exception as e:
         logger.error(f"Database health check failed: {str(e)}")
@@ -100,18 +101,30 @@ async def health_check():
     )
 
 
+# Metrics
+@app.get("/metrics")
+async def get_metrics():
+    """Snapshot of this worker's application metrics"""
+    return metrics.snapshot()
+
+
 # Startup event
 @app.on_event("startup")
 async def startup_event():
     """Initialize application on startup"""
     logger.info("Starting TalentScout API...")
     
-    # Initialize database
-    try:
-        init_db()
-        logger.info("Database initialized successfully")
-    except Exception as e:
-        logger.error(f"Database initialization failed: {str(e)}")
+    # Bring the database schema up to date (or leave it to a deploy step running `alembic upgrade head`)
+    if settings.DATABASE_AUTO_MIGRATE:
+        try:
+            await init_async_db()
+            logger.info("Database initialized successfully")
+        except Exception as e:
+            logger.error(f"Database initialization failed: {str(e)}")
+    
+    # Measure read replica lag (reads stay on the primary until a replica has been measured)
+    from app.core.replicas import replica_router
+    replica_router.start()
     
     # Initialize vector DB
     try:
@@ -121,6 +134,14 @@ async def startup_event():
     except Exception as e:
         logger.error(f"Vector DB initialization failed: {str(e)}")
     
+    # Keep the greeting/closing message pool filled in the background
+    from app.services.message_pool_service import message_pool
+    message_pool.start()
+    
+    # Run technical question jobs, resuming any left behind by a previous run
+    from app.services.question_job_service import question_jobs
+    question_jobs.start()
+    
     logger.info("TalentScout API started successfully!")
 
 
@@ -129,6 +150,15 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("Shutting down TalentScout API...")
+    
+    from app.services.message_pool_service import message_pool
+    await message_pool.stop()
+    
+    from app.services.question_job_service import question_jobs
+    await question_jobs.stop()
+    
+    from app.core.replicas import replica_router
+    await replica_router.stop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,97 @@
+"""Initial schema
+
+The tables as ``Base.metadata.create_all`` created them before migrations
+were introduced. Databases created that way are stamped with this revision
+on startup (see ``app.core.database.run_migrations``) rather than re-created.
+
+Revision ID: 0001_initial_schema
+Revises:
+Create Date: 2026-10-16 09:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001_initial_schema"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("google_id", sa.String(), nullable=True),
+        sa.Column("full_name", sa.String(), nullable=True),
+        sa.Column("profile_picture", sa.String(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("is_verified", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_login", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_index("ix_users_google_id", "users", ["google_id"], unique=True)
+    
+    op.create_table(
+        "candidates",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("full_name", sa.String(), nullable=True),
+        sa.Column("email", sa.String(), nullable=True),
+        sa.Column("phone", sa.String(), nullable=True),
+        sa.Column("years_experience", sa.Integer(), nullable=True),
+        sa.Column("desired_positions", sa.JSON(), nullable=True),
+        sa.Column("current_location", sa.String(), nullable=True),
+        sa.Column("tech_stack", sa.JSON(), nullable=True),
+        sa.Column("tech_stack_raw", sa.Text(), nullable=True),
+        sa.Column("technical_questions", sa.JSON(), nullable=True),
+        sa.Column("answers", sa.JSON(), nullable=True),
+        sa.Column("screening_status", sa.String(), nullable=True),
+        sa.Column("screening_completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id")
+    )
+    
+    op.create_table(
+        "conversations",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("title", sa.String(), nullable=True),
+        sa.Column(
+            "status",
+            sa.Enum("ACTIVE", "COMPLETED", "ABANDONED", name="conversationstatus"),
+            nullable=True
+        ),
+        sa.Column("started_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("ended_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("message_count", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id")
+    )
+    
+    op.create_table(
+        "messages",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("conversation_id", sa.String(), nullable=False),
+        sa.Column("role", sa.Enum("USER", "ASSISTANT", "SYSTEM", name="messagerole"), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("tokens_used", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(["conversation_id"], ["conversations.id"]),
+        sa.PrimaryKeyConstraint("id")
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("messages")
+    op.drop_table("conversations")
+    op.drop_table("candidates")
+    op.drop_table("users")
+    for enum_name in ("messagerole", "conversationstatus"):
+        sa.Enum(name=enum_name).drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,126 @@
+"""Tables and columns added on top of the initial schema
+
+- question_bank: reusable technical questions
+- message_pool: pre-generated greeting and closing variants
+- llm_usage: per-call token and latency accounting
+- question_jobs: background technical question generation
+- conversations.summary / summary_message_count: rolling history summary
+
+Databases created by ``create_all`` after some of these were added to the
+models are stamped with the initial revision like any other pre-migration
+database, so tables and columns that already exist are skipped.
+
+Revision ID: 0002_screening_tables
+Revises: 0001_initial_schema
+Create Date: 2026-10-16 09:15:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002_screening_tables"
+down_revision = "0001_initial_schema"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    
+    conversation_columns = {column["name"] for column in inspector.get_columns("conversations")}
+    if "summary" not in conversation_columns:
+        op.add_column("conversations", sa.Column("summary", sa.Text(), nullable=True))
+    if "summary_message_count" not in conversation_columns:
+        op.add_column("conversations", sa.Column("summary_message_count", sa.Integer(), nullable=True))
+    
+    if "question_bank" not in tables:
+        op.create_table(
+            "question_bank",
+            sa.Column("id", sa.String(), nullable=False),
+            sa.Column("technology", sa.String(), nullable=False),
+            sa.Column("experience_band", sa.String(), nullable=False),
+            sa.Column("difficulty", sa.String(), nullable=False),
+            sa.Column("position", sa.String(), nullable=True),
+            sa.Column("technology_label", sa.String(), nullable=False),
+            sa.Column("question", sa.Text(), nullable=False),
+            sa.Column("source", sa.String(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.PrimaryKeyConstraint("id")
+        )
+        op.create_index(
+            "ix_question_bank_lookup",
+            "question_bank",
+            ["technology", "experience_band", "difficulty"]
+        )
+    
+    if "message_pool" not in tables:
+        op.create_table(
+            "message_pool",
+            sa.Column("id", sa.String(), nullable=False),
+            sa.Column("kind", sa.String(), nullable=False),
+            sa.Column("content", sa.Text(), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.PrimaryKeyConstraint("id")
+        )
+        op.create_index("ix_message_pool_kind_created", "message_pool", ["kind", "created_at"])
+    
+    if "llm_usage" not in tables:
+        op.create_table(
+            "llm_usage",
+            sa.Column("id", sa.String(), nullable=False),
+            sa.Column("conversation_id", sa.String(), nullable=True),
+            sa.Column("user_id", sa.String(), nullable=True),
+            sa.Column("message_id", sa.String(), nullable=True),
+            sa.Column("template", sa.String(), nullable=False),
+            sa.Column("model", sa.String(), nullable=False),
+            sa.Column("prompt_tokens", sa.Integer(), nullable=True),
+            sa.Column("output_tokens", sa.Integer(), nullable=True),
+            sa.Column("total_tokens", sa.Integer(), nullable=True),
+            sa.Column("latency_ms", sa.Float(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.ForeignKeyConstraint(["conversation_id"], ["conversations.id"]),
+            sa.ForeignKeyConstraint(["message_id"], ["messages.id"]),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("id")
+        )
+        op.create_index("ix_llm_usage_conversation", "llm_usage", ["conversation_id"])
+        op.create_index("ix_llm_usage_user", "llm_usage", ["user_id"])
+    
+    if "question_jobs" not in tables:
+        op.create_table(
+            "question_jobs",
+            sa.Column("id", sa.String(), nullable=False),
+            sa.Column("candidate_id", sa.String(), nullable=False),
+            sa.Column("conversation_id", sa.String(), nullable=False),
+            sa.Column("user_id", sa.String(), nullable=False),
+            sa.Column("tech_stack_raw", sa.Text(), nullable=False),
+            sa.Column(
+                "status",
+                sa.Enum("PENDING", "RUNNING", "COMPLETED", "FAILED", name="questionjobstatus"),
+                nullable=False
+            ),
+            sa.Column("attempts", sa.Integer(), nullable=False),
+            sa.Column("error", sa.Text(), nullable=True),
+            sa.Column("message_id", sa.String(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(["candidate_id"], ["candidates.id"]),
+            sa.ForeignKeyConstraint(["conversation_id"], ["conversations.id"]),
+            sa.ForeignKeyConstraint(["message_id"], ["messages.id"]),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("id")
+        )
+        op.create_index("ix_question_jobs_status_started", "question_jobs", ["status", "started_at"])
+        op.create_index("ix_question_jobs_conversation_created", "question_jobs", ["conversation_id", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("question_jobs")
+    op.drop_table("llm_usage")
+    op.drop_table("message_pool")
+    op.drop_table("question_bank")
+    sa.Enum(name="questionjobstatus").drop(op.get_bind(), checkfirst=True)
+    with op.batch_alter_table("conversations") as batch_op:
+        batch_op.drop_column("summary_message_count")
+        batch_op.drop_column("summary")
@@ -0,0 +1,31 @@
+"""Composite indexes for the chat hot paths
+
+- messages (conversation_id, created_at): the recent-history window read on
+  every turn and the message listing, both ordered by created_at
+- conversations (user_id, started_at): the user's conversation list, newest
+  first (a backward index scan serves the DESC order)
+- candidates (created_at): the recent-candidates window used to predict
+  tech stacks for speculative warming
+
+Revision ID: 0003_hot_path_indexes
+Revises: 0002_screening_tables
+Create Date: 2026-10-16 09:30:00
+"""
+from alembic import op
+
+revision = "0003_hot_path_indexes"
+down_revision = "0002_screening_tables"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_messages_conversation_created", "messages", ["conversation_id", "created_at"])
+    op.create_index("ix_conversations_user_started", "conversations", ["user_id", "started_at"])
+    op.create_index("ix_candidates_created", "candidates", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_candidates_created", table_name="candidates")
+    op.drop_index("ix_conversations_user_started", table_name="conversations")
+    op.drop_index("ix_messages_conversation_created", table_name="messages")
@@ -0,0 +1,30 @@
+"""Extend the listing indexes with the id tie-breaker for keyset pagination
+
+Conversation and message pages are ordered by (timestamp, id) and resumed
+with a row comparison on that pair; with id in the index the comparison
+is an index condition and no sort is needed.
+
+Revision ID: 0004_keyset_pagination_indexes
+Revises: 0003_hot_path_indexes
+Create Date: 2026-10-16 14:00:00
+"""
+from alembic import op
+
+revision = "0004_keyset_pagination_indexes"
+down_revision = "0003_hot_path_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index("ix_messages_conversation_created", table_name="messages")
+    op.create_index("ix_messages_conversation_created", "messages", ["conversation_id", "created_at", "id"])
+    op.drop_index("ix_conversations_user_started", table_name="conversations")
+    op.create_index("ix_conversations_user_started", "conversations", ["user_id", "started_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_conversations_user_started", table_name="conversations")
+    op.create_index("ix_conversations_user_started", "conversations", ["user_id", "started_at"])
+    op.drop_index("ix_messages_conversation_created", table_name="messages")
+    op.create_index("ix_messages_conversation_created", "messages", ["conversation_id", "created_at"])
@@ -0,0 +1,28 @@
+"""Shared test configuration: an offline app on a throwaway SQLite database"""
+import os
+import tempfile
+
+# Settings are read on import, so configure the app before anything imports it
+_workdir = tempfile.mkdtemp(prefix="talentscout-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_workdir}/test.db"
+os.environ["CHROMA_PERSIST_DIRECTORY"] = os.path.join(_workdir, "chromadb")
+os.environ["LLM_PROVIDER"] = "fake"
+os.environ["FAKE_LLM_LATENCY_MS"] = "0"
+os.environ["LLM_RATE_LIMIT_ENABLED"] = "false"
+
+import pytest
+from app.core.database import AsyncSessionLocal, Base, async_engine
+
+
+@pytest.fixture
+async def db():
+    """Async session on freshly created tables"""
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    
+    async with AsyncSessionLocal() as session:
+        yield session
+    
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await async_engine.dispose()
@@ -0,0 +1,44 @@
+"""Tests for the database work done by one chat turn"""
+from contextlib import contextmanager
+import pytest
+from app.core.database import count_statements
+from app.models import Message, User
+from app.services import chat_service as chat_module
+from app.services.chat_service import ChatService
+from sqlalchemy import func, select
+
+
+@pytest.fixture
+def turn_counts(monkeypatch):
+    """Statement counts of the turns run by ChatService, in order"""
+    counts = []
+    
+    @contextmanager
+    def recording(kind):
+        with count_statements(kind) as count:
+            yield count
+        counts.append(count)
+    
+    monkeypatch.setattr(chat_module, "count_statements", recording)
+    # Conversation context goes to the vector store after the commit; keep it out of the test
+    monkeypatch.setattr(chat_module.vector_db_service, "store_conversation_context", lambda *args: None)
+    return counts
+
+
+async def test_collection_turn_is_one_unit_of_work(db, turn_counts):
+    user = User(id="user-1", email="jane@example.com")
+    db.add(user)
+    await db.commit()
+    conversation, _ = await ChatService(db).start_conversation(user.id)
+    
+    response = await ChatService(db).process_message(conversation.id, "Jane Doe", user.id)
+    
+    assert response.startswith("Nice to meet you, Jane Doe")
+    start, turn = turn_counts
+    assert (start.statements, start.commits) == (2, 1)
+    # Load conversation and candidate, read history, insert candidate and
+    # both messages, bump message_count; then a single commit
+    assert (turn.statements, turn.commits) == (5, 1)
+    
+    stored = await db.scalar(select(func.count()).select_from(Message).where(Message.conversation_id == conversation.id))
+    assert stored == conversation.message_count == 3
@@ -0,0 +1,74 @@
+"""Tests for local screening field extraction"""
+import pytest
+from app.services.field_extraction import (
+    extract_email,
+    extract_field,
+    extract_name,
+    extract_phone,
+    extract_years_experience
+)
+
+
+@pytest.mark.parametrize("text, years", [
+    ("5", 5),
+    ("5+ yrs", 5),
+    ("3 to 5 years", 3),
+    ("18 months", 1),
+    ("two years", 2),
+    ("six months", 0),
+    ("eighteen months", 1),
+    ("fresher", 0),
+    ("less than a year", 0),
+])
+def test_years_experience(text, years):
+    result = extract_years_experience(text)
+    
+    assert result.is_valid
+    assert result.value == years
+
+
+@pytest.mark.parametrize("text", ["lots", "", "100 years"])
+def test_years_experience_rejects_unusable_answers(text):
+    result = extract_years_experience(text)
+    
+    assert not result.is_valid
+    assert result.message
+
+
+@pytest.mark.parametrize("text, name", [
+    ("jane doe", "Jane Doe"),
+    ("Hi, my name is Jane Doe", "Jane Doe"),
+    ("I'm José Álvarez", "José Álvarez"),
+    ("Anna-Lena O'Neil", "Anna-Lena O'Neil"),
+    ("McDonald", "McDonald"),
+])
+def test_name(text, name):
+    result = extract_name(text)
+    
+    assert result.is_valid
+    assert result.value == name
+
+
+@pytest.mark.parametrize("text", ["hi", "Hello there!", "hey", "ok thanks", "my name is", "r2d2", ""])
+def test_name_rejects_greetings_and_filler(text):
+    assert not extract_name(text).is_valid
+
+
+def test_name_can_require_first_and_last_name():
+    assert not extract_name("Jane", require_full_name=True).is_valid
+    assert extract_name("Jane Doe", require_full_name=True).is_valid
+
+
+def test_email_is_found_and_normalized():
+    assert extract_email("it's Jane.Doe@Example.COM.").value == "Jane.Doe@example.com"
+    assert not extract_email("jane at example dot com").is_valid
+
+
+def test_phone_is_normalized_to_e164():
+    assert extract_phone("+1 415 555 2671").value == "+14155552671"
+    assert extract_phone("(415) 555-2671", "US").value == "+14155552671"
+    assert not extract_phone("call me maybe").is_valid
+
+
+def test_extract_field_dispatches_by_name():
+    assert extract_field("location", "  Berlin,   Germany ").value == "Berlin, Germany"
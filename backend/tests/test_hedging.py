@@ -0,0 +1,85 @@
+"""Tests for hedged LLM requests"""
+import asyncio
+import gc
+import pytest
+from app.services.hedging import Hedger
+
+
+def primed_hedger():
+    """Hedger that hedges "chat" calls after 50 ms"""
+    hedger = Hedger(True, ["chat"], percentile=0.5, budget=1.0, min_samples=1, min_delay=0.05)
+    hedger.observe("chat", 0.05)
+    return hedger
+
+
+async def always_admit():
+    return True
+
+
+def requests(*behaviours):
+    """Call factory running the given coroutine functions in turn"""
+    queue = list(behaviours)
+    return lambda: queue.pop(0)()
+
+
+async def test_losing_result_is_released():
+    released = []
+    
+    async def slow_primary():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            return "late"  # Finished anyway, e.g. the response arrived while being cancelled
+        return "primary"
+    
+    async def fast_hedge():
+        return "hedge"
+    
+    async def release(result):
+        released.append(result)
+    
+    result = await primed_hedger().run(
+        "chat", requests(slow_primary, fast_hedge), 1.0, always_admit, release=release
+    )
+    
+    assert result == "hedge"
+    assert released == ["late"]
+
+
+async def test_losing_error_is_retrieved():
+    loop = asyncio.get_running_loop()
+    unhandled = []
+    loop.set_exception_handler(lambda loop, context: unhandled.append(context))
+    
+    async def slow_primary():
+        await asyncio.sleep(0.2)
+        return "primary"
+    
+    async def failing_hedge():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            raise RuntimeError("connection reset")
+    
+    hedger = primed_hedger()
+    hedger.min_delay = 0.01
+    result = await hedger.run("chat", requests(slow_primary, failing_hedge), 1.0, always_admit)
+    
+    assert result == "primary"
+    await asyncio.sleep(0)
+    gc.collect()  # "Task exception was never retrieved" is reported when the task is collected
+    assert unhandled == []
+
+
+async def test_timeout_cancels_every_request():
+    started = []
+    
+    async def hang():
+        started.append(asyncio.current_task())
+        await asyncio.sleep(5)
+    
+    with pytest.raises(asyncio.TimeoutError):
+        await primed_hedger().run("chat", requests(hang, hang), 0.2, always_admit)
+    
+    assert len(started) == 2
+    assert all(task.cancelled() for task in started)
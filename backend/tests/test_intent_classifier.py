@@ -0,0 +1,41 @@
+"""Tests for local intent classification"""
+import pytest
+from app.services.intent_classifier import Intent, intent_classifier
+
+
+@pytest.mark.parametrize("message, step, intent", [
+    ("bye", None, Intent.END),
+    ("thanks, bye!", "name", Intent.END),
+    ("ok, see you later", None, Intent.END),
+    ("that's all, thank you", None, Intent.END),
+    ("I'm done", None, Intent.END),
+    ("what's the weather like?", None, Intent.OFF_TOPIC),
+    ("tell me a joke", None, Intent.OFF_TOPIC),
+    ("how does this work?", "email", Intent.INFO),
+    ("what is the salary?", None, Intent.INFO),
+])
+def test_classifies_non_answers(message, step, intent):
+    assert intent_classifier.classify(message, step).intent == intent
+
+
+@pytest.mark.parametrize("message, step", [
+    ("I'm done with React", None),
+    ("stop words in NLP pipelines", None),
+    ("I work on the backend", None),
+    ("I build backends in Python and Go", None),
+    ("Python, Django", "tech_stack"),
+    ("Jane Doe", "name"),
+    ("Goodbye Street 5", "location"),
+    ("Bye Bye Bakery, Main Street", "location"),
+    ("", None),
+])
+def test_answers_are_not_mistaken_for_other_intents(message, step):
+    assert intent_classifier.classify(message, step).intent == Intent.ANSWER
+
+
+def test_decision_reports_matched_phrases():
+    decision = intent_classifier.classify("ok, end the chat please")
+    
+    assert decision.intent == Intent.END
+    assert decision.matched == ["end the chat"]
+    assert decision.scores[Intent.END] > decision.scores[Intent.ANSWER]
@@ -0,0 +1,115 @@
+"""Alembic migrations from an empty database and from the pre-migration schema"""
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+import sqlalchemy as sa
+import pytest
+from app.core.database import Base, run_migrations
+import app.models  # noqa: F401 - registers every table on Base.metadata
+
+
+def baseline_metadata() -> sa.MetaData:
+    """The tables as ``create_all`` built them before migrations existed"""
+    metadata = sa.MetaData()
+    sa.Table(
+        "users", metadata,
+        sa.Column("id", sa.String, primary_key=True),
+        sa.Column("email", sa.String, unique=True, index=True, nullable=False),
+        sa.Column("google_id", sa.String, unique=True, index=True, nullable=True),
+        sa.Column("full_name", sa.String),
+        sa.Column("profile_picture", sa.String),
+        sa.Column("is_active", sa.Boolean),
+        sa.Column("is_verified", sa.Boolean),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+        sa.Column("last_login", sa.DateTime(timezone=True))
+    )
+    sa.Table(
+        "candidates", metadata,
+        sa.Column("id", sa.String, primary_key=True),
+        sa.Column("user_id", sa.String, sa.ForeignKey("users.id"), unique=True, nullable=False),
+        sa.Column("full_name", sa.String),
+        sa.Column("email", sa.String),
+        sa.Column("phone", sa.String),
+        sa.Column("years_experience", sa.Integer),
+        sa.Column("desired_positions", sa.JSON),
+        sa.Column("current_location", sa.String),
+        sa.Column("tech_stack", sa.JSON),
+        sa.Column("tech_stack_raw", sa.Text),
+        sa.Column("technical_questions", sa.JSON),
+        sa.Column("answers", sa.JSON),
+        sa.Column("screening_status", sa.String),
+        sa.Column("screening_completed_at", sa.DateTime(timezone=True)),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True))
+    )
+    sa.Table(
+        "conversations", metadata,
+        sa.Column("id", sa.String, primary_key=True),
+        sa.Column("user_id", sa.String, sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("title", sa.String),
+        sa.Column("status", sa.Enum("ACTIVE", "COMPLETED", "ABANDONED", name="conversationstatus")),
+        sa.Column("started_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("ended_at", sa.DateTime(timezone=True)),
+        sa.Column("message_count", sa.Integer)
+    )
+    sa.Table(
+        "messages", metadata,
+        sa.Column("id", sa.String, primary_key=True),
+        sa.Column("conversation_id", sa.String, sa.ForeignKey("conversations.id"), nullable=False),
+        sa.Column("role", sa.Enum("USER", "ASSISTANT", "SYSTEM", name="messagerole"), nullable=False),
+        sa.Column("content", sa.Text, nullable=False),
+        sa.Column("tokens_used", sa.Integer),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now())
+    )
+    return metadata
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Sync engine on an empty SQLite database"""
+    engine = sa.create_engine(f"sqlite:///{tmp_path}/migrations.db")
+    yield engine
+    engine.dispose()
+
+
+def assert_matches_models(engine) -> None:
+    """The migrated schema has every table, column and index the models declare"""
+    with engine.connect() as conn:
+        diff = compare_metadata(MigrationContext.configure(conn), Base.metadata)
+    assert diff == []
+
+
+def test_upgrade_empty_database(engine):
+    with engine.begin() as conn:
+        run_migrations(conn)
+    
+    assert_matches_models(engine)
+
+
+def test_upgrade_baseline_database(engine):
+    baseline = baseline_metadata()
+    with engine.begin() as conn:
+        baseline.create_all(conn)
+        conn.execute(baseline.tables["users"].insert().values(id="u1", email="a@example.com"))
+    
+    with engine.begin() as conn:
+        run_migrations(conn)
+    
+    assert_matches_models(engine)
+    with engine.connect() as conn:
+        assert conn.execute(sa.text("SELECT email FROM users")).scalar_one() == "a@example.com"
+        assert conn.execute(sa.text("SELECT version_num FROM alembic_version")).scalar_one() == "0004_keyset_pagination_indexes"
+
+
+def test_upgrade_database_created_with_later_tables(engine):
+    """A pre-migration database that already had some of the newer tables"""
+    baseline = baseline_metadata()
+    with engine.begin() as conn:
+        baseline.create_all(conn)
+        Base.metadata.tables["question_bank"].create(conn)
+        Base.metadata.tables["message_pool"].create(conn)
+    
+    with engine.begin() as conn:
+        run_migrations(conn)
+    
+    assert_matches_models(engine)
@@ -0,0 +1,82 @@
+"""Tests for keyset pagination"""
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import select
+from app.models import Conversation, User
+from app.services.pagination import decode_cursor, encode_cursor, fetch_page
+
+
+def test_cursor_round_trip():
+    timestamp = datetime(2024, 5, 1, 12, 30, 15, 123456)
+    
+    cursor = encode_cursor(timestamp, "abc|def")
+    
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (timestamp, "abc|def")
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", "bm90LWEtZGF0ZXxpZA", ""])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+@pytest.fixture
+async def conversations(db):
+    """Seven conversations, the last two sharing a start time"""
+    db.add(User(id="user-1", email="jane@example.com"))
+    start = datetime(2024, 1, 1)
+    rows = [
+        Conversation(id=f"c{index}", user_id="user-1", started_at=start + timedelta(minutes=min(index, 5)))
+        for index in range(7)
+    ]
+    db.add_all(rows)
+    await db.commit()
+    return [row.id for row in rows]
+
+
+async def page_ids(db, **kwargs):
+    rows, cursor = await fetch_page(
+        db,
+        select(Conversation).where(Conversation.user_id == "user-1"),
+        Conversation.started_at,
+        Conversation.id,
+        3,
+        **kwargs
+    )
+    return [row.id for row in rows], cursor
+
+
+async def test_pages_backwards_from_the_newest(db, conversations):
+    seen = []
+    cursor = None
+    while True:
+        ids, cursor = await page_ids(db, before=cursor, newest_first=True)
+        seen.extend(ids)
+        if cursor is None:
+            break
+    
+    assert seen == list(reversed(conversations))
+
+
+async def test_pages_forwards_with_after(db, conversations):
+    first, cursor = await page_ids(db, after=encode_cursor(datetime(2023, 1, 1), ""))
+    second, cursor = await page_ids(db, after=cursor)
+    third, cursor = await page_ids(db, after=cursor)
+    
+    assert first + second + third == conversations
+    assert cursor is None
+
+
+async def test_oldest_first_without_a_cursor_returns_the_newest_page(db, conversations):
+    ids, cursor = await page_ids(db)
+    
+    assert ids == conversations[-3:]
+    assert cursor is not None
+
+
+async def test_both_cursors_are_rejected(db, conversations):
+    cursor = encode_cursor(datetime(2024, 1, 1), "c0")
+    
+    with pytest.raises(ValueError):
+        await page_ids(db, before=cursor, after=cursor)
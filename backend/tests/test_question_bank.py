@@ -0,0 +1,53 @@
+"""Tests for assembling question sets from the question bank"""
+from collections import Counter
+from app.models import QuestionBankEntry
+from app.services.question_bank_service import QuestionBankService
+
+
+def bank_entry(technology, difficulty, number, position=None):
+    return QuestionBankEntry(
+        technology=technology,
+        technology_label=technology.title(),
+        experience_band="3-5",
+        difficulty=difficulty,
+        position=position,
+        question=f"{technology} {difficulty} question {number}?"
+    )
+
+
+async def test_assemble_covers_stack_and_difficulties(db):
+    db.add_all(
+        bank_entry(technology, difficulty, number)
+        for technology in ("python", "django")
+        for difficulty in ("easy", "medium", "hard")
+        for number in range(10)
+    )
+    await db.commit()
+    
+    questions = await QuestionBankService(db).assemble(
+        {"languages": ["Python"], "frameworks": ["Django"]}, 4, "Backend Developer", 6
+    )
+    
+    assert len(questions) == 6
+    assert Counter(q["technology"] for q in questions) == {"Python": 3, "Django": 3}
+    assert Counter(q["difficulty"] for q in questions) == {"easy": 2, "medium": 2, "hard": 2}
+
+
+async def test_assemble_prefers_position_and_skips_asked_questions(db):
+    db.add_all([bank_entry("python", "medium", number) for number in range(5)])
+    db.add(bank_entry("python", "medium", 99, position="data engineer"))
+    await db.commit()
+    bank = QuestionBankService(db)
+    
+    first = await bank.assemble({"languages": ["Python"]}, 4, "Data Engineer", 1)
+    again = await bank.assemble({"languages": ["Python"]}, 4, "Data Engineer", 1, exclude=[first[0]["question"]])
+    
+    assert first[0]["question"] == "python medium question 99?"
+    assert again[0]["question"] != first[0]["question"]
+
+
+async def test_assemble_only_uses_the_experience_band(db):
+    db.add(bank_entry("python", "easy", 1))
+    await db.commit()
+    
+    assert await QuestionBankService(db).assemble({"languages": ["Python"]}, 10, "Developer", 5) == []
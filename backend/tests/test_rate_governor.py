@@ -0,0 +1,103 @@
+"""Tests for the LLM rate governor's token buckets and admission"""
+import pytest
+from app.core.config import settings
+from app.services.rate_governor import (
+    MemoryBuckets,
+    ModelLimits,
+    Priority,
+    RateGovernor,
+    RateLimitExceeded,
+    _take
+)
+
+LIMITS = ModelLimits(rpm=60, tpm=6000)
+
+
+def test_take_admits_and_debits_both_buckets():
+    state, wait = _take((60, 6000, 0.0), 0.0, LIMITS, 100, 0.0)
+    
+    assert wait == 0
+    assert state == (59, 5900, 0.0)
+
+
+def test_take_reports_wait_until_a_request_refills():
+    state, wait = _take((0, 6000, 0.0), 0.0, LIMITS, 100, 0.0)
+    
+    assert wait == pytest.approx(1.0)
+    assert state[:2] == (0, 6000)  # Nothing taken
+
+
+def test_take_refills_over_time_up_to_capacity():
+    assert _take((0, 6000, 0.0), 1.0, LIMITS, 100, 0.0) == ((0, 5900, 1.0), 0.0)
+    
+    state, _ = _take((59, 6000, 0.0), 3600.0, LIMITS, 100, 0.0)
+    assert state[:2] == (59, 5900)
+
+
+def test_take_waits_for_tokens():
+    _, wait = _take((60, 50, 0.0), 0.0, LIMITS, 150, 0.0)
+    
+    assert wait == pytest.approx(1.0)  # 100 missing tokens at 100 per second
+
+
+def test_take_keeps_reserve_for_background_calls():
+    _, wait = _take((10, 6000, 0.0), 0.0, LIMITS, 100, 0.2)
+    
+    assert wait == pytest.approx(3.0)  # Needs 1 + 12 reserved requests
+
+
+def test_take_caps_cost_at_bucket_size():
+    state, wait = _take((60, 6000, 0.0), 0.0, LIMITS, 10 ** 9, 0.0)
+    
+    assert wait == 0
+    assert state[1] == 0
+
+
+async def test_memory_buckets_are_kept_per_model():
+    buckets = MemoryBuckets()
+    limits = ModelLimits(rpm=1, tpm=1000)
+    
+    assert await buckets.take("a", limits, 10, 0.0) == 0
+    assert await buckets.take("a", limits, 10, 0.0) > 0
+    assert await buckets.take("b", limits, 10, 0.0) == 0
+
+
+@pytest.fixture
+def governor(monkeypatch):
+    """Enabled in-memory governor allowing two requests a minute for model "m\""""
+    monkeypatch.setattr(settings, "LLM_RATE_LIMITS", {"m": {"rpm": 2, "tpm": 100000}})
+    governor = RateGovernor()
+    governor.enabled = True
+    return governor
+
+
+async def test_acquire_times_out_once_the_quota_is_spent(governor):
+    await governor.acquire("m", 10)
+    await governor.acquire("m", 10)
+    
+    with pytest.raises(RateLimitExceeded):
+        await governor.acquire("m", 10, max_wait=0.1)
+    assert not governor.is_busy("m")
+
+
+async def test_try_acquire_never_waits(governor):
+    assert await governor.try_acquire("m", 10)
+    assert await governor.try_acquire("m", 10)
+    assert not await governor.try_acquire("m", 10)
+
+
+async def test_background_calls_leave_the_reserve(governor, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_RATE_BACKGROUND_RESERVE", 0.5)
+    await governor.acquire("m", 10)
+    
+    with pytest.raises(RateLimitExceeded):
+        await governor.acquire("m", 10, priority=Priority.BACKGROUND, max_wait=0.1)
+    await governor.acquire("m", 10, priority=Priority.INTERACTIVE)
+
+
+def test_governor_defaults_to_on_only_with_redis(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_RATE_LIMIT_ENABLED", None)
+    assert RateGovernor().enabled is False
+    
+    monkeypatch.setattr(settings, "LLM_RATE_LIMIT_ENABLED", True)
+    assert RateGovernor().enabled is True
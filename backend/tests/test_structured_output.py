@@ -0,0 +1,86 @@
+"""Tests for structured LLM output parsing and validation"""
+from app.services.structured_output import JSONArrayStream, load, validate
+
+QUESTION_SCHEMA = {
+    "type": "object",
+    "required": ["technology", "question"],
+    "properties": {
+        "technology": {"type": "string", "minLength": 1},
+        "question": {"type": "string", "minLength": 5},
+        "difficulty": {"type": "string", "enum": ["easy", "medium", "hard"]},
+    },
+}
+
+
+def test_validate_accepts_matching_instance():
+    assert validate({"technology": "Go", "question": "What is a goroutine?", "difficulty": "easy"}, QUESTION_SCHEMA) == []
+
+
+def test_validate_reports_every_problem_with_its_path():
+    errors = validate({"technology": "", "difficulty": "expert"}, QUESTION_SCHEMA)
+    
+    assert "$: missing required property 'question'" in errors
+    assert "$.technology: string is shorter than 1 characters" in errors
+    assert any(error.startswith("$.difficulty: 'expert' is not one of") for error in errors)
+
+
+def test_validate_checks_arrays_and_additional_properties():
+    schema = {
+        "type": "object",
+        "additionalProperties": {"type": "array", "items": {"type": "string"}, "maxItems": 2},
+    }
+    
+    assert validate({"languages": ["Python"]}, schema) == []
+    assert validate({"languages": ["Python", 3]}, schema) == ["$.languages[1]: expected string, got int"]
+    assert validate({"tools": ["a", "b", "c"]}, schema) == ["$.tools: expected at most 2 items, got 3"]
+
+
+def test_validate_does_not_treat_booleans_as_numbers():
+    assert validate(True, {"type": "integer"}) == ["$: expected integer, got bool"]
+
+
+def test_load_strips_code_fences():
+    data, errors = load('```json\n{"technology": "Go", "question": "Why channels?"}\n```', QUESTION_SCHEMA)
+    
+    assert errors == []
+    assert data["technology"] == "Go"
+
+
+def test_load_reports_invalid_json():
+    data, errors = load('{"technology": "Go",', QUESTION_SCHEMA)
+    
+    assert data is None
+    assert errors[0].startswith("$: invalid JSON")
+
+
+def feed_in_chunks(text, size):
+    parser = JSONArrayStream()
+    items = []
+    for start in range(0, len(text), size):
+        items.append(parser.feed(text[start:start + size]))
+    return items
+
+
+def test_array_stream_yields_each_element_when_it_closes():
+    text = '[{"q": "a"}, {"q": "b"}]'
+    
+    batches = feed_in_chunks(text, 1)
+    
+    assert [item for batch in batches for item in batch] == [{"q": "a"}, {"q": "b"}]
+    # The first element is complete as soon as its closing brace arrives
+    assert batches[text.index("}")] == [{"q": "a"}]
+
+
+def test_array_stream_handles_brackets_commas_and_escapes_in_strings():
+    text = '```json\n[{"q": "Use [a, b] or {c}?"}, {"q": "Say \\"hi\\", then ]"}, 3]\n```'
+    
+    for size in (1, 4, len(text)):
+        items = [item for batch in feed_in_chunks(text, size) for item in batch]
+        assert items == [{"q": "Use [a, b] or {c}?"}, {"q": 'Say "hi", then ]'}, 3]
+
+
+def test_array_stream_skips_invalid_elements_and_trailing_text():
+    parser = JSONArrayStream()
+    
+    assert parser.feed('Here you go: [{"q": "a"}, {bad}, {"q": "b"}] [{"q": "c"}]') == [{"q": "a"}, {"q": "b"}]
+    assert parser.feed('{"q": "d"}]') == []
@@ -0,0 +1,52 @@
+"""Tests for the local tech stack parser"""
+import pytest
+from app.services.tech_stack_parser import tech_stack_parser
+
+
+def skill_names(raw: str):
+    return [skill.name for skill in tech_stack_parser.parse(raw).skills]
+
+
+def test_categorizes_known_skills():
+    parsed = tech_stack_parser.parse("Python, Django and PostgreSQL")
+    
+    assert parsed.tech_stack["languages"] == ["Python"]
+    assert "Django" in parsed.tech_stack["frameworks"]
+    assert "PostgreSQL" in parsed.tech_stack["databases"]
+    assert parsed.unknown == []
+
+
+def test_respects_word_boundaries():
+    assert skill_names("Django") == ["Django"]
+    assert skill_names("JavaScript") == ["JavaScript"]
+
+
+def test_unrecognized_segment_is_kept_whole():
+    parsed = tech_stack_parser.parse("Python, Apache Polars")
+    
+    assert [skill.name for skill in parsed.skills] == ["Python"]
+    assert parsed.unknown == ["Apache Polars"]
+
+
+@pytest.mark.parametrize("raw, skills, unknown", [
+    ("Python/Pandas/Polars", ["Python", "Pandas"], ["Polars"]),
+    ("Java + Quarkus", ["Java"], ["Quarkus"]),
+    ("React with Zustand", ["React"], ["Zustand"]),
+    ("C++ and Numba jit", ["C++"], ["Numba jit"]),
+])
+def test_reports_unknown_items_next_to_known_ones(raw, skills, unknown):
+    parsed = tech_stack_parser.parse(raw)
+    
+    assert [skill.name for skill in parsed.skills] == skills
+    assert parsed.unknown == unknown
+
+
+def test_ignores_stopwords_and_numbers():
+    parsed = tech_stack_parser.parse("3 years of Python, basic knowledge of SQL")
+    
+    assert parsed.unknown == []
+
+
+def test_lookup_resolves_aliases_only():
+    assert tech_stack_parser.lookup("py").name == "Python"
+    assert tech_stack_parser.lookup("python polars") is None
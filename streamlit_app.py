@@ -7,7 +7,7 @@ All LLM calls are made directly from Streamlit.
 
 import streamlit as st
 import os
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 from datetime import datetime
 import json
 import re
@@ -20,6 +20,13 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Local field extraction shared with the FastAPI backend (no network calls)
+try:
+    from backend.app.services.field_extraction import extract_field, extract_name, extract_phone
+except ImportError:
+    st.error("⚠️ Field validation libraries not installed. Run: pip install email-validator phonenumbers")
+    st.stop()
+
 # Import Google Gemini
 try:
     import google.generativeai as genai
@@ -127,58 +134,24 @@ if 'stage' not in st.session_state:
     st.session_state.stage = 'greeting'
 if 'conversation_ended' not in st.session_state:
     st.session_state.conversation_ended = False
+if 'stream_responses' not in st.session_state:
+    st.session_state.stream_responses = str(
+        st.secrets.get("STREAM_RESPONSES", os.getenv("STREAM_RESPONSES", "true"))
+    ).lower() in ("1", "true", "yes")
+
+# Country assumed for phone numbers entered without a +country code
+PHONE_DEFAULT_REGION = st.secrets.get("PHONE_DEFAULT_REGION", os.getenv("PHONE_DEFAULT_REGION", "US"))
 
 # Helper functions
-def validate_email(email: str) -> bool:
-    """Validate email format"""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
-
-def validate_phone(phone: str) -> bool:
-    """Validate phone format"""
-    # Remove common separators
-    phone_clean = re.sub(r'[\s\-\(\)]', '', phone)
-    # Check if it's 10-15 digits
-    return bool(re.match(r'^\+?\d{10,15}$', phone_clean))
-
-def extract_info_from_message(message: str, field: str) -> Optional[str]:
-    """Extract specific information from message"""
-    message_lower = message.lower().strip()
-    
+def extract_info_from_message(message: str, field: str) -> Optional[Any]:
+    """Extract specific information from message (None if it isn't valid)"""
     if field == 'name':
-        # Check if it looks like a name (2+ words, no numbers)
-        words = message.split()
-        if len(words) >= 2 and not any(char.isdigit() for char in message):
-            return message.strip()
-    
-    elif field == 'email':
-        # Extract email using regex
-        email_match = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', message)
-        if email_match:
-            return email_match.group(0)
-    
+        result = extract_name(message, require_full_name=True)
     elif field == 'phone':
-        # Extract phone number
-        phone_match = re.search(r'[\+\d][\d\s\-\(\)]{9,}', message)
-        if phone_match:
-            return phone_match.group(0).strip()
-    
-    elif field == 'experience':
-        # Extract years of experience
-        years_match = re.search(r'(\d+)\s*(?:years?|yrs?)', message_lower)
-        if years_match:
-            return int(years_match.group(1))
-        # Check if it's just a number
-        if message.strip().isdigit():
-            return int(message.strip())
-    
-    elif field == 'position':
-        return message.strip()
-    
-    elif field == 'location':
-        return message.strip()
-    
-    return None
+        result = extract_phone(message, PHONE_DEFAULT_REGION)
+    else:
+        result = extract_field(field, message)
+    return result.value if result.is_valid else None
 
 def generate_tech_questions(tech_stack: Dict, position: str, experience: int) -> List[str]:
     """Generate technical questions using Gemini"""
@@ -224,12 +197,11 @@ Example format: ["Question 1?", "Question 2?", ...]"""
             f"How do you stay updated with the latest technologies?"
         ]
 
-def get_ai_response(user_message: str, stage: str, profile: Dict) -> str:
-    """Get AI response based on conversation stage"""
-    try:
-        context = f"Current profile: {json.dumps(profile)}\nConversation stage: {stage}"
+def build_ai_prompt(user_message: str, stage: str, profile: Dict) -> str:
+    """Build the free-form conversation prompt"""
+    context = f"Current profile: {json.dumps(profile)}\nConversation stage: {stage}"
         
-        system_prompt = """You are TalentScout's AI Hiring Assistant. Be friendly, professional, and concise.
+    system_prompt = """You are TalentScout's AI Hiring Assistant. Be friendly, professional, and concise.
         
 Your goal: Gather candidate information in this order:
 1. Full Name
@@ -244,20 +216,53 @@ After gathering all info, generate 5 technical questions.
 
 Keep responses SHORT (1-2 sentences). Be conversational."""
 
-        prompt = f"""{system_prompt}
+    return f"""{system_prompt}
 
 {context}
 
 User said: "{user_message}"
 
 Respond appropriately based on the stage and information gathered."""
-        
-        response = model.generate_content(prompt)
+
+def get_ai_response(user_message: str, stage: str, profile: Dict) -> str:
+    """Get AI response based on conversation stage"""
+    try:
+        response = model.generate_content(build_ai_prompt(user_message, stage, profile))
         return response.text.strip()
     
     except Exception as e:
         return f"I apologize, I'm having trouble processing that. Could you please rephrase? (Error: {str(e)})"
 
+def stream_ai_response(user_message: str, stage: str, profile: Dict) -> Iterator[str]:
+    """Stream AI response text as Gemini generates it"""
+    produced = False
+    try:
+        response = model.generate_content(build_ai_prompt(user_message, stage, profile), stream=True)
+        for chunk in response:
+            try:
+                text = chunk.text
+            except ValueError:
+                continue
+            if text:
+                produced = True
+                yield text
+    
+    except Exception as e:
+        if not produced:
+            yield f"I apologize, I'm having trouble processing that. Could you please rephrase? (Error: {str(e)})"
+
+def render_streamed_response(chunks: Iterator[str]) -> str:
+    """Render a response into a single chat bubble while it streams in"""
+    placeholder = st.empty()
+    response = ""
+    for chunk in chunks:
+        response += chunk
+        with placeholder.container():
+            render_chat_message("assistant", response + " ▌")
+    with placeholder.container():
+        render_chat_message("assistant", response)
+    return response.strip()
+
 def render_header():
     """Render header"""
     st.markdown("""
@@ -309,6 +314,11 @@ def render_sidebar():
             st.info("Your profile will appear here as we chat.")
         
         st.markdown("---")
+        st.checkbox(
+            "⚡ Stream responses",
+            key="stream_responses",
+            help="Show the assistant's answers word by word as they are generated"
+        )
         if st.button("🔄 Start New Session"):
             st.session_state.clear()
             st.rerun()
@@ -367,7 +377,7 @@ Good luck! 🚀"""
             
             elif 'email' not in profile:
                 email = extract_info_from_message(user_input, 'email')
-                if email and validate_email(email):
+                if email:
                     profile['email'] = email
                     response = "Great! What's your phone number?"
                 else:
@@ -375,11 +385,11 @@ Good luck! 🚀"""
             
             elif 'phone' not in profile:
                 phone = extract_info_from_message(user_input, 'phone')
-                if phone and validate_phone(phone):
+                if phone:
                     profile['phone'] = phone
                     response = "Perfect! How many years of professional experience do you have?"
                 else:
-                    response = "Please provide a valid phone number (e.g., +1234567890 or 1234567890)."
+                    response = "Please provide a valid phone number, including your country code (e.g., +1 415 555 2671)."
             
             elif 'years_experience' not in profile:
                 exp = extract_info_from_message(user_input, 'experience')
@@ -438,7 +448,13 @@ Based on your experience and skills, here are some technical questions:
             
             else:
                 # General conversation
-                response = get_ai_response(user_input, st.session_state.stage, profile)
+                if st.session_state.stream_responses:
+                    render_chat_message("user", user_input)
+                    response = render_streamed_response(
+                        stream_ai_response(user_input, st.session_state.stage, profile)
+                    )
+                else:
+                    response = get_ai_response(user_input, st.session_state.stage, profile)
             
             # Update profile
             st.session_state.profile = profile